@@ -10,7 +10,8 @@ Design goals:
 - Keep side-effects (file writes, logging) injectable.
 
 Public functions:
-- sweep_scope_fixed(...): perform a frequency sweep recording a chosen metric.
+- sweep_scope_fixed(...): perform a frequency sweep recording a chosen metric
+  (``sweep_scope_fixed_async`` is the coroutine form).
 - sweep_audio_kpis(...): perform a frequency sweep computing Vrms / PkPk / THD and knees.
 
 Both functions accept callables for instrument operations so they can
@@ -19,12 +20,17 @@ be monkey‑patched or replaced in tests.
 
 from __future__ import annotations
 
+import asyncio
 import math
 import time
 from collections.abc import Callable, Sequence
+from concurrent.futures import Executor
 from contextlib import suppress
+from functools import partial
 from typing import Any
 
+import numpy as np
+
 from amp_benchkit.tek import scope_configure_timebase, scope_read_timebase
 
 Number = float
@@ -32,6 +38,7 @@ Number = float
 # Type aliases for dependency injection
 FyApplyFn = Callable[..., Any]
 ScopeMeasureFn = Callable[[Any, str], float]
+ScopeMeasureBatchFn = Callable[[Any, Sequence[str]], Sequence[float]]
 ScopeCaptureFn = Callable[..., tuple[Sequence[float], Sequence[float]]]
 DspVrmsFn = Callable[[Sequence[float]], float]
 DspVppFn = Callable[[Sequence[float]], float]
@@ -50,13 +57,11 @@ class SweepAbort(Exception):
 def build_freq_list(start: Number, stop: Number, step: Number) -> list[Number]:
     if step <= 0:
         raise ValueError("step must be > 0")
-    freqs: list[Number] = []
-    f = start
-    # Inclusive stop with small epsilon
-    while f <= stop + 1e-9:
-        freqs.append(round(f, 6))
-        f += step
-    return freqs
+    # Inclusive stop with small epsilon; each point is start + i*step (no running sum).
+    n = math.floor((stop - start + 1e-9) / step) + 1
+    if n <= 0:
+        return []
+    return np.round(start + np.arange(n) * step, 6).tolist()
 
 
 def build_freq_points(
@@ -91,7 +96,7 @@ def build_freq_points(
     return [round(x, 6) for x in out]
 
 
-def sweep_scope_fixed(
+async def sweep_scope_fixed_async(
     freqs: Sequence[Number],
     channel: int,
     scope_channel: int,
@@ -101,10 +106,13 @@ def sweep_scope_fixed(
     *,
     fy_apply: FyApplyFn,
     scope_measure: ScopeMeasureFn,
+    scope_measure_batch: ScopeMeasureBatchFn | None = None,
     scope_configure_math_subtract: Callable[[Any, str], Any] | None = None,
     scope_set_trigger_ext: Callable[[Any, str, float | None], Any] | None = None,
     scope_arm_single: Callable[[Any], Any] | None = None,
     scope_wait_single_complete: Callable[[Any, float], bool] | None = None,
+    scope_set_averaging: Callable[[Any, int], Any] | None = None,
+    average_count: int = 0,
     use_math: bool = False,
     math_order: str = "CH1-CH2",
     use_ext: bool = False,
@@ -119,26 +127,103 @@ def sweep_scope_fixed(
     progress: Callable[[int, int], Any] = lambda i, n: None,
     abort_flag: Callable[[], bool] = lambda: False,
     u3_autoconfig: Callable[[], Any] | None = None,
-) -> list[tuple[Number, float]]:
-    """Perform a simple scope measurement sweep.
+    executor: Executor | None = None,
+    on_row: Callable[..., Any] | None = None,
+) -> list[tuple[Number, ...]]:
+    """Coroutine form of :func:`sweep_scope_fixed`.
 
-    Returns list of (freq_hz, metric_value).
+    Instrument calls run in ``executor`` (the loop default when ``None``) so the
+    event loop stays free; settling is an ``asyncio.sleep``. Each step programs
+    the generator while the scope timebase/MATH setup runs, so it costs
+    ``max(t_fy, t_scope)`` instead of their sum; arming waits for both.
+    With single-shot arm/complete hooks the captured record is frozen, so the
+    measurement of step N is read while step N+1 programs the generator.
+    ``metric`` may join several metrics with ``+`` (e.g. ``"RMS+PK2PK"``); rows are
+    then ``(freq, v1, v2, ...)`` and ``scope_measure_batch(src, keys)``, when given,
+    fetches them in one scope transaction instead of one ``scope_measure`` each.
+    ``on_row(freq, *values)`` receives each row as soon as it is measured (e.g. to
+    stream a CSV). With ``average_count`` > 1, ``scope_set_averaging`` and the
+    single-shot hooks, the scope averages that many acquisitions per point: ``dwell_s``
+    is slept before arming and the completion wait replaces the capture-window sleep;
+    sample mode is restored after.
+    ``logger``/``progress``/``abort_flag``/``on_row`` are called on the loop thread.
     """
-    out: list[tuple[Number, float]] = []
-    metric_key = "RMS" if metric.upper() == "RMS" else "PK2PK"
-    if u3_autoconfig:
+    loop = asyncio.get_running_loop()
+
+    def io(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> asyncio.Future[Any]:
+        return loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+
+    def _scope_setup(window: float) -> Exception | None:
+        if resource is not None:
+            scope_configure_timebase(resource, max(2e-9, min(window / 10.0, 5.0)))
+        if use_math and scope_configure_math_subtract:
+            try:
+                scope_configure_math_subtract(scope_resource, math_order)
+            except Exception as e:
+                return e
+        return None
+
+    def _measure() -> list[float]:
+        if len(metric_keys) > 1 and scope_measure_batch is not None:
+            return [float(v) for v in scope_measure_batch(src, metric_keys)]
+        return [float(scope_measure(src, key)) for key in metric_keys]
+
+    async def _record(f: Number, job: asyncio.Future[Any]) -> None:
         try:
-            u3_autoconfig()
+            vals = await job
         except Exception as e:
-            logger(f"U3 auto-config warn: {e}")
+            logger(f"Scope error @ {f} Hz: {e}")
+            vals = [float("nan")] * len(metric_keys)
+        else:
+            if amplitude_calibration:
+                for k, val in enumerate(vals):
+                    if math.isfinite(val):
+                        with suppress(Exception):
+                            vals[k] = amplitude_calibration(f, val)
+        out.append((f, *vals))
+        if on_row is not None:
+            on_row(f, *vals)
+        shown = ", ".join(f"{key} {val:.4f}" for key, val in zip(metric_keys, vals, strict=True))
+        logger(f"{f:.3f} Hz → {shown} ({src_label})")
+
+    async def _scope_step(window: float) -> Exception | None:
+        # The scope is one instrument: finish reading step N before reconfiguring it.
+        nonlocal pending
+        if pending is not None:
+            prev, pending = pending, None
+            await _record(*prev)
+        return await io(_scope_setup, window)
+
+    out: list[tuple[Number, ...]] = []
+    metric_keys = [
+        "RMS" if m.strip().upper() == "RMS" else "PK2PK" for m in metric.split("+") if m.strip()
+    ] or ["PK2PK"]
+    src = "MATH" if use_math else scope_channel
+    src_label = "MATH" if use_math else f"CH{scope_channel}"
+    pipeline = scope_arm_single is not None and scope_wait_single_complete is not None
+    pending: tuple[Number, asyncio.Future[Any]] | None = None
     n = len(freqs)
     original_scale = None
     resource = scope_resource if scope_resource is not None else None
+    # U3 auto-config and the scope timebase read touch different instruments.
+    u3_job = io(u3_autoconfig) if u3_autoconfig else None
     if resource is not None:
         try:
-            original_scale = scope_read_timebase(resource)
+            original_scale = await io(scope_read_timebase, resource)
         except Exception:
             original_scale = None
+    if u3_job is not None:
+        try:
+            await u3_job
+        except Exception as e:
+            logger(f"U3 auto-config warn: {e}")
+    averaging = False
+    if pipeline and scope_set_averaging is not None and average_count > 1:
+        try:
+            await io(scope_set_averaging, scope_resource, int(average_count))
+            averaging = True
+        except Exception as e:
+            logger(f"Scope averaging unavailable, using dwell: {e}")
     cycles_per_capture = max(1.0, float(cycles_per_capture))
     for i, f in enumerate(freqs):
         if abort_flag():
@@ -148,63 +233,84 @@ def sweep_scope_fixed(
             amp_to_set = (
                 float(amp_vpp_strategy(f)) if amp_vpp_strategy is not None else float(amp_vpp)
             )
-            try:
-                fy_apply(
+            capture_window = cycles_per_capture / max(float(f), 1.0)
+            fy_res, setup_res = await asyncio.gather(
+                io(
+                    fy_apply,
                     freq_hz=f,
                     amp_vpp=amp_to_set,
                     wave="Sine",
                     off_v=0.0,
                     duty=None,
                     ch=channel,
-                )
-            except Exception as e:
-                logger(f"FY error @ {f} Hz: {e}")
+                ),
+                _scope_step(capture_window),
+                return_exceptions=True,
+            )
+            if isinstance(setup_res, BaseException):
+                raise setup_res
+            if setup_res is not None:
+                logger(f"MATH config error: {setup_res}")
+            if isinstance(fy_res, BaseException):
+                logger(f"FY error @ {f} Hz: {fy_res}")
                 continue
-            capture_window = cycles_per_capture / max(float(f), 1.0)
-            if resource is not None:
-                scope_configure_timebase(resource, max(2e-9, min(capture_window / 10.0, 5.0)))
-            settle_s = capture_window
-            if dwell_s > 0:
-                settle_s = max(settle_s, float(dwell_s))
+            if averaging:
+                # Settle before arming so the averaged record excludes the transient;
+                # the completion wait then stands in for the capture-window sleep.
+                settle_s = 0.0
+                if dwell_s > 0:
+                    await asyncio.sleep(float(dwell_s))
+                    if abort_flag():
+                        break
+            else:
+                settle_s = capture_window
+                if dwell_s > 0:
+                    settle_s = max(settle_s, float(dwell_s))
             if pre_ms > 0:
                 settle_s = max(settle_s, float(pre_ms) / 1000.0)
-            if use_math and scope_configure_math_subtract:
-                try:
-                    scope_configure_math_subtract(scope_resource, math_order)
-                except Exception as e:
-                    logger(f"MATH config error: {e}")
             if scope_arm_single:
                 with suppress(Exception):
-                    scope_arm_single(scope_resource)
+                    await io(scope_arm_single, scope_resource)
             if use_ext and scope_set_trigger_ext:
                 with suppress(Exception):
-                    scope_set_trigger_ext(scope_resource, ext_slope, ext_level)
+                    await io(scope_set_trigger_ext, scope_resource, ext_slope, ext_level)
             if settle_s > 0:
-                time.sleep(settle_s)
+                await asyncio.sleep(settle_s)
+            if abort_flag():
+                break
             if scope_wait_single_complete:
+                wait_s = settle_s + 1.0
+                if averaging:
+                    wait_s += average_count * capture_window
                 with suppress(Exception):
-                    scope_wait_single_complete(scope_resource, max(1.0, settle_s + 1.0))
-            try:
-                src = "MATH" if use_math else scope_channel
-                val = scope_measure(src, metric_key)
-            except Exception as e:
-                logger(f"Scope error @ {f} Hz: {e}")
-                val = float("nan")
+                    await io(scope_wait_single_complete, scope_resource, max(1.0, wait_s))
+            job = io(_measure)
+            if pipeline:
+                pending = (f, job)
             else:
-                if amplitude_calibration and metric_key in ("RMS", "PK2PK") and math.isfinite(val):
-                    with suppress(Exception):
-                        val = amplitude_calibration(f, val)
-            out.append((f, val))
-            src_label = "MATH" if use_math else f"CH{scope_channel}"
-            logger(f"{f:.3f} Hz → {metric_key} {val:.4f} ({src_label})")
+                await _record(f, job)
         finally:
             progress(i + 1, n)
+    if pending is not None:
+        await _record(*pending)
+    if averaging:
+        with suppress(Exception):
+            await io(scope_set_averaging, scope_resource, 0)
     if original_scale is not None and resource is not None:
         with suppress(Exception):
-            scope_configure_timebase(resource, original_scale)
+            await io(scope_configure_timebase, resource, original_scale)
     return out
 
 
+def sweep_scope_fixed(*args: Any, **kwargs: Any) -> list[tuple[Number, ...]]:
+    """Perform a simple scope measurement sweep.
+
+    Blocking wrapper around :func:`sweep_scope_fixed_async` (same arguments).
+    Returns list of (freq_hz, metric_value, ...), one value per metric.
+    """
+    return asyncio.run(sweep_scope_fixed_async(*args, **kwargs))
+
+
 def sweep_audio_kpis(
     freqs: Sequence[Number],
     channel: int,
@@ -238,6 +344,7 @@ def sweep_audio_kpis(
     scope_set_trigger_ext: Callable[[Any, str, float | None], Any] | None = None,
     scope_arm_single: Callable[[Any], Any] | None = None,
     scope_wait_single_complete: Callable[[Any, float], bool] | None = None,
+    scope_wait_ready: Callable[[Any, float], bool] | None = None,
     scope_configure_math_subtract: Callable[[Any, str], Any] | None = None,
     scope_resource: Any = None,
     scope_set_vertical_scale: Callable[[Any, Any, float], Any] | None = None,
@@ -279,6 +386,7 @@ def sweep_audio_kpis(
                 if value is not None:
                     original_vertical[label] = value
     cycles_per_capture = max(1.0, float(cycles_per_capture))
+    thd_fn = dsp_thd_fft if do_thd else None
     for i, f in enumerate(freqs):
         if abort_flag():
             break
@@ -299,6 +407,10 @@ def sweep_audio_kpis(
             except Exception as e:
                 logger(f"FY error @ {f} Hz: {e}")
                 continue
+            # Generator/amplifier settling, which the scope cannot report: always
+            # slept before arming so the capture excludes the transient.
+            if dwell_s > 0:
+                time.sleep(float(dwell_s))
             # EXT / U3 pulse orchestration
             try:
                 if use_ext and scope_set_trigger_ext:
@@ -312,8 +424,6 @@ def sweep_audio_kpis(
                         max(2e-9, min(capture_window / 10.0, 5.0)),
                     )
                 settle_s = capture_window
-                if dwell_s > 0:
-                    settle_s = max(settle_s, float(dwell_s))
                 if pre_ms > 0:
                     settle_s = max(settle_s, float(pre_ms) / 1000.0)
                 if settle_s > 0:
@@ -330,8 +440,13 @@ def sweep_audio_kpis(
                     done = scope_wait_single_complete(scope_resource, timeout)
                 except Exception:
                     done = False
-            if not done and settle_s <= 0:
-                time.sleep(0.2)
+            if not done:
+                # Poll operation-complete instead of the blind fallback sleep when available.
+                if scope_wait_ready is not None:
+                    with suppress(Exception):
+                        scope_wait_ready(scope_resource, 0.4)
+                elif settle_s <= 0:
+                    time.sleep(0.2)
             if use_math and scope_configure_math_subtract:
                 try:
                     scope_configure_math_subtract(scope_resource, math_order)
@@ -377,9 +492,9 @@ def sweep_audio_kpis(
                         pp = amplitude_calibration(f, pp)
             thd_ratio = float("nan")
             thd_percent = float("nan")
-            if do_thd and dsp_thd_fft and have_samples:
+            if thd_fn is not None and have_samples:
                 try:
-                    thd_ratio, f_est, _ = dsp_thd_fft(t, v, f)
+                    thd_ratio, f_est, _ = thd_fn(t, v, f)
                     thd_percent = (
                         float(thd_ratio * 100.0) if math.isfinite(thd_ratio) else float("nan")
                     )
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 import io
 import os
+import re
 import sys
+import time
 from contextlib import contextmanager
 
 PYVISA_ERR = SERIAL_ERR = QT_ERR = U3_ERR = None  # populated on import
@@ -80,7 +82,7 @@ except Exception as e:  # pragma: no cover
 # ------------------ Qt bindings ------------------
 HAVE_QT = False
 try:  # pragma: no cover
-    from PySide6.QtCore import QLibraryInfo, Qt, QTimer
+    from PySide6.QtCore import QLibraryInfo, QObject, Qt, QTimer, Signal
     from PySide6.QtGui import QFont
     from PySide6.QtWidgets import (
         QApplication,
@@ -115,7 +117,8 @@ try:  # pragma: no cover
         pass
 except Exception as e1:  # pragma: no cover
     try:
-        from PyQt5.QtCore import QLibraryInfo, Qt, QTimer
+        from PyQt5.QtCore import QLibraryInfo, QObject, Qt, QTimer
+        from PyQt5.QtCore import pyqtSignal as Signal
         from PyQt5.QtGui import QFont
         from PyQt5.QtWidgets import (
             QApplication,
@@ -163,7 +166,9 @@ except Exception as e1:  # pragma: no cover
             QCheckBox,  # type: ignore[assignment,misc]
             QSpinBox,  # type: ignore[assignment,misc]
             Qt,  # type: ignore[assignment,misc]
-        ) = (None,) * 15
+            QObject,  # type: ignore[assignment,misc]
+            Signal,  # type: ignore[assignment,misc]
+        ) = (None,) * 17
 
 HAVE_PYVISA = _pyvisa is not None
 HAVE_SERIAL = _serial is not None and _lp is not None
@@ -205,17 +210,34 @@ def dep_msg() -> str:
     )
 
 
-def list_ports():  # pragma: no cover (depends on host hardware)
-    return list(_lp.comports()) if HAVE_SERIAL else []
+_PORTS_TTL_S = 2.0
+_PORTS_CACHE: tuple[float, list] | None = None
+_FY_PORT_RE = re.compile(r"usbserial|tty\.usb|wchusb|ftdi", re.IGNORECASE)
 
 
-def find_fy_port():  # pragma: no cover (depends on host hardware)
-    ps = list_ports()
-    for p in ps:
-        d = (p.device or "").lower()
-        if any(k in d for k in ["usbserial", "tty.usb", "wchusb", "ftdi"]):
+def list_ports(ttl_s: float = _PORTS_TTL_S):
+    """Enumerate serial ports, reusing the previous listing for ``ttl_s`` seconds."""
+    global _PORTS_CACHE
+    if not HAVE_SERIAL:
+        return []
+    now = time.monotonic()
+    cached = _PORTS_CACHE
+    if cached is None or now - cached[0] >= ttl_s:
+        cached = _PORTS_CACHE = (now, list(_lp.comports()))
+    return list(cached[1])
+
+
+def _find_fy_port_in(ports):
+    """Return the first port whose device name looks like a USB-serial FY adapter."""
+    for p in ports:
+        if _FY_PORT_RE.search(p.device or ""):
             return p.device
-    return ps[0].device if ps else None
+    return None
+
+
+def find_fy_port():
+    ps = list_ports()
+    return _find_fy_port_in(ps) or (ps[0].device if ps else None)
 
 
 # Re-export Qt symbols so legacy code can transition gradually
@@ -254,6 +276,8 @@ __all__ = [
     "QCheckBox",
     "QSpinBox",
     "Qt",
+    "QObject",
+    "Signal",
     "QTimer",
     "QFont",
 ]
@@ -7,6 +7,7 @@ environments without hardware attached; hardware probes are optional.
 
 from __future__ import annotations
 
+import asyncio
 import datetime as _dt
 import os
 import platform
@@ -30,6 +31,7 @@ from .deps import (
     find_fy_port,
     list_ports,
 )
+from .tek import list_visa_resources
 from .u3config import u3_read_ain
 from .u3util import have_u3, open_u3_safely
 
@@ -104,26 +106,31 @@ def _dependency_section() -> tuple[str, list[str]]:
     return ("[Dependencies]", lines)
 
 
-def _connectivity_section() -> tuple[str, list[str]]:
-    lines: list[str] = []
-    serial_lines: list[str] = []
-    if HAVE_SERIAL:
-        for port in list_ports():
-            serial_lines.append(
-                f"{port.device} ({getattr(port, 'description', 'unknown').strip() or 'unknown'})"
-            )
-    lines.append("Serial ports:")
-    lines.extend(f"  {entry}" for entry in (serial_lines or ["(none)"]))
+def _serial_lines() -> list[str]:
+    if not HAVE_SERIAL:
+        return []
+    return [
+        f"{port.device} ({getattr(port, 'description', 'unknown').strip() or 'unknown'})"
+        for port in list_ports()
+    ]
 
-    visa_lines: list[str] = []
-    if HAVE_PYVISA and _pyvisa is not None:
-        try:
-            rm = _pyvisa.ResourceManager()
-            visa_lines = list(rm.list_resources())
-        except Exception as exc:
-            visa_lines = [f"VISA error: {exc}"]
-    else:
-        visa_lines = ["pyvisa is not available"]
+
+def _visa_lines() -> list[str]:
+    if not (HAVE_PYVISA and _pyvisa is not None):
+        return ["pyvisa is not available"]
+    try:
+        return list(list_visa_resources())
+    except Exception as exc:
+        return [f"VISA error: {exc}"]
+
+
+async def _connectivity_section() -> tuple[str, list[str]]:
+    # Serial enumeration and the VISA scan (often seconds) are independent probes.
+    serial_lines, visa_lines = await asyncio.gather(
+        asyncio.to_thread(_serial_lines), asyncio.to_thread(_visa_lines)
+    )
+    lines: list[str] = ["Serial ports:"]
+    lines.extend(f"  {entry}" for entry in (serial_lines or ["(none)"]))
     lines.append("VISA resources:")
     lines.extend(f"  {entry}" for entry in (visa_lines or ["(none)"]))
 
@@ -164,7 +171,7 @@ def _hardware_section() -> tuple[str, list[str]]:
     return ("[Hardware]", lines)
 
 
-def collect_diagnostics(
+async def collect_diagnostics_async(
     *,
     include_environment: bool = True,
     include_dependencies: bool = True,
@@ -172,9 +179,10 @@ def collect_diagnostics(
     include_hardware: bool = True,
     context: dict[str, Any] | None = None,
 ) -> str:
-    """Collect diagnostics information.
+    """Async core of :func:`collect_diagnostics`.
 
-    Parameters mirror checkboxes in the GUI; each section can be toggled.
+    Connectivity and hardware probes run concurrently in worker threads; the
+    sections are still reported in their fixed order.
     """
 
     sections: DiagSections = []
@@ -182,8 +190,34 @@ def collect_diagnostics(
         sections.append(_env_section(context=context))
     if include_dependencies:
         sections.append(_dependency_section())
+    probes = []
     if include_connectivity:
-        sections.append(_connectivity_section())
+        probes.append(_connectivity_section())
     if include_hardware:
-        sections.append(_hardware_section())
+        probes.append(asyncio.to_thread(_hardware_section))
+    sections.extend(await asyncio.gather(*probes))
     return _format_sections(sections)
+
+
+def collect_diagnostics(
+    *,
+    include_environment: bool = True,
+    include_dependencies: bool = True,
+    include_connectivity: bool = True,
+    include_hardware: bool = True,
+    context: dict[str, Any] | None = None,
+) -> str:
+    """Collect diagnostics information.
+
+    Parameters mirror checkboxes in the GUI; each section can be toggled.
+    """
+
+    return asyncio.run(
+        collect_diagnostics_async(
+            include_environment=include_environment,
+            include_dependencies=include_dependencies,
+            include_connectivity=include_connectivity,
+            include_hardware=include_hardware,
+            context=context,
+        )
+    )
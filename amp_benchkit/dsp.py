@@ -13,6 +13,11 @@ from __future__ import annotations
 
 import numpy as np
 
+try:  # pragma: no cover - optional accelerator
+    from scipy import fft as _scipy_fft  # type: ignore[import-untyped]
+except Exception:  # pragma: no cover
+    _scipy_fft = None
+
 __all__ = ["vrms", "vpp", "thd_fft", "find_knees"]
 
 
@@ -20,6 +25,13 @@ def _np_array(x):
     return x if isinstance(x, np.ndarray) else np.asarray(x)
 
 
+def _rfft(x):
+    """Real FFT; uses multithreaded scipy.fft when installed, numpy otherwise."""
+    if _scipy_fft is not None:
+        return _scipy_fft.rfft(x, workers=-1)
+    return np.fft.rfft(x)
+
+
 def vrms(v):
     v = _np_array(v)
     return float(np.sqrt(np.mean(np.square(v.astype(float))))) if v.size else float("nan")
@@ -30,6 +42,19 @@ def vpp(v):
     return float(np.max(v) - np.min(v)) if v.size else float("nan")
 
 
+def _harmonic_amplitudes(t, residual, omega, max_harm):
+    """Peak amplitudes of harmonics 2..``max_harm`` of ``omega`` fitted in one solve.
+
+    Columns are sin/cos of k*omega*t, built from powers of exp(j*omega*t).
+    """
+    z = np.exp(1j * omega * t)
+    zk = np.cumprod(np.broadcast_to(z[:, None], (z.size, max_harm)), axis=1)[:, 1:]
+    basis_h = np.hstack([zk.imag, zk.real])
+    coeffs_h, *_ = np.linalg.lstsq(basis_h, residual, rcond=None)
+    n_h = max_harm - 1
+    return np.hypot(coeffs_h[:n_h], coeffs_h[n_h:])
+
+
 def thd_fft(t, v, f0=None, nharm=10, window="hann"):
     t = _np_array(t).astype(float)
     v = _np_array(v).astype(float)
@@ -48,7 +73,7 @@ def thd_fft(t, v, f0=None, nharm=10, window="hann"):
             w = np.hamming(n)
         else:
             w = np.ones(n)
-        spectrum = np.fft.rfft(v_centered * w)
+        spectrum = _rfft(v_centered * w)
         freqs = np.fft.rfftfreq(n, d=dt)
         idx = int(np.argmax(np.abs(spectrum[1:])) + 1)
         f_est = float(freqs[idx])
@@ -68,15 +93,8 @@ def thd_fft(t, v, f0=None, nharm=10, window="hann"):
     residual -= np.mean(residual)
 
     fundamental_rms = amp_peak / np.sqrt(2.0)
-    harmonic_energy = 0.0
-    max_harm = max(2, int(nharm))
-    for k in range(2, max_harm + 1):
-        omega_k = omega * k
-        basis_k = np.column_stack([np.sin(omega_k * t), np.cos(omega_k * t)])
-        coeffs_k, *_ = np.linalg.lstsq(basis_k, residual, rcond=None)
-        amp_k = np.hypot(coeffs_k[0], coeffs_k[1])
-        harmonic_energy += (amp_k / np.sqrt(2.0)) ** 2
-        residual -= coeffs_k[0] * np.sin(omega_k * t) + coeffs_k[1] * np.cos(omega_k * t)
+    amps_h = _harmonic_amplitudes(t, residual, omega, max(2, int(nharm)))
+    harmonic_energy = float(np.dot(amps_h, amps_h)) / 2.0
 
     thd_ratio = (
         float(np.sqrt(harmonic_energy) / fundamental_rms) if fundamental_rms > 0 else float("nan")
@@ -84,6 +102,25 @@ def thd_fft(t, v, f0=None, nharm=10, window="hann"):
     return thd_ratio, f_est, amp_peak
 
 
+def _first_crossing(f, db, target_db):
+    """Return the interpolated frequency of the first ``target_db`` crossing, or NaN."""
+    if f.size < 2:
+        return float("nan")
+    prev_db = db[:-1]
+    cur_db = db[1:]
+    hit = ((prev_db >= target_db) & (cur_db <= target_db)) | (
+        (prev_db <= target_db) & (cur_db >= target_db)
+    )
+    (hits,) = np.nonzero(hit)
+    if not hits.size:
+        return float("nan")
+    i = int(hits[0])
+    if cur_db[i] == prev_db[i]:
+        return float(f[i + 1])
+    frac = (target_db - prev_db[i]) / (cur_db[i] - prev_db[i])
+    return float(f[i] + frac * (f[i + 1] - f[i]))
+
+
 def find_knees(freqs, amps, ref_mode="max", ref_hz=1000.0, drop_db=3.0):
     f = _np_array(freqs).astype(float)
     a = _np_array(amps).astype(float)
@@ -96,36 +133,7 @@ def find_knees(freqs, amps, ref_mode="max", ref_hz=1000.0, drop_db=3.0):
     ref_db = 20.0 * np.log10(ref_amp)
     target_db = ref_db - float(drop_db)
     adB = 20.0 * np.log10(np.maximum(a, 1e-18))
-    f_lo = float("nan")
-    f_hi = float("nan")
-    prev_f = f[0]
-    prev_db = adB[0]
-    for i in range(1, idx + 1):
-        cur_f = f[i]
-        cur_db = adB[i]
-        if (prev_db >= target_db and cur_db <= target_db) or (
-            prev_db <= target_db and cur_db >= target_db
-        ):
-            if cur_db != prev_db:
-                frac = (target_db - prev_db) / (cur_db - prev_db)
-                f_lo = float(prev_f + frac * (cur_f - prev_f))
-            else:
-                f_lo = float(cur_f)
-            break
-        prev_f, prev_db = cur_f, cur_db
-    prev_f = f[idx]
-    prev_db = adB[idx]
-    for i in range(idx + 1, f.size):
-        cur_f = f[i]
-        cur_db = adB[i]
-        if (prev_db >= target_db and cur_db <= target_db) or (
-            prev_db <= target_db and cur_db >= target_db
-        ):
-            if cur_db != prev_db:
-                frac = (target_db - prev_db) / (cur_db - prev_db)
-                f_hi = float(prev_f + frac * (cur_f - prev_f))
-            else:
-                f_hi = float(cur_f)
-            break
-        prev_f, prev_db = cur_f, cur_db
+    # Scan adjacent sample pairs on each side of the reference point in one pass each.
+    f_lo = _first_crossing(f[: idx + 1], adB[: idx + 1], target_db)
+    f_hi = _first_crossing(f[idx:], adB[idx:], target_db)
     return f_lo, f_hi, ref_amp, ref_db
@@ -6,8 +6,15 @@ and configuring sweeps. Hardware access requires pyserial.
 
 from __future__ import annotations
 
+import atexit
 import logging
-import time
+import os
+import sys
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager, suppress
+from functools import partial
+from typing import Any
 
 from .deps import (
     HAVE_SERIAL,
@@ -38,38 +45,136 @@ __all__ = [
     "WAVE_CODE",
     "SWEEP_MODE",
     "fy_apply",
+    "fy_make_applier",
+    "open_fy_port",
     "fy_sweep",
     "build_fy_cmds",
+    "fy_close_all",
+    "FYWorker",
     "FYError",
     "FYTimeoutError",
 ]
 
 
-def build_fy_cmds(freq_hz, amp_vpp, off_v, wave, duty=None, ch=1):
-    def clamp(value: float, low: float, high: float) -> float:
-        return max(low, min(high, value))
+# Open serial handles keyed by port; guarded by _FY_LOCK for the whole write burst.
+_FY_HANDLES: dict[str, Any] = {}
+_FY_LOCK = threading.Lock()
+
+
+_USB_SERIAL_SYSFS = "/sys/bus/usb-serial/devices"
+
+
+def _fy_low_latency(port: str, ser=None) -> bool:
+    """Best-effort: cut the USB-serial latency for ``port`` to ~1 ms (Linux only).
+
+    FTDI/CH34x adapters default to 16 ms, which dominates short FY command bursts.
+    With an open ``ser`` the driver's ASYNC_LOW_LATENCY flag is set first (pyserial's
+    ``set_low_latency_mode``, i.e. ``setserial low_latency``); the sysfs
+    latency_timer is then dropped to 1 ms, which needs write access (udev rule or
+    root). Failures are logged and ignored.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    flagged = False
+    if ser is not None:
+        try:
+            ser.set_low_latency_mode(True)
+            flagged = True
+        except (AttributeError, OSError, ValueError) as e:
+            log.debug("ASYNC_LOW_LATENCY not set for %s: %s", port, e)
+    path = os.path.join(_USB_SERIAL_SYSFS, os.path.basename(port), "latency_timer")
+    try:
+        with open(path, "w") as fh:
+            fh.write("1")
+        return True
+    except OSError as e:
+        log.debug("latency_timer not set for %s: %s", port, e)
+        return flagged
+
+
+def _fy_get(port: str, baud: int):
+    """Return a cached open Serial for ``port`` at ``baud`` (caller holds _FY_LOCK)."""
+    s = _FY_HANDLES.get(port)
+    if s is None or not getattr(s, "is_open", True):
+        s = _serial.Serial(port, baudrate=baud, timeout=1)
+        _fy_low_latency(port, s)
+        _FY_HANDLES[port] = s
+    elif s.baudrate != baud:
+        s.baudrate = baud
+    return s
+
+
+def _fy_drop(port: str) -> None:
+    """Close and forget the cached handle for ``port`` (caller holds _FY_LOCK)."""
+    s = _FY_HANDLES.pop(port, None)
+    if s is not None:
+        with suppress(Exception):
+            s.close()
+
 
-    def step(value: float, step_size: float) -> float:
-        if step_size <= 0:
-            return value
-        return round(round(value / step_size) * step_size, 10)
+def fy_close_all() -> None:
+    """Close every cached FY serial handle."""
+    with _FY_LOCK:
+        for port in list(_FY_HANDLES):
+            _fy_drop(port)
 
-    pref = "b" if ch == 1 else "d"
+
+atexit.register(fy_close_all)
+
+
+# Per-channel %-format templates with the prefix baked in:
+# (wave, freq in centi-Hz, offset, duty in 0.1 %, amplitude).
+_FMT = {
+    1: ("bw%s", "bf%09d", "bo%0.2f", "bd%03d", "ba%0.2f"),
+    2: ("dw%s", "df%09d", "do%0.2f", "dd%03d", "da%0.2f"),
+}
+# Sweep templates: (start centi-Hz, end centi-Hz, time s, mode, run).
+_SWEEP_FMT = {
+    1: ("bb%09d", "be%09d", "bt%02d", "bm%s", "br%d"),
+    2: ("db%09d", "de%09d", "dt%02d", "dm%s", "dr%d"),
+}
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def _step(value: float, step_size: float) -> float:
+    if step_size <= 0:
+        return value
+    return round(round(value / step_size) * step_size, 10)
+
+
+def build_fy_cmds(freq_hz, amp_vpp, off_v, wave, duty=None, ch=1):
+    f_wave, f_freq, f_off, f_duty, f_amp = _FMT[1] if ch == 1 else _FMT[2]
     cmds = [
-        f"{pref}w{WAVE_CODE.get(wave, '0')}",
-        f"{pref}f{int(round(float(freq_hz) * 100)):09d}",
-        f"{pref}o{step(float(off_v), 0.01):0.2f}",
+        f_wave % WAVE_CODE.get(wave, "0"),
+        f_freq % int(round(float(freq_hz) * 100)),
+        f_off % _step(float(off_v), 0.01),
     ]
     if duty is not None:
-        dp = int(round(clamp(step(float(duty), 0.1), 0.0, 99.9) * 10))
-        cmds.append(f"{pref}d{dp:03d}")
-    cmds.append(f"{pref}a{step(clamp(float(amp_vpp), 0.0, 99.99), 0.01):0.2f}")
+        cmds.append(f_duty % int(round(_clamp(_step(float(duty), 0.1), 0.0, 99.9) * 10)))
+    cmds.append(f_amp % _step(_clamp(float(amp_vpp), 0.0, 99.99), 0.01))
     for c in cmds:
         if len(c) + 1 > 15:
             raise ValueError("FY command too long: " + c)
     return cmds
 
 
+# Pre-encoded terminator per EOL so each frame is one join + one encode.
+_EOL_BYTES = {eol: eol.encode("ascii") for _, eol in FY_BAUD_EOLS}
+
+
+def _fy_link(proto: str) -> tuple[int, str]:
+    """Return the (baud, EOL) pair a protocol label starts with."""
+    return FY_BAUD_EOLS[0] if proto == FY_PROTOCOLS[0] else FY_BAUD_EOLS[1]
+
+
+def _fy_frame(cmds, eol: str) -> bytes:
+    """Join commands into one EOL-terminated payload for a single serial write."""
+    return eol.join(cmds).encode("ascii") + _EOL_BYTES[eol]
+
+
 def fy_apply(
     freq_hz=1000,
     amp_vpp=0.25,
@@ -85,7 +190,7 @@ def fy_apply(
     port = port or find_fy_port()
     if not port:
         raise RuntimeError("No serial ports found.")
-    baud, eol = (9600, "\n") if proto == "FY ASCII 9600" else (115200, "\r\n")
+    baud, eol = _fy_link(proto)
     log.debug(
         "fy_apply(ch=%s, port=%s, proto=%s, freq=%s, amp=%s, off=%s, duty=%s)",
         ch,
@@ -96,28 +201,33 @@ def fy_apply(
         off_v,
         duty,
     )
+    cmds = build_fy_cmds(freq_hz, amp_vpp, off_v, wave, duty, ch)
     sent = []
     try:
-        with _serial.Serial(port, baudrate=baud, timeout=1) as s:
-            for cmd in build_fy_cmds(freq_hz, amp_vpp, off_v, wave, duty, ch):
-                log.debug("write %s", cmd)
-                sent.append(cmd)
-                s.write((cmd + eol).encode())
-                time.sleep(0.02)
+        with _FY_LOCK:
+            s = _fy_get(port, baud)
+            log.debug("write %s", cmds)
+            sent.extend(cmds)
+            s.write(_fy_frame(cmds, eol))
+            s.flush()
     except Exception as e:
         last_err = e
+        with _FY_LOCK:
+            _fy_drop(port)
         # Try alternate baud/EOL pairs automatically
         for b, e2 in [(115200, "\r\n"), (9600, "\n")]:
             try:
-                with _serial.Serial(port, baudrate=b, timeout=1) as s:
-                    for cmd in build_fy_cmds(freq_hz, amp_vpp, off_v, wave, duty, ch):
-                        log.debug("retry write %s", cmd)
-                        sent.append(cmd)
-                        s.write((cmd + e2).encode())
-                        time.sleep(0.02)
+                with _FY_LOCK:
+                    s = _fy_get(port, b)
+                    log.debug("retry write %s", cmds)
+                    sent.extend(cmds)
+                    s.write(_fy_frame(cmds, e2))
+                    s.flush()
                 return sent
             except Exception as e_alt:
                 last_err = e_alt
+                with _FY_LOCK:
+                    _fy_drop(port)
         msg = f"FY write failed on {port}: {last_err}"
         if "timeout" in str(last_err).lower():
             raise FYTimeoutError(msg) from last_err
@@ -125,10 +235,64 @@ def fy_apply(
     return sent
 
 
+def fy_make_applier(port=None, ch=1, proto="FY ASCII 9600") -> Callable[..., list[str]]:
+    """Return an :func:`fy_apply`-compatible callable bound to one port/channel/protocol.
+
+    Port discovery, baud/EOL selection and the handle lookup happen once here, so
+    each call only formats and writes. Write errors drop the handle and defer to
+    :func:`fy_apply`, which retries the alternate baud/EOL; a missing port or
+    pyserial leaves every call to :func:`fy_apply` so errors surface per call.
+    """
+    port = port or (find_fy_port() if HAVE_SERIAL else None)
+    if not port:
+        return partial(fy_apply, ch=ch, port=None, proto=proto)
+    bound_ch = ch
+    baud, eol = _fy_link(proto)
+    with _FY_LOCK, suppress(Exception):
+        _fy_get(port, baud)
+
+    def apply(freq_hz=1000, amp_vpp=0.25, wave="Sine", off_v=0.0, duty=None, ch=bound_ch):
+        if ch != bound_ch:
+            return fy_apply(freq_hz, amp_vpp, wave, off_v, duty, ch, port, proto)
+        cmds = build_fy_cmds(freq_hz, amp_vpp, off_v, wave, duty, ch)
+        payload = _fy_frame(cmds, eol)
+        try:
+            with _FY_LOCK:
+                s = _fy_get(port, baud)
+                s.write(payload)
+                s.flush()
+        except Exception:
+            with _FY_LOCK:
+                _fy_drop(port)
+            return fy_apply(freq_hz, amp_vpp, wave, off_v, duty, ch, port, proto)
+        return cmds
+
+    return apply
+
+
+@contextmanager
+def open_fy_port(port=None, ch=1, proto="FY ASCII 9600"):
+    """Hold the FY port open for a burst of applies (e.g. a sweep).
+
+    Yields :func:`fy_make_applier` for ``port``/``ch``/``proto``. A handle that
+    was opened for the block is closed on exit; one that was already cached
+    (Generator tab, an outer block) is left open for its owner.
+    """
+    port = port or (find_fy_port() if HAVE_SERIAL else None)
+    with _FY_LOCK:
+        owned = bool(port) and port not in _FY_HANDLES
+    try:
+        yield fy_make_applier(port, ch, proto)
+    finally:
+        if owned:
+            with _FY_LOCK:
+                _fy_drop(port)
+
+
 def fy_sweep(port, ch, proto, start=None, end=None, t_s=None, mode=None, run=None, cycles=None):
     if ch not in (1, 2):
         raise ValueError(f"Unsupported FY channel: {ch}")
-    baud, eol = (9600, "\n") if proto == "FY ASCII 9600" else (115200, "\r\n")
+    baud, eol = _fy_link(proto)
     log.debug(
         "fy_sweep(ch=%s, port=%s, proto=%s, start=%s, end=%s, t_s=%s, mode=%s, run=%s)",
         ch,
@@ -141,58 +305,96 @@ def fy_sweep(port, ch, proto, start=None, end=None, t_s=None, mode=None, run=Non
         run,
     )
     commands = []
+    if ch == 2:
+        wants_handshake = any(val is not None for val in (start, end, t_s, mode)) or (
+            run is None or bool(run)
+        )
+        if wants_handshake:
+            cyc = 1000000 if cycles is None else int(cycles)
+            commands += [f"tn{cyc:07d}", "tt2"]
+    f_start, f_end, f_time, f_mode, f_run = _SWEEP_FMT[ch]
+    if start is not None:
+        commands.append(f_start % int(start * 100))
+    if end is not None:
+        commands.append(f_end % int(end * 100))
+    if t_s is not None:
+        commands.append(f_time % int(t_s))
+    if mode is not None:
+        commands.append(f_mode % SWEEP_MODE.get(mode, "0"))
+    if run is not None:
+        commands.append(f_run % (1 if run else 0))
+    if not commands:
+        return commands
     try:
-        with _serial.Serial(port, baudrate=baud, timeout=1) as s:
-            if ch == 2:
-                wants_handshake = any(val is not None for val in (start, end, t_s, mode)) or (
-                    run is None or bool(run)
-                )
-                if wants_handshake:
-                    cyc = 1000000 if cycles is None else int(cycles)
-                    cmd = f"tn{cyc:07d}"
-                    log.debug("write %s", cmd)
-                    s.write((cmd + eol).encode())
-                    time.sleep(0.02)
-                    commands.append(cmd)
-                    cmd = "tt2"
-                    log.debug("write %s", cmd)
-                    s.write((cmd + eol).encode())
-                    time.sleep(0.02)
-                    commands.append(cmd)
-            pref = "b" if ch == 1 else "d"
-            if start is not None:
-                cmd = f"{pref}b{int(start * 100):09d}"
-                log.debug("write %s", cmd)
-                s.write((cmd + eol).encode())
-                time.sleep(0.02)
-                commands.append(cmd)
-            if end is not None:
-                cmd = f"{pref}e{int(end * 100):09d}"
-                log.debug("write %s", cmd)
-                s.write((cmd + eol).encode())
-                time.sleep(0.02)
-                commands.append(cmd)
-            if t_s is not None:
-                cmd = f"{pref}t{int(t_s):02d}"
-                log.debug("write %s", cmd)
-                s.write((cmd + eol).encode())
-                time.sleep(0.02)
-                commands.append(cmd)
-            if mode is not None:
-                cmd = f"{pref}m{SWEEP_MODE.get(mode, '0')}"
-                log.debug("write %s", cmd)
-                s.write((cmd + eol).encode())
-                time.sleep(0.02)
-                commands.append(cmd)
-            if run is not None:
-                cmd = f"{pref}r{1 if run else 0}"
-                log.debug("write %s", cmd)
-                s.write((cmd + eol).encode())
-                time.sleep(0.02)
-                commands.append(cmd)
+        with _FY_LOCK:
+            s = _fy_get(port, baud)
+            log.debug("write %s", commands)
+            s.write(_fy_frame(commands, eol))
+            s.flush()
     except Exception as e:
+        with _FY_LOCK:
+            _fy_drop(port)
         msg = f"FY sweep command failed on {port}: {e}"
         if "timeout" in str(e).lower():
             raise FYTimeoutError(msg) from e
         raise FYError(msg) from e
     return commands
+
+
+_DoneFn = Callable[[Any, Exception | None], Any]
+
+
+class FYWorker(threading.Thread):
+    """Background thread that runs FY serial jobs off the GUI thread.
+
+    Jobs are coalesced per ``key`` with latest-wins semantics: submitting a new
+    job for a key that is still pending replaces the older one, so rapid repeat
+    clicks never queue stale serial writes. ``done(result, error)`` is invoked
+    on the worker thread after each job.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="fy-worker", daemon=True)
+        self._pending: dict[Any, tuple[Callable[[], Any], _DoneFn | None]] = {}
+        self._cv = threading.Condition()
+        self._stopped = False
+
+    def submit(
+        self,
+        key: Any,
+        fn: Callable[[], Any],
+        done: _DoneFn | None = None,
+    ) -> None:
+        with self._cv:
+            self._pending.pop(key, None)
+            self._pending[key] = (fn, done)
+            self._cv.notify()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        with self._cv:
+            self._stopped = True
+            self._pending.clear()
+            self._cv.notify()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._pending and not self._stopped:
+                    self._cv.wait()
+                if self._stopped:
+                    return
+                key = next(iter(self._pending))
+                fn, done = self._pending.pop(key)
+            result: Any = None
+            error: Exception | None = None
+            try:
+                result = fn()
+            except Exception as e:
+                error = e
+            if done is not None:
+                try:
+                    done(result, error)
+                except Exception:
+                    log.exception("FY worker callback failed for %r", key)
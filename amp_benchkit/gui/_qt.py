@@ -9,6 +9,9 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+# Log panes keep at most this many lines; older lines roll off.
+LOG_MAX_BLOCKS = 5000
+
 
 def require_qt():  # pragma: no cover - thin import wrapper
     """Attempt to import Qt widgets from PySide6, falling back to PyQt5.
@@ -27,6 +30,7 @@ def require_qt():  # pragma: no cover - thin import wrapper
             QHBoxLayout,
             QLabel,
             QLineEdit,
+            QPlainTextEdit,
             QProgressBar,
             QPushButton,
             QSpinBox,
@@ -48,6 +52,7 @@ def require_qt():  # pragma: no cover - thin import wrapper
                 QHBoxLayout,
                 QLabel,
                 QLineEdit,
+                QPlainTextEdit,
                 QProgressBar,
                 QPushButton,
                 QSpinBox,
@@ -71,6 +76,7 @@ def require_qt():  # pragma: no cover - thin import wrapper
         QLineEdit=QLineEdit,
         QPushButton=QPushButton,
         QTextEdit=QTextEdit,
+        QPlainTextEdit=QPlainTextEdit,
         QTabWidget=QTabWidget,
         QProgressBar=QProgressBar,
         QCheckBox=QCheckBox,
@@ -79,3 +85,11 @@ def require_qt():  # pragma: no cover - thin import wrapper
         QTimer=QTimer,
         __binding__=binding,
     )
+
+
+def make_log_view(qt):
+    """Read-only plain-text log pane capped at ``LOG_MAX_BLOCKS`` lines."""
+    w = qt.QPlainTextEdit()
+    w.setReadOnly(True)
+    w.setMaximumBlockCount(LOG_MAX_BLOCKS)
+    return w
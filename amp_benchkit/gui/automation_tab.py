@@ -9,7 +9,7 @@ from __future__ import annotations
 from typing import Any
 
 from ..fy import FY_PROTOCOLS
-from ._qt import require_qt
+from ._qt import make_log_view, require_qt
 
 
 def build_automation_tab(gui: Any) -> object | None:
@@ -41,7 +41,7 @@ def build_automation_tab(gui: Any) -> object | None:
     r.addWidget(gui.auto_scope_ch)
     r.addWidget(QLabel("Metric:"))
     gui.auto_metric = QComboBox()
-    gui.auto_metric.addItems(["RMS", "PK2PK"])
+    gui.auto_metric.addItems(["RMS", "PK2PK", "RMS+PK2PK"])
     r.addWidget(gui.auto_metric)
     L.addLayout(r)
     # Override row
@@ -85,6 +85,8 @@ def build_automation_tab(gui: Any) -> object | None:
     r3.addWidget(gui.auto_do_thd)
     gui.auto_do_knees = QCheckBox("Find Knees")
     r3.addWidget(gui.auto_do_knees)
+    gui.auto_save_raw = QCheckBox("Save raw (.npz)")
+    r3.addWidget(gui.auto_save_raw)
     r3.addWidget(QLabel("Drop dB"))
     gui.auto_knee_db = QLineEdit("3.0")
     gui.auto_knee_db.setMaximumWidth(80)
@@ -147,6 +149,12 @@ def build_automation_tab(gui: Any) -> object | None:
     r5.addWidget(gui.auto_math_order)
     gui.auto_apply_cal = QCheckBox("Apply Gold Calibration")
     r5.addWidget(gui.auto_apply_cal)
+    gui.auto_scope_avg = QCheckBox("Instrument-side averaging")
+    gui.auto_scope_avg.setToolTip("Scope averages N acquisitions per point after the dwell")
+    r5.addWidget(gui.auto_scope_avg)
+    gui.auto_scope_avg_n = QComboBox()
+    gui.auto_scope_avg_n.addItems(["4", "16", "64", "128"])
+    r5.addWidget(gui.auto_scope_avg_n)
     L.addLayout(r5)
 
     # Live testing group
@@ -246,7 +254,6 @@ def build_automation_tab(gui: Any) -> object | None:
     # Progress + log
     gui.auto_prog = QProgressBar()
     L.addWidget(gui.auto_prog)
-    gui.auto_log = QTextEdit()
-    gui.auto_log.setReadOnly(True)
+    gui.auto_log = make_log_view(qt)
     L.addWidget(gui.auto_log)
     return w
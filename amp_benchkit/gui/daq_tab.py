@@ -14,7 +14,7 @@ from typing import Any
 # actual Qt classes are imported inside the builder. Reuse helpers lazily to
 # avoid pulling heavy dependencies when the GUI is not in use.
 from ..deps import fixed_font
-from ._qt import require_qt
+from ._qt import make_log_view, require_qt
 
 
 def build_daq_tab(gui: Any) -> object | None:
@@ -121,8 +121,7 @@ def build_daq_tab(gui: Any) -> object | None:
     br.addWidget(b2)
     L.addLayout(br)
 
-    gui.daq_log = QTextEdit()
-    gui.daq_log.setReadOnly(True)
+    gui.daq_log = make_log_view(qt)
     L.addWidget(gui.daq_log)
 
     daq.addTab(gui.daq_rw, "Read/Stream")
@@ -281,8 +280,7 @@ def build_daq_tab(gui: Any) -> object | None:
         btns.addWidget(b)
     C.addLayout(btns)
 
-    gui.cfg_log = QTextEdit()
-    gui.cfg_log.setReadOnly(True)
+    gui.cfg_log = make_log_view(qt)
     C.addWidget(gui.cfg_log)
 
     daq.addTab(gui.daq_cw, "Config Defaults")
@@ -510,8 +508,7 @@ def build_daq_tab(gui: Any) -> object | None:
     gui.test_hist.setReadOnly(True)
     gui.test_hist.setMaximumHeight(120)
     T.addWidget(gui.test_hist)
-    gui.test_log = QTextEdit()
-    gui.test_log.setReadOnly(True)
+    gui.test_log = make_log_view(qt)
     T.addWidget(gui.test_log)
 
     daq.addTab(gui.daq_test, "Test Panel")
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from ._qt import require_qt
+from ._qt import make_log_view, require_qt
 
 
 def build_diagnostics_tab(gui: Any) -> object | None:
@@ -18,7 +18,6 @@ def build_diagnostics_tab(gui: Any) -> object | None:
     QWidget = qt.QWidget
     QVBoxLayout = qt.QVBoxLayout
     QHBoxLayout = qt.QHBoxLayout
-    QTextEdit = qt.QTextEdit
     QPushButton = qt.QPushButton
     QCheckBox = qt.QCheckBox
     QSizePolicy = getattr(qt, "QSizePolicy", None)
@@ -56,8 +55,7 @@ def build_diagnostics_tab(gui: Any) -> object | None:
     btn_row.addWidget(clear_btn)
     btn_row.addStretch()
     L.addLayout(btn_row)
-    gui.diag = QTextEdit()
-    gui.diag.setReadOnly(True)
+    gui.diag = make_log_view(qt)
     if QSizePolicy is not None:
         gui.diag.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
     L.addWidget(gui.diag)
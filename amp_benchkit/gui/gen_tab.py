@@ -9,7 +9,7 @@ from typing import Any
 
 from amp_benchkit.fy import FY_PROTOCOLS  # central definition
 
-from ._qt import require_qt  # headless-safe import helper
+from ._qt import make_log_view, require_qt  # headless-safe import helper
 
 __all__ = ["build_generator_tab"]
 
@@ -35,7 +35,6 @@ def build_generator_tab(gui: Any) -> object | None:
     QComboBox = qt.QComboBox
     QLineEdit = qt.QLineEdit
     QPushButton = qt.QPushButton
-    QTextEdit = qt.QTextEdit
     Qt = qt.Qt
     w = QWidget()
     L = QVBoxLayout(w)
@@ -152,7 +151,6 @@ def build_generator_tab(gui: Any) -> object | None:
     row.addSpacing(20)
     row.addLayout(c2)
     L.addLayout(row)
-    gui.gen_log = QTextEdit()
-    gui.gen_log.setReadOnly(True)
+    gui.gen_log = make_log_view(qt)
     L.addWidget(gui.gen_log)
     return w
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from ._qt import require_qt
+from ._qt import make_log_view, require_qt
 
 __all__ = ["build_scope_tab"]
 
@@ -20,7 +20,6 @@ def build_scope_tab(gui: Any) -> object | None:
     QComboBox = qt.QComboBox
     QLineEdit = qt.QLineEdit
     QPushButton = qt.QPushButton
-    QTextEdit = qt.QTextEdit
     w = QWidget()
     L = QVBoxLayout(w)
     # Provide default scope resource if gui object does not define one (test safety)
@@ -49,7 +48,6 @@ def build_scope_tab(gui: Any) -> object | None:
     b = QPushButton("Save CSV (Calibrated)")
     b.clicked.connect(gui.save_csv)
     L.addWidget(b)
-    gui.scope_log = QTextEdit()
-    gui.scope_log.setReadOnly(True)
+    gui.scope_log = make_log_view(qt)
     L.addWidget(gui.scope_log)
     return w
@@ -23,6 +23,7 @@ from .tek import (
     scope_read_vertical_scale,
     scope_resume_run,
     scope_set_vertical_scale,
+    scope_wait_ready,
     scope_wait_single_complete,
 )
 
@@ -274,6 +275,7 @@ def thd_sweep(
         scope_wait_single_complete=lambda res, timeout_s: scope_wait_single_complete(
             visa_resource, timeout_s=timeout_s
         ),
+        scope_wait_ready=lambda res, max_wait: scope_wait_ready(visa_resource, max_wait=max_wait),
         scope_resource=visa_resource,
         scope_set_vertical_scale=_scope_set_vertical_scale if vertical_scale_map else None,
         scope_read_vertical_scale=_scope_read_vertical_scale if vertical_scale_map else None,
@@ -494,6 +496,7 @@ def knee_sweep(
         scope_wait_single_complete=lambda res, timeout_s: scope_wait_single_complete(
             visa_resource, timeout_s=timeout_s
         ),
+        scope_wait_ready=lambda res, max_wait: scope_wait_ready(visa_resource, max_wait=max_wait),
         scope_resource=visa_resource,
         scope_set_vertical_scale=_scope_set_vertical_scale if vertical_scale_map else None,
         scope_read_vertical_scale=_scope_read_vertical_scale if vertical_scale_map else None,
@@ -6,8 +6,12 @@ Requires pyvisa to be available.
 
 from __future__ import annotations
 
+import atexit
+import os
+import threading
+import time
 from contextlib import suppress
-from typing import Any, cast
+from typing import Any
 
 import numpy as np
 
@@ -28,11 +32,18 @@ __all__ = [
     "TEK_RSRC_DEFAULT",
     "tek_setup_channel",
     "tek_capture_block",
+    "tek_read_curve",
+    "tek_measure_batch",
+    "scope_measure",
+    "scope_measure_batch",
     "read_curve_block",
+    "read_curve_array",
     "parse_ieee_block",
+    "list_visa_resources",
     "scope_set_trigger_ext",
     "scope_arm_single",
     "scope_wait_single_complete",
+    "scope_wait_ready",
     "scope_configure_math_subtract",
     "scope_capture_calibrated",
     "scope_capture_fft_trace",
@@ -40,10 +51,12 @@ __all__ = [
     "scope_configure_fft",
     "scope_read_timebase",
     "scope_resume_run",
+    "scope_set_averaging",
     "scope_read_vertical_scale",
     "scope_set_vertical_scale",
     "scope_read_fft_vertical_params",
     "scope_screenshot",
+    "scope_close_all",
     "TekError",
     "TekTimeoutError",
 ]
@@ -54,6 +67,110 @@ def _need_pyvisa():  # internal guard
         raise ImportError(f"pyvisa not available. {INSTALL_HINTS['pyvisa']}")
 
 
+_VISA_RM: Any = None
+_VISA_LIST_TTL_S = 2.0
+_VISA_LIST_CACHE: tuple[float, tuple[str, ...]] | None = None
+# (manager, session) per resource; each resource has an RLock so threads never
+# interleave I/O on one session.
+_VISA_SESSIONS: dict[str, tuple[Any, Any]] = {}
+_VISA_LOCKS: dict[str, threading.RLock] = {}
+_VISA_SESSIONS_LOCK = threading.Lock()
+
+
+def _get_rm():
+    """Return the process-wide VISA ResourceManager, creating it on first use."""
+    global _VISA_RM
+    _need_pyvisa()
+    assert _pyvisa is not None  # for mypy
+    if _VISA_RM is None:
+        _VISA_RM = _pyvisa.ResourceManager()
+    return _VISA_RM
+
+
+def _acquire_session(resource):
+    """Lock ``resource`` and return its cached session, opening it on first use.
+
+    Pair every successful call with :func:`_release_session` (in a ``finally``).
+    """
+    with _VISA_SESSIONS_LOCK:
+        lock = _VISA_LOCKS.setdefault(resource, threading.RLock())
+    lock.acquire()
+    try:
+        rm = _get_rm()
+        cached = _VISA_SESSIONS.get(resource)
+        if cached is not None and cached[0] is rm:
+            return cached[1]
+        _drop_session(resource)  # opened by an earlier ResourceManager
+        sc = rm.open_resource(resource)
+        _VISA_SESSIONS[resource] = (rm, sc)
+        return sc
+    except BaseException:
+        lock.release()
+        raise
+
+
+def _release_session(resource) -> None:
+    _VISA_LOCKS[resource].release()
+
+
+def _drop_session(resource) -> None:
+    """Close and forget the session for ``resource`` so the next call reopens it."""
+    cached = _VISA_SESSIONS.pop(resource, None)
+    if cached is not None:
+        with suppress(Exception):
+            cached[1].close()
+
+
+def _set_timeout(sc, timeout_ms, default_ms=15000):
+    """Set the I/O timeout on a shared session and return the previous value."""
+    prev = getattr(sc, "timeout", None)
+    try:
+        sc.timeout = int(float(timeout_ms))
+    except Exception:
+        with suppress(Exception):
+            sc.timeout = default_ms
+    return prev
+
+
+def _restore_timeout(sc, prev) -> None:
+    if prev is not None:
+        with suppress(Exception):
+            sc.timeout = prev
+
+
+def scope_close_all() -> None:
+    """Close every cached scope session.
+
+    Waits briefly for a session in use; one still busy after that is left open
+    rather than closed under an in-flight query.
+    """
+    with _VISA_SESSIONS_LOCK:
+        resources = list(_VISA_SESSIONS)
+    for resource in resources:
+        lock = _VISA_LOCKS[resource]
+        if not lock.acquire(timeout=1.0):
+            continue
+        try:
+            _drop_session(resource)
+        finally:
+            lock.release()
+
+
+atexit.register(scope_close_all)
+
+
+def list_visa_resources(ttl_s: float = _VISA_LIST_TTL_S) -> tuple[str, ...]:
+    """List VISA resources, reusing the previous result for ``ttl_s`` seconds."""
+    global _VISA_LIST_CACHE
+    now = time.monotonic()
+    cached = _VISA_LIST_CACHE
+    if cached is not None and now - cached[0] < ttl_s:
+        return cached[1]
+    resources = tuple(_get_rm().list_resources())
+    _VISA_LIST_CACHE = (now, resources)
+    return resources
+
+
 def _resolve_source(ch) -> str:
     """Normalize Tektronix DATA:SOURCE values."""
     if isinstance(ch, str):
@@ -103,13 +220,20 @@ def parse_ieee_block(block: bytes):
         return np.array([])
     if len(block) < 2:
         return np.array([])
-    n_dig = int(chr(block[1]))
+    n_dig = block[1] - 48  # ASCII digit → int without a str round-trip
+    if not 1 <= n_dig <= 9:
+        return np.array([])
     header = 2 + n_dig
     if len(block) < header:
         return np.array([])
-    n_bytes = int(block[2 : 2 + n_dig])
-    data = block[header : header + n_bytes]
-    return np.frombuffer(data, dtype=np.int8)
+    n_bytes = 0
+    for b in block[2:header]:
+        d = b - 48
+        if not 0 <= d <= 9:
+            return np.array([])
+        n_bytes = n_bytes * 10 + d
+    # memoryview slice lets frombuffer wrap the payload without copying it
+    return np.frombuffer(memoryview(block)[header : header + n_bytes], dtype=np.int8)
 
 
 def read_curve_block(sc):
@@ -118,38 +242,152 @@ def read_curve_block(sc):
     return block
 
 
+# Some VISA backends stall on single reads above 256 KiB; TDS2000 curves are far smaller.
+_CURVE_CHUNK_SIZE = 1 << 18
+
+
+def read_curve_array(sc):
+    """Fetch ``CURVE?`` as an int8 ndarray.
+
+    Uses ``query_binary_values`` so pyvisa parses the IEEE header and fills the
+    array in one read; falls back to ``read_raw`` + :func:`parse_ieee_block`.
+    """
+    qbv = getattr(sc, "query_binary_values", None)
+    if qbv is not None:
+        try:
+            return qbv(
+                "CURVE?",
+                datatype="b",
+                container=np.ndarray,
+                chunk_size=_CURVE_CHUNK_SIZE,
+            )
+        except TypeError:  # older pyvisa without chunk_size/container support
+            pass
+    return parse_ieee_block(read_curve_block(sc)).astype(np.int8, copy=False)
+
+
+_SCALE_FIELDS = ("YMULT", "YZERO", "YOFF", "XINCR", "XZERO")
+
+
+def _query_wfmpre(sc, fields=_SCALE_FIELDS) -> list[str | None]:
+    """Read several WFMPRE fields in one chained query (HEADER OFF).
+
+    Falls back to one query per field if the chained reply does not split into
+    the expected number of values; fields that fail individually come back None.
+    """
+    with suppress(Exception):
+        reply = sc.query("WFMPRE:" + ";".join(f"{f}?" for f in fields))
+        parts = [p.strip() for p in reply.strip().split(";")]
+        if len(parts) == len(fields):
+            return list(parts)
+    out: list[str | None] = []
+    for f in fields:
+        try:
+            out.append(sc.query(f"WFMPRE:{f}?").strip())
+        except Exception:
+            out.append(None)
+    return out
+
+
+def _scale_from_wfmpre(vals) -> tuple[float, float, float, float, float]:
+    """Return (ymult, yzero, yoff, xincr, xzero); XZERO defaults to 0.0."""
+    ymult, yzero, yoff, xincr = (float(v) for v in vals[:4])  # type: ignore[arg-type]
+    try:
+        xzero = float(vals[4])
+    except (TypeError, ValueError):
+        xzero = 0.0
+    return ymult, yzero, yoff, xincr, xzero
+
+
+def tek_measure_batch(sc, src, types) -> list[float]:
+    """Read several measurements of ``src`` from an open session in one chained query.
+
+    Each type is loaded into the immediate measurement (``MEASU:IMM``) and read back
+    in a single ``SOURCE ..;TYPE ..;VAL?;TYPE ..;VAL?`` message, so the front-panel
+    ``MEASU:MEAS<n>`` slots are left untouched; the only lasting side effect is the
+    IMM source/type of the last value read. A reply that does not split into
+    ``len(types)`` values falls back to one query per type.
+    """
+    if not types:
+        raise ValueError("tek_measure_batch needs at least one measurement type")
+    source = _resolve_source(src)
+    parts = (
+        sc.query(f"MEASU:IMM:SOURCE {source}" + "".join(f";TYPE {t};VAL?" for t in types))
+        .strip()
+        .split(";")
+    )
+    if len(parts) != len(types):
+        sc.write(f"MEASU:IMM:SOURCE {source}")
+        parts = [sc.query(f"MEASU:IMM:TYPE {t};VAL?") for t in types]
+    return [float(p) for p in parts]
+
+
+def scope_measure(resource=TEK_RSRC_DEFAULT, ch=1, typ="RMS") -> float:
+    """Return one immediate measurement (``MEASU:IMM``) of ``ch`` on the shared session."""
+    return scope_measure_batch(resource, ch, (typ,))[0]
+
+
+def scope_measure_batch(resource=TEK_RSRC_DEFAULT, ch=1, types=("RMS", "PK2PK")) -> list[float]:
+    """Read several measurements of ``ch`` via :func:`tek_measure_batch`."""
+    _need_pyvisa()
+    sc = _acquire_session(resource)
+    try:
+        return tek_measure_batch(sc, ch, types)
+    except Exception:
+        _drop_session(resource)
+        raise
+    finally:
+        _release_session(resource)
+
+
 def tek_capture_block(resource, ch=1):
     _need_pyvisa()
     try:
-        rm = _pyvisa.ResourceManager()
-        sc = rm.open_resource(resource)
+        sc = _acquire_session(resource)
     except Exception as e:
         raise TekError(f"Failed to open scope resource '{resource}': {e}") from e
     try:
         tek_setup_channel(sc, ch)
-        block = read_curve_block(sc)
+        raw = read_curve_array(sc)
         # Acquire scaling info
         try:
-            ymult = float(sc.query("WFMPRE:YMULT?"))
-            yoff = float(sc.query("WFMPRE:YOFF?"))
-            yzero = float(sc.query("WFMPRE:YZERO?"))
-            xincr = float(sc.query("WFMPRE:XINCR?"))
+            ymult, yzero, yoff, xincr, _ = _scale_from_wfmpre(_query_wfmpre(sc))
         except Exception:
             ymult = yoff = yzero = xincr = 1.0
-        raw = parse_ieee_block(block)
         volts = (raw - yoff) * ymult + yzero
         t = np.arange(len(volts)) * xincr
         return t, volts, raw
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
+
+
+def tek_read_curve(resource, ch=1, timeout_ms=15000):
+    """Return the raw int8 ``CURVE?`` codes for ``ch`` without any scaling queries."""
+    _need_pyvisa()
+    try:
+        sc = _acquire_session(resource)
+    except Exception as e:
+        raise TekError(f"Failed to open scope resource '{resource}': {e}") from e
+    prev_timeout = _set_timeout(sc, timeout_ms)
+    try:
+        sc.chunk_size = _CURVE_CHUNK_SIZE
+        tek_setup_channel(sc, ch)
+        return read_curve_array(sc)
+    except Exception:
+        _drop_session(resource)
+        raise
+    finally:
+        _restore_timeout(sc, prev_timeout)
+        _release_session(resource)
 
 
 def scope_set_trigger_ext(resource=TEK_RSRC_DEFAULT, slope="RISE", level=None):
     _need_pyvisa()
     assert _pyvisa is not None  # for mypy
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         s = str(slope).upper()
         s = "FALL" if s.startswith("F") else "RISE"
@@ -174,9 +412,11 @@ def scope_set_trigger_ext(resource=TEK_RSRC_DEFAULT, slope="RISE", level=None):
                         sc.write(c)
             except Exception:
                 pass
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_arm_single(resource=TEK_RSRC_DEFAULT):
@@ -184,23 +424,23 @@ def scope_arm_single(resource=TEK_RSRC_DEFAULT):
     if _pyvisa is None:  # pragma: no cover - type guard
         raise TekError("pyvisa backend unavailable")
     assert _pyvisa is not None
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         for c in ("ACQuire:STOPAfter SEQuence", "ACQuire:STATE RUN"):
             with suppress(Exception):
                 sc.write(c)
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_wait_single_complete(resource=TEK_RSRC_DEFAULT, timeout_s=3.0, poll_ms=50):
     if not HAVE_PYVISA:
         return False
     try:
-        rm = _pyvisa.ResourceManager()
-        sc = rm.open_resource(resource)
+        sc = _acquire_session(resource)
     except Exception:
         return False
     import time as _t
@@ -217,90 +457,154 @@ def scope_wait_single_complete(resource=TEK_RSRC_DEFAULT, timeout_s=3.0, poll_ms
                     if ts in ("TRIGGERED", "STOP", "SAVE"):
                         return True
             _t.sleep(max(0.0, float(poll_ms) / 1000.0))
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
     return False
 
 
+def _wait_scope_ready(sc, max_wait: float) -> bool:
+    """Poll ``*OPC?`` with 10→100 ms exponential backoff until it reports 1."""
+    deadline = time.monotonic() + max(0.0, float(max_wait))
+    delay = 0.01
+    while True:
+        with suppress(Exception):
+            if sc.query("*OPC?").strip() in ("1", "+1"):
+                return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2.0, 0.1)
+
+
+def scope_wait_ready(resource=TEK_RSRC_DEFAULT, max_wait=0.4):
+    """Return True once the scope reports operation complete, False on timeout."""
+    if not HAVE_PYVISA:
+        return False
+    try:
+        sc = _acquire_session(resource)
+    except Exception:
+        return False
+    try:
+        return _wait_scope_ready(sc, max_wait)
+    except Exception:
+        _drop_session(resource)
+        raise
+    finally:
+        _release_session(resource)
+
+
 def scope_read_timebase(resource=TEK_RSRC_DEFAULT):
     """Return current horizontal scale in seconds/div (None on failure)."""
     if not HAVE_PYVISA:
         return None
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         try:
             return float(sc.query("HORizontal:MAIn:SCAle?"))
         except Exception:
             return None
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_configure_timebase(resource=TEK_RSRC_DEFAULT, seconds_per_div=None):
     """Adjust horizontal scale (seconds per division)."""
     if not HAVE_PYVISA or seconds_per_div is None:
         return
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         with suppress(Exception):
             sc.write("HORizontal:MODE MAIn")
         sc.write(f"HORizontal:MAIn:SCAle {float(seconds_per_div)}")
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_resume_run(resource=TEK_RSRC_DEFAULT):
     """Return the scope to continuous acquisition (RUN) mode."""
     if not HAVE_PYVISA:
         return
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         for cmd in ("ACQuire:STOPAfter RUNSTop", "ACQuire:STATE RUN"):
             with suppress(Exception):
                 sc.write(cmd)
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
+
+
+# Average counts the TDS2000 ACQuire:NUMAVg accepts.
+_TEK_NUMAVG = (4, 16, 64, 128)
+
+
+def scope_set_averaging(resource=TEK_RSRC_DEFAULT, count=0):
+    """Acquire in AVErage mode over ``count`` waveforms, or SAMple mode when ``count`` < 2.
+
+    ``count`` is rounded up to the nearest supported NUMAVg value; returns the count
+    applied (0 for sample mode).
+    """
+    _need_pyvisa()
+    n = int(count or 0)
+    n = next((v for v in _TEK_NUMAVG if v >= n), _TEK_NUMAVG[-1]) if n >= 2 else 0
+    sc = _acquire_session(resource)
+    try:
+        if n:
+            sc.write(f"ACQuire:MODe AVErage;:ACQuire:NUMAVg {n}")
+        else:
+            sc.write("ACQuire:MODe SAMple")
+        return n
+    except Exception:
+        _drop_session(resource)
+        raise
+    finally:
+        _release_session(resource)
 
 
 def scope_read_vertical_scale(resource=TEK_RSRC_DEFAULT, ch=1):
     """Return current vertical scale (V/div) for the requested channel."""
     if not HAVE_PYVISA:
         return None
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         src = _resolve_source(ch)
         if src == "MATH":
             return float(sc.query("MATH:VERTICAL:SCALE?"))
         return float(sc.query(f"{src}:SCALE?"))
     except Exception:
+        _drop_session(resource)
         return None
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_set_vertical_scale(resource=TEK_RSRC_DEFAULT, ch=1, volts_per_div=1.0):
     """Set vertical scale (V/div) for the requested channel."""
     if not HAVE_PYVISA:
         return
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         src = _resolve_source(ch)
         value = max(1e-6, float(volts_per_div))
         cmd = "MATH:VERTICAL:SCALE" if src == "MATH" else f"{src}:SCALE"
         sc.write(f"{cmd} {value}")
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_configure_math_subtract(resource=TEK_RSRC_DEFAULT, order="CH1-CH2"):
@@ -309,8 +613,7 @@ def scope_configure_math_subtract(resource=TEK_RSRC_DEFAULT, order="CH1-CH2"):
     if order not in ("CH1-CH2", "CH2-CH1"):
         order = "CH1-CH2"
     a, b = order.split("-")
-    rm = _pyvisa.ResourceManager()
-    sc = rm.open_resource(resource)
+    sc = _acquire_session(resource)
     try:
         for c in (
             "MATH:STATE ON",
@@ -323,47 +626,41 @@ def scope_configure_math_subtract(resource=TEK_RSRC_DEFAULT, order="CH1-CH2"):
         ):
             with suppress(Exception):
                 sc.write(c)
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_capture_calibrated(resource=TEK_RSRC_DEFAULT, timeout_ms=15000, ch=1):
     """Capture a calibrated waveform for the requested source.
 
     Supports integer channels (1-4) or source names like 'MATH'.
+    Returns ``(t, volts)`` as float64 ndarrays.
     """
     _need_pyvisa()
     import numpy as _np
 
     try:
-        rm = _pyvisa.ResourceManager()
-        sc = rm.open_resource(resource)
+        sc = _acquire_session(resource)
     except Exception as e:
         raise TekError(f"Failed to open scope resource '{resource}': {e}") from e
+    prev_timeout = _set_timeout(sc, timeout_ms)
     try:
-        try:
-            sc.timeout = int(float(timeout_ms))
-        except Exception:
-            sc.timeout = 15000
-        sc.chunk_size = max(getattr(sc, "chunk_size", 20480), 1048576)
+        sc.chunk_size = _CURVE_CHUNK_SIZE
         tek_setup_channel(sc, ch)
-        ymult = float(sc.query("WFMPRE:YMULT?"))
-        yzero = float(sc.query("WFMPRE:YZERO?"))
-        yoff = float(sc.query("WFMPRE:YOFF?"))
-        xincr = float(sc.query("WFMPRE:XINCR?"))
-        try:
-            xzero = float(sc.query("WFMPRE:XZERO?"))
-        except Exception:
-            xzero = 0.0
-        block = read_curve_block(sc)
-        data = _np.frombuffer(parse_ieee_block(block), dtype=_np.int8)
+        ymult, yzero, yoff, xincr, xzero = _scale_from_wfmpre(_query_wfmpre(sc))
+        data = read_curve_array(sc)
         volts = (data - yoff) * ymult + yzero
         t = xzero + _np.arange(data.size) * xincr
-        return t.tolist(), volts.tolist()
+        return t, volts
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _restore_timeout(sc, prev_timeout)
+        _release_session(resource)
 
 
 def scope_capture_fft_trace(
@@ -445,16 +742,12 @@ def scope_capture_fft_trace(
         raise TekError(f"Unsupported FFT scale '{scale}'")
 
     try:
-        rm = _pyvisa.ResourceManager()
-        sc = rm.open_resource(resource)
+        sc = _acquire_session(resource)
     except Exception as e:
         raise TekError(f"Failed to open scope resource '{resource}': {e}") from e
+    prev_timeout = _set_timeout(sc, timeout_ms)
     try:
-        try:
-            sc.timeout = int(float(timeout_ms))
-        except Exception:
-            sc.timeout = 15000
-        sc.chunk_size = max(getattr(sc, "chunk_size", 20480), 1048576)
+        sc.chunk_size = _CURVE_CHUNK_SIZE
         sc.write("HEADER OFF")
         # Configure FFT math trace
         with suppress(Exception):
@@ -483,24 +776,11 @@ def scope_capture_fft_trace(
         sc.write("DATA:START 1")
         sc.write("ACQUIRE:STOPAFTER SEQUENCE")
         sc.write("ACQUIRE:STATE RUN")
-        ymult = float(sc.query("WFMPRE:YMULT?"))
-        yzero = float(sc.query("WFMPRE:YZERO?"))
-        yoff = float(sc.query("WFMPRE:YOFF?"))
-        xincr = float(sc.query("WFMPRE:XINCR?"))
-        try:
-            xzero = float(sc.query("WFMPRE:XZERO?"))
-        except Exception:
-            xzero = 0.0
-        try:
-            xunit = sc.query("WFMPRE:XUNIT?").strip()
-        except Exception:
-            xunit = "Hz"
-        try:
-            yunit = sc.query("WFMPRE:YUNIT?").strip()
-        except Exception:
-            yunit = "dB" if scale_cmd == "DB" else "V"
-        block = read_curve_block(sc)
-        raw = parse_ieee_block(block)
+        pre = _query_wfmpre(sc, _SCALE_FIELDS + ("XUNIT", "YUNIT"))
+        ymult, yzero, yoff, xincr, xzero = _scale_from_wfmpre(pre)
+        xunit = pre[5] or "Hz"
+        yunit = pre[6] or ("dB" if scale_cmd == "DB" else "V")
+        raw = read_curve_array(sc)
         data = raw.astype(_np.float64, copy=False)
         values = (data - yoff) * ymult + yzero
         freqs = xzero + _np.arange(values.size) * xincr
@@ -510,11 +790,14 @@ def scope_capture_fft_trace(
             "x_unit": xunit or "Hz",
             "y_unit": yunit or ("dB" if scale_cmd == "DB" else "V"),
         }
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
         with suppress(Exception):
             sc.write("MATH:FFT:STATE OFF")
-        with suppress(Exception):
-            sc.close()
+        _restore_timeout(sc, prev_timeout)
+        _release_session(resource)
 
 
 def scope_configure_fft(
@@ -535,9 +818,6 @@ def scope_configure_fft(
     _need_pyvisa()
     if _pyvisa is None:  # pragma: no cover - type guard
         raise TekError("pyvisa backend unavailable")
-    visa_module = cast(Any, _pyvisa)
-    rm = visa_module.ResourceManager()
-    sc = rm.open_resource(resource)
     window_map = {
         "RECT": "RECTANGULAR",
         "RECTANGULAR": "RECTANGULAR",
@@ -551,6 +831,7 @@ def scope_configure_fft(
         "FLAT": "FLATTOP",
         "FLATTOP": "FLATTOP",
     }
+    sc = _acquire_session(resource)
     try:
         if center_hz is not None:
             with suppress(Exception):
@@ -580,9 +861,11 @@ def scope_configure_fft(
             if scale_cmd:
                 with suppress(Exception):
                     sc.write(f"MATH:FFT:SCALE {scale_cmd}")
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
 
 
 def scope_read_fft_vertical_params(resource=TEK_RSRC_DEFAULT):
@@ -609,8 +892,7 @@ def scope_read_fft_vertical_params(resource=TEK_RSRC_DEFAULT):
     if not HAVE_PYVISA:
         return None
     try:
-        rm = _pyvisa.ResourceManager()
-        sc = rm.open_resource(resource)
+        sc = _acquire_session(resource)
     except Exception:
         return None
     try:
@@ -623,28 +905,71 @@ def scope_read_fft_vertical_params(resource=TEK_RSRC_DEFAULT):
         if scale is None and position is None:
             return None
         return {"scale": scale, "position": position}
+    except Exception:
+        _drop_session(resource)
+        raise
     finally:
-        with suppress(Exception):
-            sc.close()
+        _release_session(resource)
+
+
+_SHOT_FIG: Any = None
+_MKDIR_CACHE: set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """``os.makedirs(path, exist_ok=True)`` once per directory per process."""
+    if path and path not in _MKDIR_CACHE:
+        os.makedirs(path, exist_ok=True)
+        _MKDIR_CACHE.add(path)
+
+
+def _ensure_mpl_config_dir() -> None:
+    """Point MPLCONFIGDIR at a writable cache before matplotlib is first imported."""
+    if "MPLCONFIGDIR" in os.environ:
+        return
+    for cache_dir in (
+        os.path.join(os.path.expanduser("~"), ".cache", "matplotlib"),
+        os.path.join(os.getcwd(), ".matplotlib-cache"),
+    ):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except Exception:
+            continue
+        os.environ["MPLCONFIGDIR"] = cache_dir
+        return
+
+
+def _screenshot_axes():
+    """Return the reusable (figure, axes) pair drawn on a bare Agg canvas.
+
+    matplotlib is imported here on first use so GUI/CLI start-up never pays for it.
+    """
+    global _SHOT_FIG
+    if _SHOT_FIG is None:
+        _ensure_mpl_config_dir()
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        _SHOT_FIG = Figure()
+        FigureCanvasAgg(_SHOT_FIG)
+        _SHOT_FIG.add_subplot()
+    ax = _SHOT_FIG.axes[0]
+    ax.clear()
+    return _SHOT_FIG, ax
 
 
 def scope_screenshot(
     filename="results/scope.png", resource=TEK_RSRC_DEFAULT, timeout_ms=15000, ch=1
 ):
     _need_pyvisa()
-    import os
-
-    import matplotlib.pyplot as _plt
-
-    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    _ensure_dir(os.path.dirname(filename) or ".")
     src_label = _resolve_source(ch)
     t, v = scope_capture_calibrated(resource, timeout_ms, ch=ch)
-    _plt.figure()
-    _plt.plot(t, v)
-    _plt.xlabel("Time (s)")
-    _plt.ylabel("Voltage (V)")
-    _plt.title(f"Scope {src_label} Waveform")
-    _plt.grid(True)
-    _plt.savefig(filename, bbox_inches="tight")
-    _plt.close()
+    fig, ax = _screenshot_axes()
+    ax.plot(t, v)
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Voltage (V)")
+    ax.set_title(f"Scope {src_label} Waveform")
+    ax.grid(True)
+    fig.savefig(filename)
     return filename
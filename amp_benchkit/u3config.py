@@ -17,7 +17,9 @@ Split out from unified_gui_layout for reuse and easier testing.
 from __future__ import annotations
 
 import time
-from contextlib import suppress
+from contextlib import contextmanager, suppress
+
+import numpy as np
 
 from . import deps as _deps
 from .u3util import open_u3_safely as u3_open
@@ -40,6 +42,20 @@ def _u3_mod():
     return getattr(_deps, "_u3", None)
 
 
+@contextmanager
+def _u3_handle(device=None):
+    """Yield ``device`` unchanged, or a temporary handle that is closed on exit."""
+    if device is not None:
+        yield device
+        return
+    d = u3_open()
+    try:
+        yield d
+    finally:
+        with suppress(Exception):
+            d.close()
+
+
 def _clamp_resolution(resolution_index: int | None) -> int | None:
     if resolution_index is None:
         return None
@@ -51,19 +67,19 @@ def _clamp_resolution(resolution_index: int | None) -> int | None:
     return max(0, min(12, ri))
 
 
-def u3_read_ain(ch: int = 0, *, resolution_index: int | None = None) -> float:
+def u3_read_ain(ch: int = 0, *, resolution_index: int | None = None, device=None) -> float:
     """Read a single analog channel (AIN0–AIN15).
 
     The LabJack U3 datasheet (Rev 1.30 hardware) exposes up to 16 analog channels
     mapped across FIO0–FIO7 and EIO0–EIO7. Older helper limited the range to 0–3,
     which prevented access to HV-only inputs such as AIN14 (temperature sense).
+    Pass an open ``device`` to reuse it; otherwise a handle is opened per call.
     """
 
     ch = int(ch)
     if ch < 0 or ch > 15:
         raise ValueError("AIN channel must be between 0 and 15")
-    d = u3_open()
-    try:
+    with _u3_handle(device) as d:
         ri = _clamp_resolution(resolution_index)
         kwargs: dict[str, int] = {}
         use_resolution = ri is not None
@@ -75,9 +91,6 @@ def u3_read_ain(ch: int = 0, *, resolution_index: int | None = None) -> float:
             if use_resolution and "ResolutionIndex" in str(exc):
                 return float(d.getAIN(ch))
             raise
-    finally:
-        with suppress(Exception):
-            d.close()
 
 
 def u3_read_multi(
@@ -86,8 +99,12 @@ def u3_read_multi(
     delay_s: float = 0.0,
     *,
     resolution_index: int | None = None,
+    device=None,
 ):
-    """Read multiple analog channels sequentially.
+    """Read multiple analog channels, one USB feedback transaction per sample.
+
+    Falls back to per-channel ``getAIN`` calls when a resolution index is honoured
+    by the driver or the feedback API is unavailable.
 
     Parameters
     ----------
@@ -99,40 +116,75 @@ def u3_read_multi(
         Optional delay between samples (seconds).
     resolution_index : int | None
         Optional LabJack resolution index (clamped to 0–12 per datasheet guidance).
+    device : U3 | None
+        Already-open handle to reuse; when omitted a handle is opened and closed.
+
+    Returns
+    -------
+    numpy.ndarray
+        float64 array of shape ``(samples, n_channels)``; column ``k`` holds
+        every sample of the k-th valid channel.
     """
 
     chs = [int(c) for c in ch_list if 0 <= int(c) <= 15]
     if not chs:
         chs = [0]
-    d = u3_open()
-    vals = []
-    try:
+    n_samples = max(1, int(samples))
+    with _u3_handle(device) as d:
         ri = _clamp_resolution(resolution_index)
         supports_resolution = ri is not None
         kwargs: dict[str, int] = {}
         if supports_resolution and ri is not None:
             kwargs["ResolutionIndex"] = ri
-        for _ in range(max(1, int(samples))):
-            row = []
-            for c in chs:
-                try:
-                    if supports_resolution:
-                        row.append(float(d.getAIN(c, **kwargs)))
-                    else:
-                        row.append(float(d.getAIN(c)))
-                except TypeError as exc:
-                    if supports_resolution and "ResolutionIndex" in str(exc):
-                        supports_resolution = False
-                        row.append(float(d.getAIN(c)))
-                    else:
-                        raise
-            vals.append(row)
+        batch = None if supports_resolution else _ain_feedback_reader(d, chs)
+        arr = np.empty((n_samples, len(chs)), dtype=np.float64)
+        for i in range(n_samples):
+            if batch is not None:
+                arr[i] = batch()
+            else:
+                for j, c in enumerate(chs):
+                    try:
+                        if supports_resolution:
+                            arr[i, j] = d.getAIN(c, **kwargs)
+                        else:
+                            arr[i, j] = d.getAIN(c)
+                    except TypeError as exc:
+                        if supports_resolution and "ResolutionIndex" in str(exc):
+                            supports_resolution = False
+                            arr[i, j] = d.getAIN(c)
+                        else:
+                            raise
+                if not supports_resolution and batch is None:
+                    batch = _ain_feedback_reader(d, chs)
             if delay_s > 0:
                 time.sleep(delay_s)
-        return vals
-    finally:
-        with suppress(Exception):
-            d.close()
+        return arr
+
+
+def _ain_feedback_reader(d, chs):
+    """Return a callable reading every channel in one ``getFeedback`` round-trip.
+
+    Mirrors ``U3.getAIN`` (single-ended, HV range for AIN0-3 on U3-HV) but sends
+    all ``AIN`` commands in a single USB transaction. Returns ``None`` when the
+    driver or device lacks the feedback API so callers fall back to ``getAIN``.
+    """
+    ain = getattr(_u3_mod(), "AIN", None)
+    feedback = getattr(d, "getFeedback", None)
+    convert = getattr(d, "binaryToCalibratedAnalogVoltage", None)
+    if ain is None or feedback is None or convert is None:
+        return None
+    cmds = [ain(c) for c in chs]
+    is_hv = bool(getattr(d, "isHV", False))
+    low_voltage = [not (is_hv and c < 4) for c in chs]
+
+    def read():
+        bits = feedback(*cmds)
+        return [
+            convert(b, isLowVoltage=lv, isSingleEnded=True, isSpecialSetting=False, channelNumber=c)
+            for b, lv, c in zip(bits, low_voltage, chs, strict=True)
+        ]
+
+    return read
 
 
 def _global_index(line: str):
@@ -153,7 +205,7 @@ def _global_index(line: str):
     return base + idx_local
 
 
-def u3_set_line(line: str, state: int):
+def u3_set_line(line: str, state: int, *, device=None):
     if not _have_u3():
         return
     lj = _u3_mod()
@@ -162,30 +214,26 @@ def u3_set_line(line: str, state: int):
     gi = _global_index(line)
     if gi is None:
         return
-    d = u3_open()
-    try:
+    with _u3_handle(device) as d:
         st = 1 if state else 0
         try:
             d.getFeedback(lj.BitStateWrite(gi, st))
         except Exception:
             with suppress(Exception):
                 d.setDOState(gi, st)
-    finally:
-        with suppress(Exception):
-            d.close()
 
 
-def u3_pulse_line(line: str, width_ms: float = 5.0, level: int = 1):
+def u3_pulse_line(line: str, width_ms: float = 5.0, level: int = 1, *, device=None):
     if not _have_u3():
         return
     try:
-        u3_set_line(line, level)
+        u3_set_line(line, level, device=device)
         time.sleep(max(0.0, float(width_ms) / 1000.0))
     finally:
-        u3_set_line(line, 0 if level else 1)
+        u3_set_line(line, 0 if level else 1, device=device)
 
 
-def u3_set_dir(line: str, direction: int):
+def u3_set_dir(line: str, direction: int, *, device=None):
     if not _have_u3():
         return
     lj = _u3_mod()
@@ -194,8 +242,7 @@ def u3_set_dir(line: str, direction: int):
     gi = _global_index(line)
     if gi is None:
         return
-    d = u3_open()
-    try:
+    with _u3_handle(device) as d:
         try:
             d.getFeedback(lj.BitDirWrite(gi, 1 if direction else 0))
         except Exception:
@@ -210,9 +257,6 @@ def u3_set_dir(line: str, direction: int):
                     d.getFeedback(lj.PortDirWrite(Direction=[0, 0, 0], WriteMask=[0, mask, 0]))
                 else:
                     d.getFeedback(lj.PortDirWrite(Direction=[0, 0, 0], WriteMask=[0, 0, mask]))
-    finally:
-        with suppress(Exception):
-            d.close()
 
 
 def u3_autoconfigure_for_automation(pulse_line: str, base: str = "current"):
@@ -1,4 +1,7 @@
 import math
+import threading
+
+import pytest
 
 from amp_benchkit.automation import build_freq_list, sweep_audio_kpis, sweep_scope_fixed
 
@@ -207,3 +210,216 @@ def test_sweep_audio_kpis_uses_amp_strategy_and_calibration():
     assert abs(row[1] - 1.0) < 1e-9
     assert abs(row[2] - 2.0) < 1e-9
     assert amps == [0.5]
+
+
+def test_sweep_audio_kpis_keeps_dwell_and_polls_scope_ready(monkeypatch):
+    from amp_benchkit import automation
+
+    events = []
+    monkeypatch.setattr(automation.time, "sleep", lambda s: events.append(("sleep", s)))
+    res = sweep_audio_kpis(
+        freqs=[1000, 2000],
+        channel=1,
+        scope_channel=1,
+        amp_vpp=1.0,
+        dwell_s=0.5,
+        fy_apply=lambda **kw: None,
+        scope_capture_calibrated=lambda resrc, ch: ([0.0, 0.001], [0.0, 1.0]),
+        dsp_vrms=lambda v: 1.0,
+        dsp_vpp=lambda v: 2.0,
+        scope_arm_single=lambda resrc: events.append(("arm",)),
+        scope_wait_single_complete=lambda resrc, timeout: False,
+        scope_wait_ready=lambda resrc, max_wait: events.append(("ready", max_wait)) or True,
+    )
+    assert len(res["rows"]) == 2
+    # The settling dwell is slept before every arm; readiness only replaces the fallback.
+    first = events[: events.index(("ready", 0.4)) + 1]
+    assert first[:2] == [("sleep", 0.5), ("arm",)]
+    assert events.count(("sleep", 0.5)) == 2
+    assert events.count(("ready", 0.4)) == 2
+
+
+def test_sweep_audio_kpis_sleeps_dwell_without_scope_ready(monkeypatch):
+    from amp_benchkit import automation
+
+    sleeps = []
+    monkeypatch.setattr(automation.time, "sleep", lambda s: sleeps.append(s))
+    sweep_audio_kpis(
+        freqs=[1000],
+        channel=1,
+        scope_channel=1,
+        amp_vpp=1.0,
+        dwell_s=0.5,
+        fy_apply=lambda **kw: None,
+        scope_capture_calibrated=lambda resrc, ch: ([0.0, 0.001], [0.0, 1.0]),
+        dsp_vrms=lambda v: 1.0,
+        dsp_vpp=lambda v: 2.0,
+    )
+    assert sleeps[0] == 0.5
+
+
+def test_sweep_scope_fixed_overlaps_fy_with_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    attempted = []
+    fy_threads = []
+    main_thread = threading.get_ident()
+
+    def fake_fy_apply(freq_hz, **kw):
+        attempted.append(freq_hz)
+        fy_threads.append(threading.get_ident())
+        if freq_hz == 200:
+            raise RuntimeError("FY failure")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        out = sweep_scope_fixed(
+            freqs=[100, 200, 300],
+            channel=1,
+            scope_channel=1,
+            amp_vpp=1.0,
+            dwell_s=0.0,
+            metric="RMS",
+            fy_apply=fake_fy_apply,
+            scope_measure=lambda src, metric: 1.0,
+            executor=pool,
+        )
+    assert attempted == [100, 200, 300]
+    assert main_thread not in fy_threads
+    assert [row[0] for row in out] == [100, 300]
+
+
+def test_sweep_scope_fixed_async_aborts_during_settle():
+    import asyncio
+
+    from amp_benchkit.automation import sweep_scope_fixed_async
+
+    measured = []
+    abort = {"flag": False}
+
+    def fake_fy_apply(freq_hz, **kw):
+        abort["flag"] = freq_hz == 200
+
+    out = asyncio.run(
+        sweep_scope_fixed_async(
+            freqs=[100, 200, 300],
+            channel=1,
+            scope_channel=1,
+            amp_vpp=1.0,
+            dwell_s=0.01,
+            metric="RMS",
+            fy_apply=fake_fy_apply,
+            scope_measure=lambda src, metric: measured.append(src) or 1.0,
+            abort_flag=lambda: abort["flag"],
+        )
+    )
+    assert [row[0] for row in out] == [100]
+    assert measured == [1]
+
+
+def test_sweep_scope_fixed_pipelines_measure_with_next_fy():
+    fy_200 = threading.Event()
+    overlapped = []
+
+    def fake_fy_apply(freq_hz, **kw):
+        if freq_hz == 200:
+            fy_200.set()
+
+    def fake_scope_measure(src, metric):
+        # Step 100 is still being read when step 200 programs the generator.
+        if not overlapped:
+            overlapped.append(fy_200.wait(2.0))
+        return 1.0
+
+    out = sweep_scope_fixed(
+        freqs=[100, 200],
+        channel=1,
+        scope_channel=1,
+        amp_vpp=1.0,
+        dwell_s=0.0,
+        metric="RMS",
+        fy_apply=fake_fy_apply,
+        scope_measure=fake_scope_measure,
+        scope_arm_single=lambda res: None,
+        scope_wait_single_complete=lambda res, timeout_s: True,
+    )
+    assert overlapped == [True]
+    assert out == [(100, 1.0), (200, 1.0)]
+
+
+def test_sweep_scope_fixed_streams_rows():
+    streamed = []
+    out = sweep_scope_fixed(
+        freqs=[100, 200],
+        channel=1,
+        scope_channel=1,
+        amp_vpp=1.0,
+        dwell_s=0.0,
+        metric="PK2PK",
+        fy_apply=lambda **kw: None,
+        scope_measure=lambda src, metric: 2.0,
+        on_row=lambda f, val: streamed.append((f, val)),
+    )
+    assert streamed == out == [(100, 2.0), (200, 2.0)]
+
+
+def test_sweep_scope_fixed_batches_multiple_metrics():
+    batches = []
+
+    def _batch(src, keys):
+        batches.append(list(keys))
+        return [0.5, 2.0]
+
+    out = sweep_scope_fixed(
+        freqs=[100, 200],
+        channel=1,
+        scope_channel=1,
+        amp_vpp=1.0,
+        dwell_s=0.0,
+        metric="RMS+PK2PK",
+        fy_apply=lambda **kw: None,
+        scope_measure=lambda src, metric: pytest.fail("per-metric read used"),
+        scope_measure_batch=_batch,
+    )
+    assert out == [(100, 0.5, 2.0), (200, 0.5, 2.0)]
+    assert batches == [["RMS", "PK2PK"], ["RMS", "PK2PK"]]
+
+
+def test_sweep_scope_fixed_instrument_averaging_keeps_dwell(monkeypatch):
+    from amp_benchkit import automation
+
+    events = []
+
+    async def fake_sleep(s):
+        events.append(("sleep", s))
+
+    monkeypatch.setattr(automation.asyncio, "sleep", fake_sleep)
+    calls = []
+    out = sweep_scope_fixed(
+        freqs=[1000, 2000],
+        channel=1,
+        scope_channel=1,
+        amp_vpp=1.0,
+        dwell_s=5.0,
+        metric="RMS",
+        fy_apply=lambda **kw: None,
+        scope_measure=lambda src, metric: 0.5,
+        scope_arm_single=lambda res: events.append(("arm",)),
+        scope_wait_single_complete=lambda res, timeout_s: events.append(("wait", timeout_s)),
+        scope_set_averaging=lambda res, n: calls.append(n),
+        average_count=16,
+        pre_ms=0.0,
+    )
+    assert out == [(1000, 0.5), (2000, 0.5)]
+    assert calls == [16, 0]
+    # Dwell before each arm; the averaging wait replaces only the capture-window sleep.
+    assert [e[0] for e in events] == ["sleep", "arm", "wait"] * 2
+    assert all(e[1] == 5.0 for e in events if e[0] == "sleep")
+    assert events[2][1] >= 16 * 6.0 / 1000
+
+
+def test_build_freq_list_no_drift():
+    freqs = build_freq_list(20, 20000, 0.1)
+    assert len(freqs) == 199801
+    assert freqs[-1] == 20000.0
+    assert freqs[12345] == round(20 + 12345 * 0.1, 6)
+    assert build_freq_list(300, 100, 100) == []
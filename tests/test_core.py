@@ -1,10 +1,11 @@
 import math
 
 import numpy as np
+import pytest
 
 from amp_benchkit.dsp import find_knees, thd_fft
 from amp_benchkit.fy import build_fy_cmds
-from unified_gui_layout import _decode_ieee_block
+from unified_gui_layout import _TESTS, _decode_ieee_block
 
 
 def test_build_fy_cmds_basic():
@@ -18,6 +19,9 @@ def test_ieee_block_decode():
     raw = b"#3100" + bytes(range(100)) + b"extra"
     dec = _decode_ieee_block(raw)
     assert len(dec) == 100 and dec[0] == 0 and dec[-1] == 99
+    assert isinstance(dec, memoryview)
+    assert np.shares_memory(np.asarray(dec), np.frombuffer(raw, dtype=np.uint8))
+    assert bytes(dec) == bytes(range(100))
 
 
 def test_thd_fft():
@@ -36,3 +40,75 @@ def test_find_knees():
     amps = np.array([1, 1, 1, 1, 1, 1, 1, 0.7, 0.4, 0.2], dtype=float)
     f_lo, f_hi, ref_amp, ref_db = find_knees(freqs, amps, ref_mode="max", drop_db=3.0)
     assert math.isfinite(f_hi) and f_hi > 1000
+
+
+def test_selftest_registry_passes(capsys):
+    from unified_gui_layout import _TESTS, _run_selftest, _test_sig
+
+    assert _run_selftest() is True
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == len(_TESTS) and out[-1].startswith("Test10 OK")
+    assert _test_sig() is _test_sig()
+
+
+@pytest.mark.parametrize(("name", "check"), _TESTS, ids=[name for name, _ in _TESTS])
+def test_selftest_case(name, check):
+    assert check()
+
+
+def test_u3_masks_snapshot_without_qt():
+    from types import SimpleNamespace
+
+    from unified_gui_layout import UnifiedGUI
+
+    def box(*states):
+        return [SimpleNamespace(isChecked=lambda s=s: s) for s in states]
+
+    gui = SimpleNamespace(
+        ai_checks=box(True, True, False, False),
+        fio_dir_box=box(False, True),
+        fio_state_box=box(True, False, True),
+    )
+    gui._mask_from_checks = lambda checks: UnifiedGUI._mask_from_checks(gui, checks)
+    masks = UnifiedGUI._u3_masks(gui)
+    assert (masks.fio_an, masks.fio_dir, masks.fio_state) == (0b11, 0b10, 0b101)
+    assert masks.eio_an == masks.cio_dir == masks.cio_state == 0
+    del gui.ai_checks
+    assert UnifiedGUI._u3_masks(gui, fio_an_default=0x0F).fio_an == 0x0F
+
+
+def test_log_before_timer_appends_plain_text():
+    from types import SimpleNamespace
+
+    from unified_gui_layout import UnifiedGUI
+
+    lines = []
+    widget = SimpleNamespace(appendPlainText=lines.append)
+    UnifiedGUI._log(SimpleNamespace(), widget, "early line")
+    assert lines == ["early line"]
+
+
+def test_u3_port_write_mask_tracks_states_and_config():
+    from unified_gui_layout import _u3_port_write_mask
+
+    full = [0xFF, 0xFF, 0x0F]
+    cfg = (0x0F, 0, 0xF0, 0xFF, 0x0F)
+    assert _u3_port_write_mask((0x10, 0, 0), cfg, None) == full
+    last = ((0x10, 0, 0), cfg)
+    assert _u3_port_write_mask((0x10, 0, 0), cfg, last) == [0, 0, 0]
+    assert _u3_port_write_mask((0x30, 0x01, 0), cfg, last) == [0x20, 0x01, 0]
+    # A direction (or analog) change rewrites every pin even if states match
+    assert _u3_port_write_mask((0x10, 0, 0), (0x0F, 0, 0xF1, 0xFF, 0x0F), last) == full
+
+
+def test_ui_call_failures_are_logged(caplog):
+    from types import SimpleNamespace
+
+    from unified_gui_layout import UnifiedGUI
+
+    def boom():
+        raise RuntimeError("progress bar gone")
+
+    with caplog.at_level("ERROR", logger="amp_benchkit.gui"):
+        UnifiedGUI._run_ui_call(SimpleNamespace(), boom)
+    assert "progress bar gone" in caplog.text
@@ -0,0 +1,30 @@
+"""Tests for diagnostics collection (no hardware required)."""
+
+from __future__ import annotations
+
+import threading
+
+from amp_benchkit import diagnostics
+
+
+def test_collect_diagnostics_runs_probes_concurrently(monkeypatch):
+    # Each probe waits for the other: serial execution would break the barrier.
+    barrier = threading.Barrier(3, timeout=2.0)
+
+    def _probe(result):
+        def _run():
+            barrier.wait()
+            return result
+
+        return _run
+
+    monkeypatch.setattr(diagnostics, "_serial_lines", _probe(["/dev/ttyFAKE0 (dummy)"]))
+    monkeypatch.setattr(diagnostics, "_visa_lines", _probe(["USB0::FAKE::INSTR"]))
+    monkeypatch.setattr(diagnostics, "_hardware_section", _probe(("[Hardware]", ["U3 ok"])))
+    monkeypatch.setattr(diagnostics, "find_fy_port", lambda: None)
+
+    text = diagnostics.collect_diagnostics(include_environment=False)
+    assert text.index("[Dependencies]") < text.index("[Connectivity]") < text.index("[Hardware]")
+    assert "/dev/ttyFAKE0 (dummy)" in text
+    assert "USB0::FAKE::INSTR" in text
+    assert "U3 ok" in text
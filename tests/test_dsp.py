@@ -21,6 +21,24 @@ def test_thd_fft_basic():
     assert 0.045 < thd < 0.055  # tighter bounds around 5% THD
 
 
+def test_thd_fft_known_harmonics():
+    from amp_benchkit.dsp import _harmonic_amplitudes
+
+    fs = 48000.0
+    f0 = 1000.0
+    t = np.arange(4800) / fs
+    harm = {2: 0.02, 3: 0.01, 5: 0.005}
+    sig = 1.5 * np.sin(2 * np.pi * f0 * t)
+    for k, a in harm.items():
+        sig += a * np.sin(2 * np.pi * k * f0 * t + 0.3 * k)
+    thd, _, fund = thd_fft(t, sig, f0=f0, nharm=6)
+    expected = np.sqrt(sum(a * a for a in harm.values())) / 1.5
+    assert abs(fund - 1.5) < 1e-9
+    assert abs(thd - expected) < 1e-9
+    amps = _harmonic_amplitudes(t, sig - 1.5 * np.sin(2 * np.pi * f0 * t), 2 * np.pi * f0, 6)
+    np.testing.assert_allclose(amps, [0.02, 0.01, 0.0, 0.005, 0.0], atol=1e-9)
+
+
 def test_find_knees():
     freqs = np.array([10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000], dtype=float)
     amps = np.array([1, 1, 1, 1, 1, 1, 1, 0.7, 0.4, 0.2], dtype=float)
@@ -28,8 +46,26 @@ def test_find_knees():
     assert np.isfinite(f_hi) and f_hi > 1000
 
 
+def test_find_knees_interpolates_both_sides():
+    freqs = np.array([10, 20, 40, 100, 1000, 10000, 20000, 40000], dtype=float)
+    amps = np.array([0.25, 0.5, 0.9, 1.0, 1.0, 0.9, 0.5, 0.25], dtype=float)
+    drop = -20 * np.log10(0.5)
+    f_lo, f_hi, ref_amp, ref_db = find_knees(freqs, amps, ref_mode="max", drop_db=drop)
+    assert ref_amp == 1.0 and ref_db == 0.0
+    assert abs(f_lo - 20.0) < 1e-6 and abs(f_hi - 20000.0) < 1e-6
+    assert np.isnan(find_knees(freqs, amps, drop_db=40.0)[0])
+
+
 def test_legacy_wrappers_removed():
     import unified_gui_layout as legacy
 
     # Deprecated wrappers were removed after modularization cleanup.
     assert not hasattr(legacy, "vrms") and not hasattr(legacy, "vpp")
+
+
+def test_rfft_numpy_fallback(monkeypatch):
+    import amp_benchkit.dsp as dsp_mod
+
+    x = np.sin(np.linspace(0, 8 * np.pi, 64))
+    monkeypatch.setattr(dsp_mod, "_scipy_fft", None)
+    assert np.allclose(dsp_mod._rfft(x), np.fft.rfft(x))
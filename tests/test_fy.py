@@ -0,0 +1,183 @@
+"""Tests for FY generator serial helpers (no hardware required)."""
+
+from __future__ import annotations
+
+import pytest
+
+from amp_benchkit import fy
+
+
+class DummySerial:
+    opened: list[DummySerial] = []
+
+    def __init__(self, port, baudrate=9600, timeout=1):
+        self.port = port
+        self.baudrate = baudrate
+        self.is_open = True
+        self.writes: list[bytes] = []
+        self.flushes = 0
+        DummySerial.opened.append(self)
+
+    def write(self, data):
+        self.writes.append(data)
+        return len(data)
+
+    def flush(self):
+        self.flushes += 1
+
+    def close(self):
+        self.is_open = False
+
+
+class DummySerialModule:
+    Serial = DummySerial
+
+
+@pytest.fixture
+def dummy_serial(monkeypatch):
+    DummySerial.opened = []
+    monkeypatch.setattr(fy, "_serial", DummySerialModule)
+    monkeypatch.setattr(fy, "HAVE_SERIAL", True)
+    fy.fy_close_all()
+    yield DummySerial
+    fy.fy_close_all()
+
+
+def test_fy_apply_reuses_cached_handle(dummy_serial):
+    fy.fy_apply(freq_hz=1000, port="/dev/ttyFAKE0")
+    fy.fy_apply(freq_hz=2000, port="/dev/ttyFAKE0")
+    assert len(dummy_serial.opened) == 1
+    handle = dummy_serial.opened[0]
+    assert len(handle.writes) == 2
+    assert handle.writes[0] == b"bw0\nbf000100000\nbo0.00\nba0.25\n"
+    assert b"".join(handle.writes).count(b"bf") == 2
+    assert handle.flushes == len(handle.writes)
+
+    fy.fy_sweep("/dev/ttyFAKE0", 1, "FY ASCII 9600", start=100, end=200)
+    assert len(dummy_serial.opened) == 1
+    assert handle.writes[-1] == b"bb000010000\nbe000020000\n"
+
+
+def test_fy_close_all_closes_handles(dummy_serial):
+    fy.fy_apply(freq_hz=1000, port="/dev/ttyFAKE1")
+    handle = dummy_serial.opened[0]
+    fy.fy_close_all()
+    assert not handle.is_open
+    fy.fy_apply(freq_hz=1000, port="/dev/ttyFAKE1")
+    assert len(dummy_serial.opened) == 2
+
+
+def test_fy_low_latency_writes_sysfs(monkeypatch, tmp_path):
+    dev = tmp_path / "ttyUSB0"
+    dev.mkdir()
+    monkeypatch.setattr(fy, "_USB_SERIAL_SYSFS", str(tmp_path))
+    monkeypatch.setattr(fy.sys, "platform", "linux")
+    assert fy._fy_low_latency("/dev/ttyUSB0") is True
+    assert (dev / "latency_timer").read_text() == "1"
+    assert fy._fy_low_latency("/dev/ttyUSB9") is False
+    monkeypatch.setattr(fy.sys, "platform", "darwin")
+    assert fy._fy_low_latency("/dev/ttyUSB0") is False
+
+
+def test_fy_low_latency_sets_serial_flag(monkeypatch, tmp_path):
+    class LowLatencySerial:
+        flags: list[bool] = []
+
+        def set_low_latency_mode(self, on):
+            self.flags.append(on)
+
+    monkeypatch.setattr(fy, "_USB_SERIAL_SYSFS", str(tmp_path))
+    monkeypatch.setattr(fy.sys, "platform", "linux")
+    ser = LowLatencySerial()
+    assert fy._fy_low_latency("/dev/ttyUSB7", ser) is True
+    assert ser.flags == [True]
+    assert fy._fy_low_latency("/dev/ttyUSB7", object()) is False
+
+
+def test_fy_worker_coalesces_pending_jobs():
+    import threading
+
+    gate = threading.Event()
+    ran: list[str] = []
+    results: list[tuple[object, object]] = []
+    all_done = threading.Event()
+
+    def _done(result, error):
+        results.append((result, error))
+        if result == "a2":
+            all_done.set()
+
+    worker = fy.FYWorker()
+    worker.start()
+    try:
+        worker.submit("block", lambda: gate.wait(2.0))
+        worker.submit("a", lambda: ran.append("a1") or "a1", _done)
+        worker.submit("a", lambda: ran.append("a2") or "a2", _done)
+        gate.set()
+        assert all_done.wait(2.0)
+    finally:
+        worker.stop()
+    assert ran == ["a2"]
+    assert results == [("a2", None)]
+
+
+def test_list_ports_ttl_cache_and_fy_match(monkeypatch):
+    from types import SimpleNamespace
+
+    from amp_benchkit import deps
+
+    calls = []
+
+    class DummyListPorts:
+        @staticmethod
+        def comports():
+            calls.append(1)
+            return [
+                SimpleNamespace(device="/dev/ttyS0"),
+                SimpleNamespace(device="/dev/ttyUSB-FTDI"),
+            ]
+
+    monkeypatch.setattr(deps, "HAVE_SERIAL", True)
+    monkeypatch.setattr(deps, "_lp", DummyListPorts)
+    monkeypatch.setattr(deps, "_PORTS_CACHE", None)
+
+    assert deps.find_fy_port() == "/dev/ttyUSB-FTDI"
+    assert len(deps.list_ports()) == 2
+    assert len(calls) == 1
+    deps.list_ports(ttl_s=0.0)
+    assert len(calls) == 2
+    assert deps._find_fy_port_in([SimpleNamespace(device="/dev/ttyS0")]) is None
+
+
+def test_fy_make_applier_binds_port_and_channel(dummy_serial):
+    apply = fy.fy_make_applier("/dev/ttyFAKE2", ch=2)
+    cmds = apply(freq_hz=500, amp_vpp=1.0)
+    assert cmds[1] == "df000050000"
+    handle = dummy_serial.opened[0]
+    assert handle.writes[-1].startswith(b"dw0\ndf000050000\n")
+    apply(freq_hz=600, amp_vpp=1.0, ch=1)
+    assert handle.writes[-1].startswith(b"bw0\nbf000060000\n")
+    assert len(dummy_serial.opened) == 1
+
+
+def test_fy_sweep_ch2_handshake_single_write(dummy_serial):
+    cmds = fy.fy_sweep("/dev/ttyFAKE3", 2, fy.FY_PROTOCOLS[1], t_s=5, run=True)
+    assert cmds == ["tn1000000", "tt2", "dt05", "dr1"]
+    handle = dummy_serial.opened[0]
+    assert handle.writes == [b"tn1000000\r\ntt2\r\ndt05\r\ndr1\r\n"]
+    assert handle.flushes == 1
+
+
+def test_open_fy_port_closes_only_handles_it_opened(dummy_serial):
+    with fy.open_fy_port("/dev/ttyFAKE4", ch=1) as apply:
+        apply(freq_hz=100)
+        apply(freq_hz=200)
+    handle = dummy_serial.opened[0]
+    assert len(handle.writes) == 2
+    assert not handle.is_open
+
+    fy.fy_apply(freq_hz=100, port="/dev/ttyFAKE5")
+    with fy.open_fy_port("/dev/ttyFAKE5", ch=1) as apply:
+        apply(freq_hz=300)
+    assert dummy_serial.opened[-1].is_open
+    assert len(dummy_serial.opened) == 2
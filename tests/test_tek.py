@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import numpy as np
+import pytest
+
 from amp_benchkit import tek
 
 
@@ -94,3 +97,414 @@ def test_scope_read_fft_vertical_params_no_pyvisa(monkeypatch):
     monkeypatch.setattr("amp_benchkit.tek.HAVE_PYVISA", False)
     result = tek.scope_read_fft_vertical_params()
     assert result is None
+
+
+def test_list_visa_resources_reuses_rm_and_caches(monkeypatch):
+    """ResourceManager is built once and listings are memoized within the TTL."""
+    created = []
+
+    class DummyRM:
+        def __init__(self):
+            created.append(self)
+            self.calls = 0
+
+        def list_resources(self):
+            self.calls += 1
+            return ("USB0::0x0699::0x036A::X::INSTR",)
+
+    class DummyVisa:
+        ResourceManager = DummyRM
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_pyvisa", DummyVisa)
+    monkeypatch.setattr(tek, "_VISA_RM", None)
+    monkeypatch.setattr(tek, "_VISA_LIST_CACHE", None)
+
+    first = tek.list_visa_resources()
+    second = tek.list_visa_resources()
+    assert first == second == ("USB0::0x0699::0x036A::X::INSTR",)
+    assert len(created) == 1
+    assert created[0].calls == 1
+
+    tek.list_visa_resources(ttl_s=0.0)
+    assert len(created) == 1
+    assert created[0].calls == 2
+
+
+def test_scope_helpers_share_resource_manager(monkeypatch):
+    """Scope helpers open sessions from the shared ResourceManager."""
+    created = []
+    writes = []
+
+    class DummySession:
+        def write(self, cmd):
+            writes.append(cmd)
+
+        def query(self, cmd):
+            return "0.001"
+
+        def close(self):
+            pass
+
+    class DummyRM:
+        def __init__(self):
+            created.append(self)
+
+        def open_resource(self, resource):
+            return DummySession()
+
+    class DummyVisa:
+        ResourceManager = DummyRM
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_pyvisa", DummyVisa)
+    monkeypatch.setattr(tek, "_VISA_RM", None)
+
+    tek.scope_resume_run("R")
+    assert tek.scope_read_timebase("R") == 0.001
+    tek.scope_configure_timebase("R", 0.002)
+    assert len(created) == 1
+    assert "HORizontal:MAIn:SCAle 0.002" in writes
+
+
+def test_scope_helpers_reuse_cached_session(monkeypatch):
+    """Helpers share one open session per resource; an I/O error drops it."""
+    opened = []
+
+    class DummySession:
+        def __init__(self):
+            self.closed = False
+
+        def write(self, cmd):
+            if cmd.startswith("HORizontal:MAIn:SCAle -"):
+                raise RuntimeError("bad scale")
+
+        def query(self, cmd):
+            return "0.001"
+
+        def close(self):
+            self.closed = True
+
+    class DummyRM:
+        def open_resource(self, resource):
+            opened.append(DummySession())
+            return opened[-1]
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_VISA_RM", DummyRM())
+    monkeypatch.setattr(tek, "_VISA_SESSIONS", {})
+
+    tek.scope_arm_single("R")
+    tek.scope_resume_run("R")
+    assert tek.scope_read_timebase("R") == 0.001
+    assert len(opened) == 1 and not opened[0].closed
+
+    with pytest.raises(RuntimeError):
+        tek.scope_configure_timebase("R", -1.0)
+    assert opened[0].closed
+    tek.scope_arm_single("R")
+    assert len(opened) == 2
+    tek.scope_close_all()
+    assert opened[1].closed
+
+
+def test_scope_set_averaging_rounds_to_supported_counts(monkeypatch):
+    writes = []
+
+    class DummySession:
+        def write(self, cmd):
+            writes.append(cmd)
+
+    class DummyRM:
+        def open_resource(self, resource):
+            return DummySession()
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_VISA_RM", DummyRM())
+    monkeypatch.setattr(tek, "_VISA_SESSIONS", {})
+
+    assert tek.scope_set_averaging("R", 10) == 16
+    assert tek.scope_set_averaging("R", 500) == 128
+    assert tek.scope_set_averaging("R", 1) == 0
+    assert writes == [
+        "ACQuire:MODe AVErage;:ACQuire:NUMAVg 16",
+        "ACQuire:MODe AVErage;:ACQuire:NUMAVg 128",
+        "ACQuire:MODe SAMple",
+    ]
+
+
+def test_wait_scope_ready_polls_opc_with_backoff(monkeypatch):
+    """*OPC? is polled until it reports completion; timeout returns False."""
+    sleeps = []
+    monkeypatch.setattr(tek.time, "sleep", lambda s: sleeps.append(s))
+
+    class DummySession:
+        def __init__(self, ready_after):
+            self.calls = 0
+            self.ready_after = ready_after
+
+        def query(self, cmd):
+            assert cmd == "*OPC?"
+            self.calls += 1
+            return "1" if self.calls > self.ready_after else "0"
+
+    sc = DummySession(ready_after=3)
+    assert tek._wait_scope_ready(sc, max_wait=5.0) is True
+    assert sc.calls == 4
+    assert sleeps == [0.01, 0.02, 0.04]
+
+    assert tek._wait_scope_ready(DummySession(ready_after=10**6), max_wait=0.0) is False
+
+
+def test_read_curve_array_prefers_query_binary_values():
+    """CURVE? goes through query_binary_values with a capped chunk size."""
+    import numpy as np
+
+    calls = {}
+
+    class DummySession:
+        def query_binary_values(self, message, **kw):
+            calls["message"] = message
+            calls.update(kw)
+            return np.arange(-2, 3, dtype=np.int8)
+
+    out = tek.read_curve_array(DummySession())
+    assert out.tolist() == [-2, -1, 0, 1, 2]
+    assert calls["message"] == "CURVE?" and calls["datatype"] == "b"
+    assert calls["chunk_size"] <= 2**18
+
+
+def test_read_curve_array_falls_back_to_read_raw():
+    class LegacySession:
+        def write(self, cmd):
+            self.cmd = cmd
+
+        def read_raw(self):
+            return b"#15" + bytes([0, 1, 2, 255, 254]) + b"\n"
+
+    out = tek.read_curve_array(LegacySession())
+    assert out.dtype.name == "int8"
+    assert out.tolist() == [0, 1, 2, -1, -2]
+
+
+def test_query_wfmpre_single_round_trip():
+    class ChainedSession:
+        def __init__(self):
+            self.queries = []
+
+        def query(self, cmd):
+            self.queries.append(cmd)
+            return "0.04;0.0;-3.0;1.0E-5;-1.25E-2\n"
+
+    sc = ChainedSession()
+    vals = tek._scale_from_wfmpre(tek._query_wfmpre(sc))
+    assert sc.queries == ["WFMPRE:YMULT?;YZERO?;YOFF?;XINCR?;XZERO?"]
+    assert vals == (0.04, 0.0, -3.0, 1e-5, -0.0125)
+
+
+def test_query_wfmpre_falls_back_per_field():
+    replies = {"WFMPRE:YMULT?": "2", "WFMPRE:YZERO?": "0", "WFMPRE:YOFF?": "1"}
+
+    class PlainSession:
+        def query(self, cmd):
+            if ";" in cmd:
+                raise RuntimeError("chained queries unsupported")
+            if cmd == "WFMPRE:XINCR?":
+                return "0.5"
+            if cmd in replies:
+                return replies[cmd]
+            raise RuntimeError("no XZERO")
+
+    vals = tek._scale_from_wfmpre(tek._query_wfmpre(PlainSession()))
+    assert vals == (2.0, 0.0, 1.0, 0.5, 0.0)
+
+
+def test_tek_measure_batch_single_query_per_point():
+    class ChainedSession:
+        def __init__(self):
+            self.writes = []
+            self.queries = []
+
+        def write(self, cmd):
+            self.writes.append(cmd)
+
+        def query(self, cmd):
+            self.queries.append(cmd)
+            return "0.707;2.0\n"
+
+    sc = ChainedSession()
+    assert tek.tek_measure_batch(sc, 2, ["RMS", "PK2PK"]) == [0.707, 2.0]
+    assert sc.writes == []
+    assert sc.queries == ["MEASU:IMM:SOURCE CH2;TYPE RMS;VAL?;TYPE PK2PK;VAL?"]
+    assert not any("MEAS1" in cmd for cmd in sc.queries)  # front-panel slots untouched
+
+
+def test_tek_measure_batch_falls_back_per_type():
+    class PlainSession:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, cmd):
+            self.writes.append(cmd)
+
+        def query(self, cmd):
+            return "1.5" if "RMS" in cmd else "3.0"
+
+    sc = PlainSession()
+    assert tek.tek_measure_batch(sc, 1, ["RMS", "PK2PK"]) == [1.5, 3.0]
+    assert sc.writes == ["MEASU:IMM:SOURCE CH1"]
+
+
+def test_scope_measure_uses_shared_session(monkeypatch):
+    opened = []
+
+    class DummySession:
+        def __init__(self):
+            self.queries = []
+            self.closed = False
+
+        def query(self, cmd):
+            self.queries.append(cmd)
+            if "FREQ" in cmd:
+                raise RuntimeError("link lost")
+            return ";".join(["0.5"] * cmd.count("VAL?"))
+
+        def close(self):
+            self.closed = True
+
+    class DummyRM:
+        def open_resource(self, resource):
+            opened.append(DummySession())
+            return opened[-1]
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_VISA_RM", DummyRM())
+    monkeypatch.setattr(tek, "_VISA_SESSIONS", {})
+
+    assert tek.scope_measure_batch("R", 1, ["RMS", "PK2PK"]) == [0.5, 0.5]
+    assert tek.scope_measure("R", "math", "RMS") == 0.5
+    assert opened[0].queries[-1] == "MEASU:IMM:SOURCE MATH;TYPE RMS;VAL?"
+    assert len(opened) == 1
+    with pytest.raises(RuntimeError):
+        tek.scope_measure("R", 2, "FREQ")
+    assert opened[0].closed
+    tek.scope_measure("R", 1, "RMS")
+    assert len(opened) == 2
+
+
+def test_parse_ieee_block_bad_header():
+    """Malformed length headers yield an empty array instead of raising."""
+    assert len(tek.parse_ieee_block(b"#x100")) == 0
+    assert len(tek.parse_ieee_block(b"#0")) == 0
+    assert len(tek.parse_ieee_block(b"#21a" + bytes(20))) == 0
+    assert len(tek.parse_ieee_block(b"#3")) == 0
+
+
+def test_scope_screenshot_reuses_agg_figure(monkeypatch, tmp_path):
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(
+        tek,
+        "scope_capture_calibrated",
+        lambda resource, timeout_ms, ch=1: (np.linspace(0, 1e-3, 50), np.sin(np.arange(50))),
+    )
+    first = tek.scope_screenshot(str(tmp_path / "a.png"), "R")
+    fig = tek._SHOT_FIG
+    second = tek.scope_screenshot(str(tmp_path / "b.png"), "R", ch="MATH")
+    assert tek._SHOT_FIG is fig
+    assert len(fig.axes) == 1 and len(fig.axes[0].lines) == 1
+    assert fig.axes[0].get_title() == "Scope MATH Waveform"
+    for path in (first, second):
+        with open(path, "rb") as fh:
+            assert fh.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_ensure_dir_creates_once(monkeypatch, tmp_path):
+    made = []
+    monkeypatch.setattr(tek, "_MKDIR_CACHE", set())
+    monkeypatch.setattr(tek.os, "makedirs", lambda p, exist_ok=False: made.append(p))
+    target = str(tmp_path / "shots")
+    tek._ensure_dir(target)
+    tek._ensure_dir(target)
+    assert made == [target]
+
+
+def test_tek_read_curve_skips_scaling_queries(monkeypatch):
+    queries = []
+
+    class DummySession:
+        def write(self, cmd):
+            pass
+
+        def query(self, cmd):
+            queries.append(cmd)
+            return "0"
+
+        def query_binary_values(self, cmd, **kwargs):
+            queries.append(cmd)
+            return np.array([-1, 0, 1], dtype=np.int8)
+
+        def close(self):
+            pass
+
+    class DummyRM:
+        def open_resource(self, resource):
+            return DummySession()
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_VISA_RM", DummyRM())
+
+    raw = tek.tek_read_curve("R", ch=2)
+    assert raw.tolist() == [-1, 0, 1]
+    assert queries == ["CURVE?"]
+
+
+def test_scope_capture_restores_session_timeout(monkeypatch):
+    class DummySession:
+        timeout = 2000
+
+        def write(self, cmd):
+            pass
+
+        def query(self, cmd):
+            return "1;0;0;1e-6;0"
+
+        def query_binary_values(self, cmd, **kwargs):
+            assert self.timeout == 500
+            return np.array([0, 1], dtype=np.int8)
+
+        def close(self):
+            pass
+
+    sc = DummySession()
+
+    class DummyRM:
+        def open_resource(self, resource):
+            return sc
+
+    monkeypatch.setattr(tek, "HAVE_PYVISA", True)
+    monkeypatch.setattr(tek, "_VISA_RM", DummyRM())
+    monkeypatch.setattr(tek, "_VISA_SESSIONS", {})
+
+    t, volts = tek.scope_capture_calibrated("R", timeout_ms=500, ch=1)
+    assert volts.tolist() == [0.0, 1.0]
+    assert sc.timeout == 2000
+
+
+def test_scope_close_all_skips_busy_session(monkeypatch):
+    closed = []
+
+    class DummySession:
+        def __init__(self, name):
+            self.name = name
+
+        def close(self):
+            closed.append(self.name)
+
+    class BusyLock:
+        def acquire(self, timeout=-1):
+            return False
+
+    monkeypatch.setattr(tek, "_VISA_SESSIONS", {"A": (None, DummySession("A"))})
+    monkeypatch.setattr(tek, "_VISA_LOCKS", {"A": BusyLock()})
+    tek.scope_close_all()
+    assert closed == [] and "A" in tek._VISA_SESSIONS
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 import amp_benchkit.u3config as u3cfg
 
 
@@ -74,7 +76,8 @@ def test_u3_read_multi_filters_channels(monkeypatch):
     monkeypatch.setattr(u3cfg, "u3_open", lambda: dev)
 
     rows = u3cfg.u3_read_multi([-1, 0, 3, 99], samples=2, resolution_index=11)
-    assert rows == [[0.0, 0.30000000000000004], [0.0, 0.30000000000000004]]
+    assert isinstance(rows, np.ndarray) and rows.shape == (2, 2)
+    assert rows.tolist() == [[0.0, 0.30000000000000004], [0.0, 0.30000000000000004]]
     expected = [
         (0, {"ResolutionIndex": 11}),
         (3, {"ResolutionIndex": 11}),
@@ -91,7 +94,7 @@ def test_u3_read_multi_defaults_to_channel_zero(monkeypatch):
     monkeypatch.setattr(u3cfg, "u3_open", lambda: dev)
 
     rows = u3cfg.u3_read_multi([], samples=1)
-    assert rows == [[0.5]]
+    assert rows.tolist() == [[0.5]]
     assert calls == [(0, {})]
 
 
@@ -112,6 +115,53 @@ def test_u3_read_multi_legacy_resolution_fallback(monkeypatch):
     monkeypatch.setattr(u3cfg, "u3_open", lambda: dev)
 
     rows = u3cfg.u3_read_multi([0, 1], samples=1, resolution_index=3)
-    assert rows == [[0.5, 1.5]]
+    assert rows.tolist() == [[0.5, 1.5]]
     assert dev.kw_errors == [(0, {"ResolutionIndex": 3})]
     assert calls == [(0, {}), (1, {})]
+
+
+def test_u3_read_multi_batches_feedback(monkeypatch):
+    class FakeAIN:
+        def __init__(self, ch):
+            self.ch = ch
+
+    class FakeModule:
+        AIN = FakeAIN
+
+    class FeedbackDummy(DummyU3):
+        isHV = True
+
+        def __init__(self, calls):
+            super().__init__(calls)
+            self.feedback_calls = 0
+
+        def getFeedback(self, *cmds):
+            self.feedback_calls += 1
+            return [cmd.ch * 100 for cmd in cmds]
+
+        def binaryToCalibratedAnalogVoltage(self, bits, isLowVoltage, channelNumber, **_):
+            return bits / 1000.0 + (0.0 if isLowVoltage else 10.0)
+
+    calls = []
+    dev = FeedbackDummy(calls)
+    monkeypatch.setattr(u3cfg, "u3_open", lambda: dev)
+    monkeypatch.setattr(u3cfg, "_u3_mod", lambda: FakeModule)
+
+    rows = u3cfg.u3_read_multi([2, 5], samples=3)
+    assert rows.tolist() == [[10.2, 0.5]] * 3
+    assert dev.feedback_calls == 3
+    assert calls == []
+    assert dev.closed
+
+
+def test_u3_helpers_reuse_supplied_device(monkeypatch):
+    def _no_open():
+        raise AssertionError("u3_open should not be called when a device is supplied")
+
+    monkeypatch.setattr(u3cfg, "u3_open", _no_open)
+    calls = []
+    dev = DummyU3(calls)
+
+    assert math.isclose(u3cfg.u3_read_ain(1, device=dev), 1.5)
+    assert u3cfg.u3_read_multi([0], samples=2, device=dev).tolist() == [[0.5], [0.5]]
+    assert not dev.closed
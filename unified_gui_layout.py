@@ -11,36 +11,25 @@ Refined to prefer PySide6 automatically (falls back to PyQt5). Headless selftest
 """
 
 import argparse
+import asyncio
 import csv
+import logging
 import math
 import os
 import sys
+import threading
 import time
-from contextlib import suppress
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, NamedTuple, TypedDict
 
 import numpy as np
 
-# Ensure matplotlib can build its cache even when the user home dir is read-only.
-if "MPLCONFIGDIR" not in os.environ:
-    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "matplotlib")
-    try:
-        os.makedirs(cache_dir, exist_ok=True)
-    except Exception:
-        cache_dir = os.path.join(os.getcwd(), ".matplotlib-cache")
-        try:
-            os.makedirs(cache_dir, exist_ok=True)
-        except Exception:
-            cache_dir = ""
-    if cache_dir:
-        os.environ["MPLCONFIGDIR"] = cache_dir
-
-import matplotlib
-
-matplotlib.use("Agg")
-
 # Import extracted dependency detection & helpers
 from amp_benchkit import dsp as _dsp
 from amp_benchkit.automation import build_freq_points
@@ -50,7 +39,7 @@ from amp_benchkit.deps import (
     HAVE_QT,
     HAVE_U3,
     INSTALL_HINTS,
-    _pyvisa,
+    _find_fy_port_in,
     _u3,
     find_fy_port,
     list_ports,
@@ -58,30 +47,43 @@ from amp_benchkit.deps import (
 
 # Imported refactored helpers
 from amp_benchkit.diagnostics import collect_diagnostics
-from amp_benchkit.fy import FY_BAUD_EOLS, build_fy_cmds, fy_apply, fy_sweep
+from amp_benchkit.fy import (
+    FY_BAUD_EOLS,
+    FYWorker,
+    build_fy_cmds,
+    fy_apply,
+    fy_sweep,
+    open_fy_port,
+)
 from amp_benchkit.gui import build_generator_tab, build_scope_tab
 from amp_benchkit.logging import get_logger, setup_logging
 from amp_benchkit.sweeps import format_thd_rows, knee_sweep, thd_sweep
 from amp_benchkit.tek import (
     TEK_RSRC_DEFAULT,
+    list_visa_resources,
     parse_ieee_block,
     scope_arm_single,
     scope_capture_calibrated,
     scope_capture_fft_trace,
+    scope_close_all,
     scope_configure_fft,
     scope_configure_math_subtract,
+    scope_measure,
+    scope_measure_batch,
     scope_resume_run,
     scope_screenshot,
+    scope_set_averaging,
     scope_set_trigger_ext,
+    scope_wait_ready,
     scope_wait_single_complete,
-    tek_capture_block,
+    tek_read_curve,
 )
 from amp_benchkit.u3config import (
     u3_pulse_line,
     u3_read_ain,
     u3_read_multi,
     u3_set_dir,
-    u3_set_line,
+    u3_set_line,  # noqa: F401 - re-exported for legacy callers
 )
 from amp_benchkit.u3util import open_u3_safely as u3_open
 
@@ -90,16 +92,46 @@ with suppress(Exception):  # Qt symbol imports (available if HAVE_QT True)
         QApplication,
         QFont,
         QMainWindow,
+        QObject,
+        Qt,
         QTabWidget,
         QTimer,
+        Signal,
     )
 
+_gui_log = logging.getLogger("amp_benchkit.gui")
+
 
 class _U3Caps(TypedDict):
     hardware_version: float | None
     is_hv: bool
 
 
+class _U3Masks(NamedTuple):
+    """Analog/direction/state bitmasks snapshotted from the DAQ config checkboxes."""
+
+    fio_an: int
+    eio_an: int
+    fio_dir: int
+    eio_dir: int
+    cio_dir: int
+    fio_state: int
+    eio_state: int
+    cio_state: int
+
+
+def _u3_port_write_mask(states, config, last) -> list[int]:
+    """Return the FIO/EIO/CIO ``PortStateWrite`` mask needed to apply ``states``.
+
+    ``last`` is the ``(states, config)`` pair of the previous successful write, where
+    ``config`` holds the analog/direction masks. Only pins that changed since are
+    masked in, unless nothing was written yet or the pin configuration changed.
+    """
+    if last is None or tuple(config) != tuple(last[1]):
+        return [0xFF, 0xFF, 0x0F]
+    return [new ^ old for new, old in zip(states, last[0], strict=True)]
+
+
 def _require_u3() -> Any:
     """Return the loaded LabJack module or raise if unavailable."""
 
@@ -144,13 +176,17 @@ def _resolve_output_path(value: Path | str | None, *, timestamp: bool) -> Path |
 
 # -----------------------------
 ## FY and Tek helpers removed; now imported from amp_benchkit.fy and amp_benchkit.tek
-def _decode_ieee_block(raw: bytes) -> bytes:
-    """Backward-compatible proxy around :func:`amp_benchkit.tek.parse_ieee_block`."""
+def _decode_ieee_block(raw: bytes) -> bytes | memoryview:
+    """Backward-compatible proxy around :func:`amp_benchkit.tek.parse_ieee_block`.
+
+    IEEE payloads come back as a ``memoryview`` over ``raw`` (no copy); call
+    ``bytes()`` on it where an owned buffer is required.
+    """
 
     parsed = parse_ieee_block(raw)
     if hasattr(parsed, "size"):
         if parsed.size:
-            return parsed.astype(np.uint8).tobytes()
+            return memoryview(parsed.view(np.uint8))
         # Non-IEEE payloads fall back to raw bytes to preserve legacy behaviour.
         if raw[:1] != b"#":
             return raw
@@ -158,14 +194,28 @@ def _decode_ieee_block(raw: bytes) -> bytes:
     return bytes(parsed)
 
 
+_RESULTS_DIR_READY = False
+# U3 TimerClockBase codes by combo label; anything else is the 4 MHz default.
+_U3_CLOCK_BASES = {"48MHz": 48, "750kHz": 750}
+
+
+def _ensure_results_dir() -> str:
+    """Create ``results/`` once per process and return its path."""
+    global _RESULTS_DIR_READY
+    if not _RESULTS_DIR_READY:
+        os.makedirs("results", exist_ok=True)
+        _RESULTS_DIR_READY = True
+    return "results"
+
+
 ## Removed local IEEE block decode and scope_capture; using imported helpers instead.
 def scope_capture(resource=TEK_RSRC_DEFAULT, timeout_ms=15000, ch=1):
-    """Return raw sample bytes for channel ch (delegates to tek module)."""
+    """Return raw sample bytes for channel ch as a uint8 ndarray (delegates to tek module)."""
     if not HAVE_PYVISA:
         raise ImportError(f"pyvisa not available. {INSTALL_HINTS['pyvisa']}")
-    # tek_capture_block returns (t, volts, raw) – we match previous semantics (raw bytes list)
-    _t, _v, raw = tek_capture_block(resource, ch=ch)
-    return list(raw.astype(np.uint8)) if hasattr(raw, "astype") else list(raw)
+    # Raw int8 codes straight from query_binary_values, reinterpreted as uint8 bytes
+    raw = tek_read_curve(resource, ch=ch, timeout_ms=timeout_ms)
+    return raw.view(np.uint8) if hasattr(raw, "view") else np.asarray(raw, dtype=np.uint8)
 
 
 ## Migrated scope_* and U3 basic helpers moved to amp_benchkit.tek and amp_benchkit.u3config
@@ -185,6 +235,13 @@ class _FallbackBase:
 
 BaseGUI: type[Any] = QMainWindow if HAVE_QT else _FallbackBase
 
+if HAVE_QT:
+
+    class _UiBridge(QObject):
+        """Carries callables from worker threads to the GUI thread via a queued signal."""
+
+        call = Signal(object)
+
 
 class UnifiedGUI(BaseGUI):
     def __init__(self):
@@ -194,9 +251,31 @@ class UnifiedGUI(BaseGUI):
         self.setWindowTitle("Unified Control (Lite+U3)")
         self.resize(1080, 780)
         self.scope_res = TEK_RSRC_DEFAULT
-        os.makedirs("results", exist_ok=True)
-        self._test_hist: list[str] | None = None
+        _ensure_results_dir()
+        self._test_hist: deque[str] = deque(maxlen=50)
         self._cached_u3_caps: _U3Caps | None = None
+        self._u3: Any = None
+        # (states, pin config) of the last PortStateWrite from u3_write_values
+        self._u3_port_last: tuple[tuple[int, ...], tuple[int, ...]] | None = None
+        self._u3_lock = threading.RLock()
+        # Last valid DAC0/DAC1 volts written by u3_write_values (kept on a bad entry)
+        self._dac_last: tuple[float, float] = (0.0, 0.0)
+        # Worker threads post GUI work through this bridge; the queued connection runs it here.
+        self._ui_bridge = _UiBridge(self)
+        self._ui_bridge.call.connect(self._run_ui_call, Qt.QueuedConnection)
+        # Log lines per widget, appended in one batch when the single-shot timer fires.
+        self._log_buf: dict[Any, list[str]] = {}
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_logs)
+        self._sweep_thread: threading.Thread | None = None
+        self._fy_worker = FYWorker()
+        self._fy_worker.start()
+        # One worker per instrument (scope, U3, FY) so sweep steps can overlap their I/O.
+        self._io_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="bench-io")
+        # Button-driven U3 jobs run in order on one long-lived thread (shares self._u3).
+        self._u3_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="u3-worker")
         tabs = QTabWidget()
         self.setCentralWidget(tabs)
         tabs.addTab(self.tab_gen(), "Generator")
@@ -205,6 +284,21 @@ class UnifiedGUI(BaseGUI):
         tabs.addTab(self.tab_automation(), "Automation / Sweep")
         tabs.addTab(self.tab_diag(), "Diagnostics")
 
+    def closeEvent(self, event):  # noqa: N802 - Qt override
+        with suppress(Exception):
+            self._log_timer.stop()
+        self._sweep_abort = True
+        t = self._sweep_thread
+        if t is not None:
+            t.join(timeout=5.0)
+        with suppress(Exception):
+            self._fy_worker.stop()
+        self._io_pool.shutdown(wait=True, cancel_futures=True)
+        self._u3_worker.shutdown(wait=True, cancel_futures=True)
+        scope_close_all()
+        self._close_u3()
+        super().closeEvent(event)
+
     # ---- Generator (delegated)
     def tab_gen(self):
         return build_generator_tab(self)
@@ -215,11 +309,9 @@ class UnifiedGUI(BaseGUI):
             self._log(self.gen_log, "No serial ports.")
             return
         self._log(self.gen_log, "Ports: " + ", ".join(p.device for p in ps))
-        for p in ps:
-            d = (p.device or "").lower()
-            if any(k in d for k in ["usbserial", "tty.usb", "wchusb", "ftdi"]):
-                target_edit.setText(p.device)
-                break
+        fy_port = _find_fy_port_in(ps)
+        if fy_port:
+            target_edit.setText(fy_port)
 
     def _proto_for_ch(self, ch: int) -> str:
         cb = self.proto1 if ch == 1 else self.proto2
@@ -251,199 +343,219 @@ class UnifiedGUI(BaseGUI):
                     return None
             return None
 
-        d = None
         try:
-            d = u3_open()
-            info: dict[str, Any] = {}
-            with suppress(Exception):
-                info = d.configU3()
-
-            hw_val: float | None = None
-            for candidate in (
-                info.get("HardwareVersion"),
-                getattr(d, "hardwareVersion", None),
-            ):
-                coerced = _coerce_hw(candidate)
-                if coerced is not None:
-                    hw_val = coerced
-                    break
-            caps["hardware_version"] = hw_val
-
-            hv_raw: Any = info.get("HV")
-            if hv_raw is None and "ProductID" in info:
-                hv_raw = info.get("ProductID") == 3
-            if hv_raw is None:
-                hv_raw = getattr(d, "isHV", None)
-            if hv_raw is None:
-                dev_name = info.get("DeviceName")
-                if isinstance(dev_name, str):
-                    hv_raw = "HV" in dev_name.upper()
-            if isinstance(hv_raw, str):
-                hv_bool = hv_raw.strip().upper() in {"1", "TRUE", "YES", "HV"}
-            else:
-                hv_bool = bool(hv_raw)
-            caps["is_hv"] = hv_bool
+            with self._u3_device() as d:
+                info: dict[str, Any] = {}
+                with suppress(Exception):
+                    info = d.configU3()
+
+                hw_val: float | None = None
+                for candidate in (
+                    info.get("HardwareVersion"),
+                    getattr(d, "hardwareVersion", None),
+                ):
+                    coerced = _coerce_hw(candidate)
+                    if coerced is not None:
+                        hw_val = coerced
+                        break
+                caps["hardware_version"] = hw_val
+
+                hv_raw: Any = info.get("HV")
+                if hv_raw is None and "ProductID" in info:
+                    hv_raw = info.get("ProductID") == 3
+                if hv_raw is None:
+                    hv_raw = getattr(d, "isHV", None)
+                if hv_raw is None:
+                    dev_name = info.get("DeviceName")
+                    if isinstance(dev_name, str):
+                        hv_raw = "HV" in dev_name.upper()
+                if isinstance(hv_raw, str):
+                    hv_bool = hv_raw.strip().upper() in {"1", "TRUE", "YES", "HV"}
+                else:
+                    hv_bool = bool(hv_raw)
+                caps["is_hv"] = hv_bool
         except Exception:
             # Detection is best-effort; leave defaults when probing fails.
             pass
-        finally:
-            with suppress(Exception):
-                if d:
-                    d.close()
         self._cached_u3_caps = caps
         return caps
 
+    def _fy_submit(self, key, job, done):
+        """Run ``job`` on the FY worker thread; ``done(result, error)`` is called there."""
+        self._fy_worker.submit(key, job, done)
+
+    def _gen_log_async(self, lines, error=None, prefix="Error: "):
+        """Log generator lines from any thread; appended on the GUI thread."""
+        lines = list(lines or ())
+        if error is not None:
+            lines.append(f"{prefix}{error}")
+        if lines:
+            self._post_ui(partial(self._log, self.gen_log, "\n".join(lines)))
+
+    def _post_ui(self, fn):
+        """Run ``fn`` on the GUI thread (safe to call from any thread)."""
+        self._ui_bridge.call.emit(fn)
+
+    def _run_ui_call(self, fn):
+        try:
+            fn()
+        except Exception:
+            _gui_log.exception("GUI callback from worker thread failed")
+
     def apply_gen_side(self, side):
         try:
             if side == 1:
-                f = float(self.freq1.text())
-                a = float(self.amp1.text())
-                o = float(self.off1.text())
-                wf = self.wave1.currentText()
-                duty = None
-                with suppress(Exception):
-                    duty = float(self.duty1.text())
-                pr = self.proto1.currentText()
-                pt = self.port1.text().strip() or None
-                cmds = fy_apply(
-                    freq_hz=f, amp_vpp=a, wave=wf, off_v=o, duty=duty, ch=1, port=pt, proto=pr
-                )
-                summary = (
-                    f"APPLIED CH1: {wf} {f} Hz, {a} Vpp, Off {o} V, "
-                    f"Duty {duty if duty is not None else '—'}% ({pr})"
-                )
-                self._log(self.gen_log, summary)
-                if cmds:
-                    self._log(self.gen_log, "FY cmds: " + ", ".join(cmds))
+                widgets = (self.freq1, self.amp1, self.off1, self.wave1, self.duty1)
+                proto_w, port_w = self.proto1, self.port1
             else:
-                f = float(self.freq2.text())
-                a = float(self.amp2.text())
-                o = float(self.off2.text())
-                wf = self.wave2.currentText()
-                duty = None
-                with suppress(Exception):
-                    duty = float(self.duty2.text())
-                pr = self.proto2.currentText()
-                pt = self.port2.text().strip() or None
-                cmds = fy_apply(
-                    freq_hz=f, amp_vpp=a, wave=wf, off_v=o, duty=duty, ch=2, port=pt, proto=pr
-                )
-                summary = (
-                    f"APPLIED CH2: {wf} {f} Hz, {a} Vpp, Off {o} V, "
-                    f"Duty {duty if duty is not None else '—'}% ({pr})"
-                )
-                self._log(self.gen_log, summary)
-                if cmds:
-                    self._log(self.gen_log, "FY cmds: " + ", ".join(cmds))
+                widgets = (self.freq2, self.amp2, self.off2, self.wave2, self.duty2)
+                proto_w, port_w = self.proto2, self.port2
+            ch = 1 if side == 1 else 2
+            freq_w, amp_w, off_w, wave_w, duty_w = widgets
+            f = float(freq_w.text())
+            a = float(amp_w.text())
+            o = float(off_w.text())
+            wf = wave_w.currentText()
+            duty = None
+            with suppress(Exception):
+                duty = float(duty_w.text())
+            pr = proto_w.currentText()
+            pt = port_w.text().strip() or None
         except Exception as e:
             self._log(self.gen_log, f"Error: {e}")
+            return
 
-    def start_sweep_side(self, side):
-        try:
+        def _job():
+            cmds = fy_apply(
+                freq_hz=f, amp_vpp=a, wave=wf, off_v=o, duty=duty, ch=ch, port=pt, proto=pr
+            )
+            lines = [
+                f"APPLIED CH{ch}: {wf} {f} Hz, {a} Vpp, Off {o} V, "
+                f"Duty {duty if duty is not None else '—'}% ({pr})"
+            ]
+            if cmds:
+                lines.append("FY cmds: " + ", ".join(cmds))
+            return lines
 
-            def _parse_freq(text: str) -> float | None:
-                raw = (text or "").strip()
-                if not raw:
-                    return None
-                t = raw.lower().replace("hz", "").strip()
-                multiplier = 1.0
-                if t.endswith("k"):
-                    multiplier = 1e3
-                    t = t[:-1]
-                elif t.endswith("m"):
-                    multiplier = 1e6
-                    t = t[:-1]
-                elif t.endswith("g"):
-                    multiplier = 1e9
-                    t = t[:-1]
-                t = t.replace(",", "")
-                try:
-                    return float(t) * multiplier
-                except Exception:
-                    return None
+        self._fy_submit(("apply", ch), _job, self._gen_log_async)
 
-            if side == 1:
-                pr = self.proto1.currentText()
-                pt = self.port1.text().strip() or find_fy_port()
-                st = _parse_freq(self.sw_start1.text())
-                if st is None:
-                    self._log(self.gen_log, "CH1 sweep needs a numeric start frequency (Hz)")
-                    return
-                en = _parse_freq(self.sw_end1.text())
-                if en is None:
-                    self._log(self.gen_log, "CH1 sweep needs a numeric end frequency (Hz)")
-                    return
-                ts = int(self.sw_time1.text()) if self.sw_time1.text().strip() else None
-                md = self.sw_mode1.currentText()
-                if self.sw_amp1.text().strip():
-                    try:
-                        a = float(self.sw_amp1.text())
-                        f = float(self.freq1.text() or 1000.0)
-                        o = float(self.off1.text() or 0.0)
-                        wf = self.wave1.currentText()
-                        d = float(self.duty1.text()) if self.duty1.text().strip() else None
-                        cmds_apply = fy_apply(
-                            freq_hz=f, amp_vpp=a, wave=wf, off_v=o, duty=d, ch=1, port=pt, proto=pr
-                        )
-                        if cmds_apply:
-                            self._log(self.gen_log, "FY cmds: " + ", ".join(cmds_apply))
-                    except Exception as e:
-                        self._log(self.gen_log, f"Amp set CH1 failed: {e}")
-                cmds = fy_sweep(pt, 1, pr, st, en, ts, md, True)
-                self._log(self.gen_log, f"SWEEP START CH1: {st}→{en} Hz, {ts}s, {md}")
-                if cmds:
-                    self._log(self.gen_log, "FY cmds: " + ", ".join(cmds))
-            else:
-                self._log(self.gen_log, "CH2 sweep not supported on FY3200S; use CH1.")
+    def start_sweep_side(self, side):
+        def _parse_freq(text: str) -> float | None:
+            raw = (text or "").strip()
+            if not raw:
+                return None
+            t = raw.lower().replace("hz", "").strip()
+            multiplier = 1.0
+            if t.endswith("k"):
+                multiplier = 1e3
+                t = t[:-1]
+            elif t.endswith("m"):
+                multiplier = 1e6
+                t = t[:-1]
+            elif t.endswith("g"):
+                multiplier = 1e9
+                t = t[:-1]
+            t = t.replace(",", "")
+            try:
+                return float(t) * multiplier
+            except Exception:
+                return None
+
+        if side != 1:
+            self._log(self.gen_log, "CH2 sweep not supported on FY3200S; use CH1.")
+            return
+        try:
+            pr = self.proto1.currentText()
+            pt = self.port1.text().strip() or find_fy_port()
+            st = _parse_freq(self.sw_start1.text())
+            if st is None:
+                self._log(self.gen_log, "CH1 sweep needs a numeric start frequency (Hz)")
+                return
+            en = _parse_freq(self.sw_end1.text())
+            if en is None:
+                self._log(self.gen_log, "CH1 sweep needs a numeric end frequency (Hz)")
                 return
+            ts = int(self.sw_time1.text()) if self.sw_time1.text().strip() else None
+            md = self.sw_mode1.currentText()
+            amp_kw = None
+            if self.sw_amp1.text().strip():
+                try:
+                    amp_kw = dict(
+                        freq_hz=float(self.freq1.text() or 1000.0),
+                        amp_vpp=float(self.sw_amp1.text()),
+                        wave=self.wave1.currentText(),
+                        off_v=float(self.off1.text() or 0.0),
+                        duty=float(self.duty1.text()) if self.duty1.text().strip() else None,
+                    )
+                except Exception as e:
+                    self._log(self.gen_log, f"Amp set CH1 failed: {e}")
         except Exception as e:
             self._log(self.gen_log, f"Sweep start error: {e}")
+            return
+
+        def _job():
+            lines = []
+            if amp_kw is not None:
+                try:
+                    cmds_apply = fy_apply(ch=1, port=pt, proto=pr, **amp_kw)
+                    if cmds_apply:
+                        lines.append("FY cmds: " + ", ".join(cmds_apply))
+                except Exception as e:
+                    lines.append(f"Amp set CH1 failed: {e}")
+            try:
+                cmds = fy_sweep(pt, 1, pr, st, en, ts, md, True)
+            except Exception as e:
+                lines.append(f"Sweep start error: {e}")
+                return lines
+            lines.append(f"SWEEP START CH1: {st}→{en} Hz, {ts}s, {md}")
+            if cmds:
+                lines.append("FY cmds: " + ", ".join(cmds))
+            return lines
+
+        self._fy_submit(("sweep", 1), _job, self._gen_log_async)
 
     def stop_sweep_side(self, side):
+        rsrc = self.scope_edit.text().strip() if hasattr(self, "scope_edit") else self.scope_res
+        rsrc = rsrc or self.scope_res
+        if side != 1:
+            self._log(self.gen_log, "CH2 sweep not supported on FY3200S; nothing to stop.")
+            with suppress(Exception):
+                scope_resume_run(rsrc)
+            return
         try:
-            if side == 1:
-                pr = self.proto1.currentText()
-                pt = self.port1.text().strip() or find_fy_port()
-                cmds = fy_sweep(pt, 1, pr, run=False)
-                self._log(self.gen_log, "SWEEP STOP CH1")
-                if cmds:
-                    self._log(self.gen_log, "FY cmds: " + ", ".join(cmds))
-            else:
-                self._log(self.gen_log, "CH2 sweep not supported on FY3200S; nothing to stop.")
+            pr = self.proto1.currentText()
+            pt = self.port1.text().strip() or find_fy_port()
         except Exception as e:
             self._log(self.gen_log, f"Sweep stop error: {e}")
-        finally:
-            with suppress(Exception):
-                rsrc = (
-                    self.scope_edit.text().strip()
-                    if hasattr(self, "scope_edit")
-                    else self.scope_res
-                )
-                scope_resume_run(rsrc or self.scope_res)
+            return
 
-    def scope_measure(self, ch=1, typ="RMS"):
-        if not HAVE_PYVISA:
-            raise ImportError(f"pyvisa not available. {INSTALL_HINTS['pyvisa']}")
-        r = self.scope_edit.text().strip() if hasattr(self, "scope_edit") else self.scope_res
-        rm = _pyvisa.ResourceManager()
-        sc = rm.open_resource(r or self.scope_res)
-        try:
-            with suppress(Exception):
-                sc.timeout = 5000
-            # Allow 'MATH' as a source
+        def _job():
             try:
-                if isinstance(ch, str) and ch.strip().upper() == "MATH":
-                    sc.write("MEASU:IMM:SOURCE MATH")
-                else:
-                    sc.write(f"MEASU:IMM:SOURCE CH{int(ch)}")
-            except Exception:
-                sc.write(f"MEASU:IMM:SOURCE CH{int(ch)}")
-            sc.write(f"MEASU:IMM:TYP {typ}")
-            v = float(sc.query("MEASU:IMM:VAL?"))
-            return v
-        finally:
-            with suppress(Exception):
-                sc.close()
+                cmds = fy_sweep(pt, 1, pr, run=False)
+                lines = ["SWEEP STOP CH1"]
+                if cmds:
+                    lines.append("FY cmds: " + ", ".join(cmds))
+                return lines
+            except Exception as e:
+                return [f"Sweep stop error: {e}"]
+            finally:
+                with suppress(Exception):
+                    scope_resume_run(rsrc)
+
+        self._fy_submit(("sweep", 1), _job, self._gen_log_async)
+
+    def scope_measure(self, ch=1, typ="RMS", resource=None):
+        r = resource
+        if r is None:
+            r = self.scope_edit.text().strip() if hasattr(self, "scope_edit") else ""
+        return scope_measure(r or self.scope_res, ch, typ)
+
+    def scope_measure_batch(self, ch=1, types=("RMS", "PK2PK"), resource=None):
+        """Read several measurements of ``ch`` in one transaction on the shared session."""
+        r = resource
+        if r is None:
+            r = self.scope_edit.text().strip() if hasattr(self, "scope_edit") else ""
+        return scope_measure_batch(r or self.scope_res, ch, types)
 
     # ---- Scope
     def tab_scope(self):
@@ -454,7 +566,7 @@ class UnifiedGUI(BaseGUI):
             self._log(self.scope_log, f"pyvisa missing → {INSTALL_HINTS['pyvisa']}")
             return
         try:
-            res = _pyvisa.ResourceManager().list_resources()
+            res = list_visa_resources()
             self._log(self.scope_log, ", ".join(res) if res else "(none)")
             tek = [r for r in res if r.startswith("USB0::0x0699::")]
             if tek:
@@ -485,12 +597,16 @@ class UnifiedGUI(BaseGUI):
         try:
             r = self.scope_edit.text().strip() or self.scope_res
             ch = int(self.scope_ch.currentText())
-            fn = os.path.join("results", f"ch{ch}.csv")
+            fn = os.path.join(_ensure_results_dir(), f"ch{ch}.csv")
             t, v = scope_capture_calibrated(r, timeout_ms=15000, ch=ch)
-            with open(fn, "w") as f:
-                f.write("t,volts\n")
-                for i in range(len(v)):
-                    f.write(f"{t[i]},{v[i]}\n")
+            np.savetxt(
+                fn,
+                np.column_stack((t, v)),
+                delimiter=",",
+                header="t,volts",
+                comments="",
+                fmt="%.9g",
+            )
             self._log(self.scope_log, f"Saved: {fn}")
         except Exception as e:
             self._log(self.scope_log, f"Error: {e}")
@@ -501,8 +617,60 @@ class UnifiedGUI(BaseGUI):
 
         return build_daq_tab(self)
 
+    def _get_u3(self):
+        """Return the U3 handle kept for the GUI lifetime, opening it on first use."""
+        if self._u3 is None:
+            self._u3 = u3_open()
+        return self._u3
+
+    @contextmanager
+    def _u3_device(self, *, pins=False):
+        """Hold the U3 lock and yield the cached handle; errors drop it for reopen.
+
+        ``pins`` callers change digital pin states or directions themselves, so the
+        port state last written by :meth:`u3_write_values` is forgotten.
+        """
+        with self._u3_lock:
+            if pins:
+                self._u3_port_last = None
+            try:
+                yield self._get_u3()
+            except Exception:
+                self._close_u3()
+                raise
+
+    def _close_u3(self):
+        with self._u3_lock:
+            d, self._u3 = self._u3, None
+            self._u3_port_last = None
+        if d is not None:
+            with suppress(Exception):
+                d.close()
+
+    def _u3_submit(self, job, log_w, err_prefix, *, pins=False):
+        """Run ``job(d)`` on the U3 worker thread and log the text it returns on the GUI thread."""
+
+        def _run():
+            with self._u3_device(pins=pins) as d:
+                return job(d)
+
+        def _done(fut):
+            try:
+                text = fut.result()
+            except Exception as e:
+                text = f"{err_prefix}{e}"
+            if text:
+                self._post_ui(partial(self._log, log_w, text))
+
+        self._u3_worker.submit(_run).add_done_callback(_done)
+
+    def _u3_pulse(self, line, width_ms, level):
+        with self._u3_device(pins=True) as d:
+            u3_pulse_line(line, width_ms=width_ms, level=level, device=d)
+
     def _selected_channels(self):
-        return [i for i, cb in enumerate(self.chan_boxes) if cb.isChecked()]
+        mask = self._mask_from_checks(self.chan_boxes)
+        return [i for i in range(mask.bit_length()) if mask >> i & 1]
 
         # ---- DAQ simple readers (used by Read/Stream tab)
 
@@ -511,14 +679,13 @@ class UnifiedGUI(BaseGUI):
             self._log(self.daq_log, f"u3 missing → {INSTALL_HINTS['u3']}")
             return
         chs = self._selected_channels() or [0]
-        try:
-            res_idx = self.daq_res.value() if hasattr(self, "daq_res") else None
-            vals = u3_read_multi(chs, samples=1, resolution_index=res_idx)
-            self._log(
-                self.daq_log, " | ".join(f"AIN{c}:{vals[0][i]:.4f} V" for i, c in enumerate(chs))
-            )
-        except Exception as e:
-            self._log(self.daq_log, f"Read error: {e}")
+        res_idx = self.daq_res.value() if hasattr(self, "daq_res") else None
+
+        def _job(d):
+            vals = u3_read_multi(chs, samples=1, resolution_index=res_idx, device=d)
+            return " | ".join(f"AIN{c}:{vals[0, i]:.4f} V" for i, c in enumerate(chs))
+
+        self._u3_submit(_job, self.daq_log, "Read error: ")
 
     def read_daq_multi(self):
         if not HAVE_U3:
@@ -527,16 +694,14 @@ class UnifiedGUI(BaseGUI):
         chs = self._selected_channels() or [0]
         ns = self.daq_nsamp.value()
         delay = self.daq_delay.value() / 1000.0
-        try:
-            res_idx = self.daq_res.value() if hasattr(self, "daq_res") else None
-            vals = u3_read_multi(chs, samples=ns, delay_s=delay, resolution_index=res_idx)
-            for k, row in enumerate(vals):
-                line = f"[{k + 1}/{ns}] " + " | ".join(
-                    f"AIN{c}:{row[i]:.4f} V" for i, c in enumerate(chs)
-                )
-                self._log(self.daq_log, line)
-        except Exception as e:
-            self._log(self.daq_log, f"Loop error: {e}")
+        res_idx = self.daq_res.value() if hasattr(self, "daq_res") else None
+        tmpl = f"[%d/{ns}] " + " | ".join(f"AIN{c}:%.4f V" for c in chs)
+
+        def _job(d):
+            vals = u3_read_multi(chs, samples=ns, delay_s=delay, resolution_index=res_idx, device=d)
+            return "\n".join(tmpl % (k, *row) for k, row in enumerate(vals.tolist(), 1))
+
+        self._u3_submit(_job, self.daq_log, "Loop error: ")
 
     # ---- Test Panel runtime loop
     def start_test_panel(self):
@@ -545,12 +710,8 @@ class UnifiedGUI(BaseGUI):
             return
         try:
             if self.test_factory.isChecked():
-                d = u3_open()
-                try:
+                with self._u3_device(pins=True) as d:
                     d.setToFactoryDefaults()
-                finally:
-                    with suppress(Exception):
-                        d.close()
         except Exception as e:
             self._log(self.test_log, f"Factory reset warn: {e}")
             self._test_status(str(e), "error")
@@ -577,36 +738,38 @@ class UnifiedGUI(BaseGUI):
             return
         # Directions
         try:
-            for i, cb in enumerate(getattr(self, "test_fio_dir", [])):
-                u3_set_dir(f"FIO{i}", 1 if cb.isChecked() else 0)
-            for i, cb in enumerate(getattr(self, "test_eio_dir", [])):
-                u3_set_dir(f"EIO{i}", 1 if cb.isChecked() else 0)
-            for i, cb in enumerate(getattr(self, "test_cio_dir", [])):
-                u3_set_dir(f"CIO{i}", 1 if cb.isChecked() else 0)
+            lj = _require_u3()
+            boxes = [getattr(self, f"test_{p}_dir", []) for p in ("fio", "eio", "cio")]
+            with self._u3_device(pins=True) as d:
+                d.getFeedback(
+                    lj.PortDirWrite(
+                        Direction=[self._mask_from_checks(b) for b in boxes],
+                        WriteMask=[(1 << len(b)) - 1 for b in boxes],
+                    )
+                )
         except Exception as e:
             self._log(self.test_log, f"Dir write warn: {e}")
             self._test_status(str(e), "error")
         # States (desired)
         try:
-            for i, cb in enumerate(getattr(self, "test_fio_state", [])):
-                u3_set_line(f"FIO{i}", 1 if cb.isChecked() else 0)
-            for i, cb in enumerate(getattr(self, "test_eio_state", [])):
-                u3_set_line(f"EIO{i}", 1 if cb.isChecked() else 0)
-            for i, cb in enumerate(getattr(self, "test_cio_state", [])):
-                u3_set_line(f"CIO{i}", 1 if cb.isChecked() else 0)
+            lj = _require_u3()
+            boxes = [getattr(self, f"test_{p}_state", []) for p in ("fio", "eio", "cio")]
+            with self._u3_device(pins=True) as d:
+                d.getFeedback(
+                    lj.PortStateWrite(
+                        State=[self._mask_from_checks(b) for b in boxes],
+                        WriteMask=[(1 << len(b)) - 1 for b in boxes],
+                    )
+                )
         except Exception as e:
             self._log(self.test_log, f"State write warn: {e}")
             self._test_status(str(e), "error")
         # Readback states (DI) and per-port masks
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device() as d:
                 states = d.getFeedback(lj.PortStateRead())[0]
                 dirs = d.getFeedback(lj.PortDirRead())[0]
-            finally:
-                with suppress(Exception):
-                    d.close()
             sF, sE, sC = states.get("FIO", 0), states.get("EIO", 0), states.get("CIO", 0)
             dF, dE, dC = dirs.get("FIO", 0), dirs.get("EIO", 0), dirs.get("CIO", 0)
             for i, cb in enumerate(getattr(self, "test_fio_rb", [])):
@@ -631,8 +794,7 @@ class UnifiedGUI(BaseGUI):
         # DACs
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device() as d:
                 dv0 = max(0.0, min(5.0, float(self.test_dac0.text() or "0")))
                 dv1 = max(0.0, min(5.0, float(self.test_dac1.text() or "0")))
                 with suppress(Exception):
@@ -640,9 +802,6 @@ class UnifiedGUI(BaseGUI):
                         lj.DAC0_8(Value=int(dv0 / 5.0 * 255)),
                         lj.DAC1_8(Value=int(dv1 / 5.0 * 255)),
                     )
-            finally:
-                with suppress(Exception):
-                    d.close()
         except Exception as e:
             self._log(self.test_log, f"DAC warn: {e}")
             self._test_status(str(e), "error")
@@ -652,18 +811,16 @@ class UnifiedGUI(BaseGUI):
             fio_checks = getattr(self, "ai_checks_fio", getattr(self, "ai_checks", []))
             eio_checks = getattr(self, "ai_checks_eio", [])
             caps = self._u3_capabilities()
+            ai_mask = self._mask_from_checks(fio_checks[:8])
+            ai_mask |= self._mask_from_checks(eio_checks) << 8
+            if caps["is_hv"]:
+                ai_mask |= 0x0F
             for i, lbl in enumerate(getattr(self, "test_ain_lbls", [])):
-                if i < 8:
-                    is_analog = i < len(fio_checks) and fio_checks[i].isChecked()
-                    if caps["is_hv"] and i < 4:
-                        is_analog = True
-                else:
-                    idx = i - 8
-                    is_analog = idx < len(eio_checks) and eio_checks[idx].isChecked()
-                if not is_analog:
+                if not ai_mask >> i & 1:
                     lbl.setText("—")
                     continue
-                v = u3_read_ain(i, resolution_index=res_idx)
+                with self._u3_device() as d:
+                    v = u3_read_ain(i, resolution_index=res_idx, device=d)
                 lbl.setText(f"{v:.4f}")
         except Exception as e:
             self._log(self.test_log, f"AIN read warn: {e}")
@@ -671,8 +828,7 @@ class UnifiedGUI(BaseGUI):
         # Counters
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device() as d:
                 try:
                     c0 = d.getFeedback(lj.Counter0(Reset=False))[0]
                 except Exception:
@@ -681,9 +837,6 @@ class UnifiedGUI(BaseGUI):
                     c1 = d.getFeedback(lj.Counter1(Reset=False))[0]
                 except Exception:
                     c1 = None
-            finally:
-                with suppress(Exception):
-                    d.close()
             if c0 is not None:
                 self.test_c0.setText(str(c0))
             if c1 is not None:
@@ -697,17 +850,13 @@ class UnifiedGUI(BaseGUI):
             return
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device() as d:
                 if which == 0:
                     d.getFeedback(lj.Counter0(Reset=True))
                     self._log(self.test_log, "Counter0 reset")
                 else:
                     d.getFeedback(lj.Counter1(Reset=True))
                     self._log(self.test_log, "Counter1 reset")
-            finally:
-                with suppress(Exception):
-                    d.close()
         except Exception as e:
             self._log(self.test_log, f"Counter reset warn: {e}")
             self._test_status(str(e), "error")
@@ -743,12 +892,8 @@ class UnifiedGUI(BaseGUI):
             mC = 0xFF
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device(pins=True) as d:
                 d.getFeedback(lj.PortDirWrite(Direction=[vF, vE, vC], WriteMask=[mF, mE, mC]))
-            finally:
-                with suppress(Exception):
-                    d.close()
             self._log(
                 self.test_log,
                 f"Dir write {port}: 0x{(vF if port == 'FIO' else vE if port == 'EIO' else vC):02X}",
@@ -776,12 +921,8 @@ class UnifiedGUI(BaseGUI):
             mC = 0xFF
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device(pins=True) as d:
                 d.getFeedback(lj.PortStateWrite(State=[vF, vE, vC], WriteMask=[mF, mE, mC]))
-            finally:
-                with suppress(Exception):
-                    d.close()
             port_value = vF if port == "FIO" else vE if port == "EIO" else vC
             self._log(self.test_log, f"State write {port}: 0x{port_value:02X}")
             self._test_status("OK", "info")
@@ -801,13 +942,9 @@ class UnifiedGUI(BaseGUI):
             se = self._parse_mask_text(self.test_wst_eio.text())
             sc = self._parse_mask_text(self.test_wst_cio.text())
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device(pins=True) as d:
                 d.getFeedback(lj.PortDirWrite(Direction=[df, de, dc], WriteMask=[0xFF, 0xFF, 0xFF]))
                 d.getFeedback(lj.PortStateWrite(State=[sf, se, sc], WriteMask=[0xFF, 0xFF, 0xFF]))
-            finally:
-                with suppress(Exception):
-                    d.close()
             summary = (
                 "Applied all: "
                 f"Dir=[0x{df:02X},0x{de:02X},0x{dc:02X}] "
@@ -825,13 +962,9 @@ class UnifiedGUI(BaseGUI):
             return
         try:
             lj = _require_u3()
-            d = u3_open()
-            try:
+            with self._u3_device() as d:
                 states = d.getFeedback(lj.PortStateRead())[0]
                 dirs = d.getFeedback(lj.PortDirRead())[0]
-            finally:
-                with suppress(Exception):
-                    d.close()
             sF, sE, sC = states.get("FIO", 0), states.get("EIO", 0), states.get("CIO", 0)
             dF, dE, dC = dirs.get("FIO", 0), dirs.get("EIO", 0), dirs.get("CIO", 0)
             # Fill editable mask fields
@@ -888,41 +1021,46 @@ class UnifiedGUI(BaseGUI):
 
     # ---- U3 config helpers/actions
     def _mask_from_checks(self, checks):
-        m = 0
-        for i, cb in enumerate(checks):
-            if cb.isChecked():
-                m |= 1 << i
-        return m
+        return sum(1 << i for i, cb in enumerate(checks) if cb.isChecked())
+
+    def _u3_masks(self, fio_an_default: int = 0) -> _U3Masks:
+        """Read every config checkbox once; missing groups read as 0 (FIO analog: default)."""
+        fio_checks = getattr(self, "ai_checks_fio", getattr(self, "ai_checks", []))
+        groups = (
+            fio_checks,
+            getattr(self, "ai_checks_eio", []),
+            *(
+                getattr(self, name, ())
+                for name in (
+                    "fio_dir_box",
+                    "eio_dir_box",
+                    "cio_dir_box",
+                    "fio_state_box",
+                    "eio_state_box",
+                    "cio_state_box",
+                )
+            ),
+        )
+        masks = _U3Masks(*map(self._mask_from_checks, groups))
+        return masks if fio_checks else masks._replace(fio_an=fio_an_default)
 
     def u3_read_current(self):
         if not HAVE_U3:
             self._log(self.cfg_log, f"u3 missing → {INSTALL_HINTS['u3']}")
             return
-        try:
-            d = u3_open()
-            info = d.configIO()
-            self._log(self.cfg_log, str(info))
-        except Exception as e:
-            self._log(self.cfg_log, f"Read error: {e}")
-        finally:
-            with suppress(Exception):
-                d.close()
+        self._u3_submit(lambda d: str(d.configIO()), self.cfg_log, "Read error: ")
 
     def u3_write_factory(self):
         if not HAVE_U3:
             self._log(self.cfg_log, f"u3 missing → {INSTALL_HINTS['u3']}")
             return
-        try:
-            _require_u3()
-            d = u3_open()
+
+        def _job(d):
             # Set power-up defaults back to factory via Device API
             d.setToFactoryDefaults()
-            self._log(self.cfg_log, "Factory defaults restored")
-        except Exception as e:
-            self._log(self.cfg_log, f"Factory write error: {e}")
-        finally:
-            with suppress(Exception):
-                d.close()
+            return "Factory defaults restored"
+
+        self._u3_submit(_job, self.cfg_log, "Factory write error: ", pins=True)
 
     def u3_write_values(self):
         if not HAVE_U3:
@@ -932,117 +1070,106 @@ class UnifiedGUI(BaseGUI):
             caps = self._u3_capabilities()
             hw_float = caps["hardware_version"]
             lj = _require_u3()
-            d = u3_open()
-            # Analog inputs / directions + Counters
-            fio_checks = getattr(self, "ai_checks_fio", getattr(self, "ai_checks", []))
-            eio_checks = getattr(self, "ai_checks_eio", [])
-            fio_an = self._mask_from_checks(fio_checks)
-            eio_an = self._mask_from_checks(eio_checks) if eio_checks else 0
-            fio_dir = self._mask_from_checks(self.fio_dir_box)
-            eio_dir = self._mask_from_checks(self.eio_dir_box)
-            cio_dir = self._mask_from_checks(self.cio_dir_box)
-            # Set default directions/analog settings at boot via configU3
-            with suppress(Exception):
-                d.configU3(
-                    FIOAnalog=fio_an,
-                    EIOAnalog=eio_an,
-                    FIODirection=fio_dir,
-                    EIODirection=eio_dir,
-                    CIODirection=cio_dir,
-                )
-            # Digital states (defaults + current)
-            fio_state = self._mask_from_checks(self.fio_state_box)
-            eio_state = self._mask_from_checks(self.eio_state_box)
-            cio_state = self._mask_from_checks(self.cio_state_box)
-            with suppress(Exception):
-                d.configU3(FIOState=fio_state, EIOState=eio_state, CIOState=cio_state)
-            fb = []
-            # Use global IO numbering: FIO0-7 → 0..7, EIO0-7 → 8..15, CIO0-3 → 16..19
-            for i in range(8):
-                fb.append(lj.BitStateWrite(i, 1 if (fio_state >> i) & 1 else 0))
-            for i in range(8):
-                fb.append(lj.BitStateWrite(8 + i, 1 if (eio_state >> i) & 1 else 0))
-            for i in range(4):
-                fb.append(lj.BitStateWrite(16 + i, 1 if (cio_state >> i) & 1 else 0))
-            # DAC outputs (8-bit mode by default)
-            with suppress(Exception):
-                dv0 = max(0.0, min(5.0, float(self.dac0.text() or "0")))
-                dv1 = max(0.0, min(5.0, float(self.dac1.text() or "0")))
-                fb.append(lj.DAC0_8(Value=int(dv0 / 5.0 * 255)))
-                fb.append(lj.DAC1_8(Value=int(dv1 / 5.0 * 255)))
-            # Timer/Counter clock setup
-            if self.t_clkbase.currentText() == "48MHz":
-                base = 48
-            elif self.t_clkbase.currentText() == "750kHz":
-                base = 750
-            else:
-                base = 4
-            with suppress(Exception):
-                timer_offset = self.t_pin.value() if hasattr(self, "t_pin") else 0
-                if hw_float is not None and hw_float >= 1.30 and timer_offset < 4:
-                    timer_offset = 4
-                d.configTimerClock(TimerClockBase=base, TimerClockDivisor=self.t_div.value())
-                d.configIO(
-                    NumberOfTimersEnabled=self.t_num.value(),
-                    TimerCounterPinOffset=timer_offset,
-                    EnableCounter0=self.counter0.isChecked(),
-                    EnableCounter1=self.counter1.isChecked(),
-                    FIOAnalog=fio_an,
-                    EIOAnalog=eio_an,
-                )
-            # Apply digital state writes
-            try:
-                d.getFeedback(*fb)
-            except Exception:
-                # Fallback to immediate per-pin writes
+            fio_an, eio_an, fio_dir, eio_dir, cio_dir, fio_state, eio_state, cio_state = (
+                self._u3_masks()
+            )
+            with self._u3_device() as d:
+                # Boot directions/analog/states in one configU3 round-trip
                 with suppress(Exception):
-                    for i in range(8):
-                        d.setDOState(i, 1 if (fio_state >> i) & 1 else 0)
-                    for i in range(8):
-                        d.setDOState(8 + i, 1 if (eio_state >> i) & 1 else 0)
-                    for i in range(4):
-                        d.setDOState(16 + i, 1 if (cio_state >> i) & 1 else 0)
-            # Persist current configuration as power-up defaults
-            with suppress(Exception):
-                d.setDefaults()
-            # Watchdog (best-effort mapping of extra options)
-            if self.wd_en.isChecked():
+                    d.configU3(
+                        FIOAnalog=fio_an,
+                        EIOAnalog=eio_an,
+                        FIODirection=fio_dir,
+                        EIODirection=eio_dir,
+                        CIODirection=cio_dir,
+                        FIOState=fio_state,
+                        EIOState=eio_state,
+                        CIOState=cio_state,
+                    )
+                # One port-wide write covers FIO0-7, EIO0-7 and CIO0-3
+                states = (fio_state, eio_state, cio_state)
+                config = (fio_an, eio_an, fio_dir, eio_dir, cio_dir)
+                mask = _u3_port_write_mask(states, config, self._u3_port_last)
+                fb = []
+                if any(mask):
+                    fb.append(lj.PortStateWrite(State=list(states), WriteMask=mask))
+                # DAC outputs (8-bit mode); a bad entry keeps the last good value
+                dacs = []
+                for edit, prev in zip((self.dac0, self.dac1), self._dac_last, strict=True):
+                    try:
+                        dacs.append(max(0.0, min(5.0, float(edit.text() or "0"))))
+                    except ValueError:
+                        dacs.append(prev)
+                self._dac_last = (dacs[0], dacs[1])
+                fb.append(lj.DAC0_8(Value=int(dacs[0] / 5.0 * 255)))
+                fb.append(lj.DAC1_8(Value=int(dacs[1] / 5.0 * 255)))
+                # Timer/Counter clock setup
+                base = _U3_CLOCK_BASES.get(self.t_clkbase.currentText(), 4)
                 with suppress(Exception):
-                    timeout = int(float(self.wd_to.text() or "100"))
-                    reset = self.wd_reset.isChecked()
-                    set_dio = False
-                    dio_num = 0
-                    dio_state = 0
-                    wline = getattr(self, "wd_line", None)
-                    if wline and wline.currentText() != "None":
-                        pin = wline.currentText()  # e.g., 'FIO3', 'EIO1', 'CIO0'
-                        base = 0
-                        if pin.startswith("FIO"):
-                            base = 0
-                        elif pin.startswith("EIO"):
-                            base = 8
-                        elif pin.startswith("CIO"):
-                            base = 16
-                        try:
-                            idx = int(pin[3:])
-                            dio_num = base + idx
-                            dio_state = 1 if self.wd_state.currentText() == "High" else 0
-                            set_dio = True
-                        except Exception:
-                            set_dio = False
-                    d.watchdog(
-                        ResetOnTimeout=reset,
-                        SetDIOStateOnTimeout=set_dio,
-                        TimeoutPeriod=timeout,
-                        DIOState=dio_state,
-                        DIONumber=dio_num,
+                    timer_offset = self.t_pin.value() if hasattr(self, "t_pin") else 0
+                    if hw_float is not None and hw_float >= 1.30 and timer_offset < 4:
+                        timer_offset = 4
+                    d.configTimerClock(TimerClockBase=base, TimerClockDivisor=self.t_div.value())
+                    d.configIO(
+                        NumberOfTimersEnabled=self.t_num.value(),
+                        TimerCounterPinOffset=timer_offset,
+                        EnableCounter0=self.counter0.isChecked(),
+                        EnableCounter1=self.counter1.isChecked(),
+                        FIOAnalog=fio_an,
+                        EIOAnalog=eio_an,
                     )
-            self._log(self.cfg_log, "Values written")
+                # Digital + DAC writes in a single feedback round-trip, after all config calls
+                try:
+                    d.getFeedback(*fb)
+                    self._u3_port_last = (states, config)
+                except Exception:
+                    self._u3_port_last = None
+                    # Fallback to immediate per-pin writes
+                    with suppress(Exception):
+                        for i in range(8):
+                            d.setDOState(i, 1 if (fio_state >> i) & 1 else 0)
+                        for i in range(8):
+                            d.setDOState(8 + i, 1 if (eio_state >> i) & 1 else 0)
+                        for i in range(4):
+                            d.setDOState(16 + i, 1 if (cio_state >> i) & 1 else 0)
+                # Persist current configuration as power-up defaults
+                with suppress(Exception):
+                    d.setDefaults()
+                # Watchdog (best-effort mapping of extra options)
+                if self.wd_en.isChecked():
+                    with suppress(Exception):
+                        timeout = int(float(self.wd_to.text() or "100"))
+                        reset = self.wd_reset.isChecked()
+                        set_dio = False
+                        dio_num = 0
+                        dio_state = 0
+                        wline = getattr(self, "wd_line", None)
+                        pin = wline.currentText() if wline else "None"  # e.g. 'FIO3', 'EIO1'
+                        if pin != "None":
+                            base = 0
+                            if pin.startswith("FIO"):
+                                base = 0
+                            elif pin.startswith("EIO"):
+                                base = 8
+                            elif pin.startswith("CIO"):
+                                base = 16
+                            try:
+                                idx = int(pin[3:])
+                                dio_num = base + idx
+                                dio_state = 1 if self.wd_state.currentText() == "High" else 0
+                                set_dio = True
+                            except Exception:
+                                set_dio = False
+                        d.watchdog(
+                            ResetOnTimeout=reset,
+                            SetDIOStateOnTimeout=set_dio,
+                            TimeoutPeriod=timeout,
+                            DIOState=dio_state,
+                            DIONumber=dio_num,
+                        )
+                self._log(self.cfg_log, "Values written")
         except Exception as e:
             self._log(self.cfg_log, f"Write error: {e}")
-        finally:
-            with suppress(Exception):
-                d.close()
 
     # Apply current DAQ config selections for this run (no persist unless requested)
     def u3_autoconfig_runtime(
@@ -1050,38 +1177,16 @@ class UnifiedGUI(BaseGUI):
     ):
         if not HAVE_U3:
             return
-        d = None
         caps = self._u3_capabilities()
         hw_float = caps["hardware_version"]
-        try:
-            d = u3_open()
+        fio_an, eio_an, fio_dir, eio_dir, cio_dir, fio_state, eio_state, cio_state = self._u3_masks(
+            fio_an_default=0x0F
+        )
+        with self._u3_device(pins=True) as d:
             # Optional factory base
             if isinstance(base, str) and base.lower().startswith("factory"):
                 with suppress(Exception):
                     d.setToFactoryDefaults()
-            # Collect masks from current UI
-            fio_checks = getattr(self, "ai_checks_fio", getattr(self, "ai_checks", []))
-            eio_checks = getattr(self, "ai_checks_eio", [])
-            fio_an = self._mask_from_checks(fio_checks) if fio_checks else 0x0F
-            eio_an = self._mask_from_checks(eio_checks) if eio_checks else 0
-            fio_dir = (
-                self._mask_from_checks(self.fio_dir_box) if hasattr(self, "fio_dir_box") else 0
-            )
-            eio_dir = (
-                self._mask_from_checks(self.eio_dir_box) if hasattr(self, "eio_dir_box") else 0
-            )
-            cio_dir = (
-                self._mask_from_checks(self.cio_dir_box) if hasattr(self, "cio_dir_box") else 0
-            )
-            fio_state = (
-                self._mask_from_checks(self.fio_state_box) if hasattr(self, "fio_state_box") else 0
-            )
-            eio_state = (
-                self._mask_from_checks(self.eio_state_box) if hasattr(self, "eio_state_box") else 0
-            )
-            cio_state = (
-                self._mask_from_checks(self.cio_state_box) if hasattr(self, "cio_state_box") else 0
-            )
             # Configure directions and analog mode at boot/current
             with suppress(Exception):
                 d.configU3(
@@ -1093,13 +1198,11 @@ class UnifiedGUI(BaseGUI):
                 )
             # Digital states (apply now)
             lj = _require_u3()
-            fb = []
-            for i in range(8):
-                fb.append(lj.BitStateWrite(i, 1 if (fio_state >> i) & 1 else 0))
-            for i in range(8):
-                fb.append(lj.BitStateWrite(8 + i, 1 if (eio_state >> i) & 1 else 0))
-            for i in range(4):
-                fb.append(lj.BitStateWrite(16 + i, 1 if (cio_state >> i) & 1 else 0))
+            fb = [
+                lj.PortStateWrite(
+                    State=[fio_state, eio_state, cio_state], WriteMask=[0xFF, 0xFF, 0x0F]
+                )
+            ]
             try:
                 d.getFeedback(*fb)
             except Exception:
@@ -1121,12 +1224,7 @@ class UnifiedGUI(BaseGUI):
                     )
             # Timers / Counters
             with suppress(Exception):
-                if self.t_clkbase.currentText() == "48MHz":
-                    base_clk = 48
-                elif self.t_clkbase.currentText() == "750kHz":
-                    base_clk = 750
-                else:
-                    base_clk = 4
+                base_clk = _U3_CLOCK_BASES.get(self.t_clkbase.currentText(), 4)
                 timer_offset = self.t_pin.value() if hasattr(self, "t_pin") else 0
                 if hw_float is not None and hw_float >= 1.30 and timer_offset < 4:
                     timer_offset = 4
@@ -1148,8 +1246,8 @@ class UnifiedGUI(BaseGUI):
                     dio_num = 0
                     dio_state = 0
                     wline = getattr(self, "wd_line", None)
-                    if wline and wline.currentText() != "None":
-                        pin = wline.currentText()
+                    pin = wline.currentText() if wline else "None"
+                    if pin != "None":
                         basep = 0
                         if pin.startswith("FIO"):
                             basep = 0
@@ -1174,15 +1272,11 @@ class UnifiedGUI(BaseGUI):
             # Ensure pulse line (if any) is an output
             with suppress(Exception):
                 if pulse_line and pulse_line.strip().lower() != "none":
-                    u3_set_dir(pulse_line, 1)
+                    u3_set_dir(pulse_line, 1, device=d)
             # Persist current as power-up defaults if requested
             if persist:
                 with suppress(Exception):
                     d.setDefaults()
-        finally:
-            with suppress(Exception):
-                if d:
-                    d.close()
 
     # ---- Automation
     def tab_automation(self):
@@ -1193,9 +1287,37 @@ class UnifiedGUI(BaseGUI):
     def stop_sweep_scope(self):
         self._sweep_abort = True
 
+    def _auto_log_line(self, msg: str):
+        self._log(self.auto_log, msg)
+
+    def _flush_auto_log(self):
+        if getattr(self, "_log_buf", None) is not None:
+            self._flush_logs(self.auto_log)
+
+    def _auto_log_async(self, msg: str):
+        """Sweep-thread logger: queue the line for the GUI thread."""
+        self._post_ui(partial(self._auto_log_line, msg))
+
+    def _auto_progress_async(self, i, n):
+        """Sweep-thread progress: queue the progress-bar update for the GUI thread."""
+        self._post_ui(partial(self.auto_prog.setValue, int(i / n * 100)))
+
+    def _sweep_busy(self) -> bool:
+        if self._sweep_thread is not None and self._sweep_thread.is_alive():
+            self._log(self.auto_log, "Sweep already running")
+            return True
+        return False
+
+    def _start_sweep(self, target, name):
+        """Run ``target`` on the sweep thread; it reports back only through ``_post_ui``."""
+        self._sweep_thread = threading.Thread(target=target, name=name, daemon=True)
+        self._sweep_thread.start()
+
     def run_sweep_scope_fixed(self):
-        from amp_benchkit.automation import build_freq_list, sweep_scope_fixed
+        from amp_benchkit.automation import build_freq_list, sweep_scope_fixed_async
 
+        if self._sweep_busy():
+            return
         rsrc = self.scope_edit.text().strip() if hasattr(self, "scope_edit") else self.scope_res
         try:
             ch = int(self.auto_ch.currentText())
@@ -1242,16 +1364,20 @@ class UnifiedGUI(BaseGUI):
                 )
             except Exception:
                 pre_ms = 5.0
+            avg_n = (
+                int(self.auto_scope_avg_n.currentText())
+                if getattr(self, "auto_scope_avg", None) and self.auto_scope_avg.isChecked()
+                else 0
+            )
 
             # optional u3 auto config closure
+            u3_base = (
+                self.auto_u3_base.currentText() if hasattr(self, "auto_u3_base") else "Keep Current"
+            )
+
             def _u3_autocfg():
                 if hasattr(self, "auto_u3_autocfg") and self.auto_u3_autocfg.isChecked():
-                    base = (
-                        self.auto_u3_base.currentText()
-                        if hasattr(self, "auto_u3_base")
-                        else "Keep Current"
-                    )
-                    self.u3_autoconfig_runtime(base=base, pulse_line="None", persist=False)
+                    self.u3_autoconfig_runtime(base=u3_base, pulse_line="None", persist=False)
 
             amplitude_calibration = None
             amp_strategy = None
@@ -1291,54 +1417,92 @@ class UnifiedGUI(BaseGUI):
                                 self._log(self.auto_log, f"Bad cal target: {exc}")
                 except Exception as exc:  # pragma: no cover - defensive
                     self._log(self.auto_log, f"Calibration load error: {exc}")
-            out = sweep_scope_fixed(
+            # U3 auto-config reads the DAQ tab widgets, so it runs here before the sweep starts.
+            try:
+                _u3_autocfg()
+            except Exception as e:
+                self._log(self.auto_log, f"U3 auto-config warn: {e}")
+            resource = rsrc or self.scope_res
+            sweep = partial(
+                sweep_scope_fixed_async,
                 freqs,
                 channel=ch,
                 scope_channel=sch,
                 amp_vpp=amp,
                 dwell_s=dwell,
                 metric=metric,
-                fy_apply=lambda **kw: fy_apply(port=pt, proto=pr, **kw),
-                scope_measure=lambda src, typ: self.scope_measure(src, typ),
+                scope_measure=lambda src, typ: self.scope_measure(src, typ, resource=resource),
+                scope_measure_batch=lambda src, types: self.scope_measure_batch(
+                    src, types, resource=resource
+                ),
                 scope_configure_math_subtract=lambda res, order: scope_configure_math_subtract(
-                    rsrc or self.scope_res, order=order
+                    resource, order=order
                 ),
                 scope_set_trigger_ext=lambda res, slope, level: scope_set_trigger_ext(
-                    rsrc or self.scope_res, slope=slope, level=level
+                    resource, slope=slope, level=level
                 ),
-                scope_arm_single=lambda res: scope_arm_single(rsrc or self.scope_res),
+                scope_arm_single=lambda res: scope_arm_single(resource),
                 scope_wait_single_complete=lambda res, timeout_s: scope_wait_single_complete(
-                    rsrc or self.scope_res, timeout_s=timeout_s
+                    resource, timeout_s=timeout_s
                 ),
+                scope_set_averaging=lambda res, n: scope_set_averaging(resource, n),
+                average_count=avg_n,
                 use_math=use_math,
                 math_order=order,
                 use_ext=use_ext,
                 ext_slope=ext_slope,
                 ext_level=ext_level,
                 pre_ms=pre_ms,
-                scope_resource=rsrc or self.scope_res,
-                logger=lambda s: self._log(self.auto_log, s),
-                progress=lambda i, n: (
-                    self.auto_prog.setValue(int(i / n * 100)),
-                    QApplication.processEvents(),
-                ),
+                scope_resource=resource,
+                logger=self._auto_log_async,
+                progress=self._auto_progress_async,
                 abort_flag=lambda: getattr(self, "_sweep_abort", False),
-                u3_autoconfig=_u3_autocfg,
                 amp_vpp_strategy=amp_strategy,
                 amplitude_calibration=amplitude_calibration,
+                executor=self._io_pool,
             )
-            os.makedirs("results", exist_ok=True)
-            fn = os.path.join("results", "sweep_scope.csv")
-            with open(fn, "w") as fh:
-                fh.write("freq_hz,metric\n")
-                for f, val in out:
-                    fh.write(f"{f},{val}\n")
-            self._log(self.auto_log, f"Saved: {fn}")
+            fn = os.path.join(_ensure_results_dir(), "sweep_scope.csv")
+            header = "freq_hz,metric\n" if "+" not in metric else f"freq_hz,{metric.lower()}\n"
+            header = header.replace("+", ",")
         except Exception as e:
+            self._flush_auto_log()
             self._log(self.auto_log, f"Sweep error: {e}")
-        finally:
-            with suppress(Exception):
-                scope_resume_run(rsrc or self.scope_res)
+            return
+
+        def _run():
+            err = None
+            rows = 0
+
+            def _row(f, *vals):
+                nonlocal rows
+                fh.write(",".join(map(str, (f, *vals))) + "\n")
+                rows += 1
+                if rows % 64 == 0:
+                    fh.flush()
+
+            try:
+                with open(fn, "w", buffering=1 << 16) as fh, open_fy_port(pt, ch, pr) as fy_fast:
+                    fh.write(header)
+                    asyncio.run(sweep(fy_apply=fy_fast, on_row=_row))
+            except Exception as e:
+                err = e
+            finally:
+                with suppress(Exception):
+                    scope_resume_run(resource)
+            self._post_ui(partial(self._finish_sweep_scope_fixed, fn, rows, err))
+
+        self._start_sweep(_run, "sweep-scope")
+
+    def _finish_sweep_scope_fixed(self, fn, rows, err):
+        self._flush_auto_log()
+        if err is not None:
+            self._log(self.auto_log, f"Sweep error: {err}")
+            if rows:
+                self._log(self.auto_log, f"Partial data ({rows} rows): {fn}")
+        else:
+            self.auto_prog.setValue(100)
+            self._log(self.auto_log, f"Saved: {fn}")
+        self._flush_auto_log()
 
     def run_live_thd_sweep(self):
         """Execute the THD math sweep using current GUI parameters."""
@@ -1458,6 +1622,8 @@ class UnifiedGUI(BaseGUI):
         """Sweep using FY + scope, compute Vrms/PkPk and THD, then report -dB knees if requested."""
         from amp_benchkit.automation import build_freq_list, sweep_audio_kpis
 
+        if self._sweep_busy():
+            return
         rsrc = self.scope_edit.text().strip() if hasattr(self, "scope_edit") else self.scope_res
         try:
             ch = int(self.auto_ch.currentText())
@@ -1512,17 +1678,19 @@ class UnifiedGUI(BaseGUI):
                 if hasattr(self, "auto_math_order")
                 else "CH1-CH2"
             )
+            do_thd = bool(getattr(self, "auto_do_thd", None) and self.auto_do_thd.isChecked())
+            do_knees = bool(getattr(self, "auto_do_knees", None) and self.auto_do_knees.isChecked())
+            save_raw = bool(getattr(self, "auto_save_raw", None) and self.auto_save_raw.isChecked())
             freqs = build_freq_list(start, stop, step)
             self._sweep_abort = False
 
+            u3_base = (
+                self.auto_u3_base.currentText() if hasattr(self, "auto_u3_base") else "Keep Current"
+            )
+
             def _u3_autocfg():
                 if hasattr(self, "auto_u3_autocfg") and self.auto_u3_autocfg.isChecked():
-                    base = (
-                        self.auto_u3_base.currentText()
-                        if hasattr(self, "auto_u3_base")
-                        else "Keep Current"
-                    )
-                    self.u3_autoconfig_runtime(base=base, pulse_line=pulse_line, persist=False)
+                    self.u3_autoconfig_runtime(base=u3_base, pulse_line=pulse_line, persist=False)
 
             amplitude_calibration = None
             amp_strategy = None
@@ -1563,45 +1731,60 @@ class UnifiedGUI(BaseGUI):
                 except Exception as exc:
                     self._log(self.auto_log, f"Calibration load error: {exc}")
 
-            res = sweep_audio_kpis(
+            # U3 auto-config reads the DAQ tab widgets, so it runs here before the sweep starts.
+            try:
+                _u3_autocfg()
+            except Exception as e:
+                self._log(self.auto_log, f"U3 auto-config warn: {e}")
+            resource = rsrc or self.scope_res
+            waveforms: list[tuple[float, Any, Any]] = []
+            cur_freq = float("nan")
+
+            def _apply(fy_fast, **kw):
+                nonlocal cur_freq
+                cur_freq = float(kw.get("freq_hz", "nan"))
+                return fy_fast(**kw)
+
+            def _capture(resrc, ch):
+                t, v = scope_capture_calibrated(resource, timeout_ms=15000, ch=ch)
+                if save_raw:
+                    waveforms.append((cur_freq, np.asarray(t), np.asarray(v)))
+                return t, v
+
+            knee_drop_db = (
+                float(self.auto_knee_db.text() or "3.0")
+                if getattr(self, "auto_knee_db", None)
+                else 3.0
+            )
+            knee_ref_mode = (
+                self.auto_ref_mode.currentText() if hasattr(self, "auto_ref_mode") else "Max"
+            )
+            knee_ref_hz = (
+                float(self.auto_ref_hz.text() or "1000")
+                if getattr(self, "auto_ref_hz", None)
+                else 1000.0
+            )
+            sweep = partial(
+                sweep_audio_kpis,
                 freqs,
                 channel=ch,
                 scope_channel=sch,
                 amp_vpp=amp,
                 dwell_s=dwell,
-                fy_apply=lambda **kw: fy_apply(port=pt, proto=pr, **kw),
-                scope_capture_calibrated=lambda resrc, ch: scope_capture_calibrated(
-                    rsrc or self.scope_res, timeout_ms=15000, ch=ch
-                ),
+                scope_capture_calibrated=_capture,
                 dsp_vrms=_dsp.vrms,
                 dsp_vpp=_dsp.vpp,
                 dsp_thd_fft=(
                     (lambda t, v, f0: _dsp.thd_fft(t, v, f0=f0, nharm=10, window="hann"))
-                    if getattr(self, "auto_do_thd", None) and self.auto_do_thd.isChecked()
-                    else None
-                ),
-                dsp_find_knees=(
-                    _dsp.find_knees
-                    if getattr(self, "auto_do_knees", None) and self.auto_do_knees.isChecked()
+                    if do_thd
                     else None
                 ),
-                do_thd=bool(getattr(self, "auto_do_thd", None) and self.auto_do_thd.isChecked()),
-                do_knees=bool(
-                    getattr(self, "auto_do_knees", None) and self.auto_do_knees.isChecked()
-                ),
-                knee_drop_db=(
-                    float(self.auto_knee_db.text() or "3.0")
-                    if getattr(self, "auto_knee_db", None)
-                    else 3.0
-                ),
-                knee_ref_mode=(
-                    self.auto_ref_mode.currentText() if hasattr(self, "auto_ref_mode") else "Max"
-                ),
-                knee_ref_hz=(
-                    float(self.auto_ref_hz.text() or "1000")
-                    if getattr(self, "auto_ref_hz", None)
-                    else 1000.0
-                ),
+                dsp_find_knees=_dsp.find_knees if do_knees else None,
+                do_thd=do_thd,
+                do_knees=do_knees,
+                knee_drop_db=knee_drop_db,
+                knee_ref_mode=knee_ref_mode,
+                knee_ref_hz=knee_ref_hz,
                 use_math=use_math,
                 math_order=order,
                 use_ext=use_ext,
@@ -1610,72 +1793,85 @@ class UnifiedGUI(BaseGUI):
                 pre_ms=pre_ms,
                 pulse_line=pulse_line,
                 pulse_ms=pulse_ms,
-                u3_pulse_line=(
-                    (
-                        lambda line, width_ms, level: u3_pulse_line(
-                            line, width_ms=width_ms, level=level
-                        )
-                    )
-                    if HAVE_U3
-                    else None
-                ),
+                u3_pulse_line=self._u3_pulse if HAVE_U3 else None,
                 scope_set_trigger_ext=lambda resrc, slope, level: scope_set_trigger_ext(
-                    rsrc or self.scope_res, slope=slope, level=level
+                    resource, slope=slope, level=level
                 ),
-                scope_arm_single=lambda resrc: scope_arm_single(rsrc or self.scope_res),
+                scope_arm_single=lambda resrc: scope_arm_single(resource),
                 scope_wait_single_complete=lambda resrc, timeout_s: scope_wait_single_complete(
-                    rsrc or self.scope_res, timeout_s=timeout_s
+                    resource, timeout_s=timeout_s
                 ),
-                scope_configure_math_subtract=lambda resrc, order: scope_configure_math_subtract(
-                    rsrc or self.scope_res, order=order
+                scope_wait_ready=lambda resrc, max_wait: scope_wait_ready(
+                    resource, max_wait=max_wait
                 ),
-                scope_resource=rsrc or self.scope_res,
-                logger=lambda s: self._log(self.auto_log, s),
-                progress=lambda i, n: (
-                    self.auto_prog.setValue(int(i / n * 100)),
-                    QApplication.processEvents(),
+                scope_configure_math_subtract=lambda resrc, order: scope_configure_math_subtract(
+                    resource, order=order
                 ),
+                scope_resource=resource,
+                logger=self._auto_log_async,
+                progress=self._auto_progress_async,
                 abort_flag=lambda: getattr(self, "_sweep_abort", False),
-                u3_autoconfig=_u3_autocfg,
                 amp_vpp_strategy=amp_strategy,
                 amplitude_calibration=amplitude_calibration,
             )
-            rows = res["rows"]
-            os.makedirs("results", exist_ok=True)
-            fn = os.path.join("results", "audio_kpis.csv")
-            with open(fn, "w") as fh:
-                fh.write("freq_hz,vrms,pkpk,thd_ratio,thd_percent\n")
-                for row in rows:
-                    fh.write(f"{row[0]},{row[1]},{row[2]},{row[3]},{row[4]}\n")
-            self._log(self.auto_log, f"Saved: {fn}")
-            if res.get("knees"):
-                try:
-                    f_lo, f_hi, ref_amp, ref_db = res["knees"]
-                    drop = (
-                        float(self.auto_knee_db.text() or "3.0")
-                        if getattr(self, "auto_knee_db", None)
-                        else 3.0
-                    )
-                    ref_mode = (
-                        self.auto_ref_mode.currentText()
-                        if hasattr(self, "auto_ref_mode")
-                        else "Max"
-                    )
-                    summ = (
-                        f"Knees @ -{drop:.2f} dB (ref {ref_mode}): "
-                        f"low≈{f_lo:.2f} Hz, high≈{f_hi:.2f} Hz "
-                        f"(ref_amp={ref_amp:.4f} V, ref_dB={ref_db:.2f} dB)"
-                    )
-                    self._log(self.auto_log, summ)
-                    with open(os.path.join("results", "audio_knees.txt"), "w") as fh:
-                        fh.write(summ + "\n")
-                except Exception as e:
-                    self._log(self.auto_log, f"Knee calc error: {e}")
         except Exception as e:
+            self._flush_auto_log()
             self._log(self.auto_log, f"KPI sweep error: {e}")
-        finally:
-            with suppress(Exception):
-                scope_resume_run(rsrc or self.scope_res)
+            return
+
+        def _run():
+            err = None
+            try:
+                with open_fy_port(pt, ch, pr) as fy_fast:
+                    res = sweep(fy_apply=partial(_apply, fy_fast))
+                self._save_audio_kpis(res, waveforms, knee_drop_db, knee_ref_mode)
+            except Exception as e:
+                err = e
+            finally:
+                with suppress(Exception):
+                    scope_resume_run(resource)
+            self._post_ui(partial(self._finish_audio_kpis, err))
+
+        self._start_sweep(_run, "sweep-kpis")
+
+    def _save_audio_kpis(self, res, waveforms, knee_drop_db, knee_ref_mode):
+        """Write KPI sweep results from the sweep thread (logs via ``_post_ui``)."""
+        rows = res["rows"]
+        fn = os.path.join(_ensure_results_dir(), "audio_kpis.csv")
+        with open(fn, "w", newline="", buffering=1 << 20) as fh:
+            writer = csv.writer(fh, lineterminator="\n")
+            writer.writerow(["freq_hz", "vrms", "pkpk", "thd_ratio", "thd_percent"])
+            writer.writerows(rows)
+        self._auto_log_async(f"Saved: {fn}")
+        if waveforms:
+            raw_fn = os.path.join(_ensure_results_dir(), "audio_waveforms.npz")
+            arrays: dict[str, Any] = {}
+            for i, (_f, t_w, v_w) in enumerate(waveforms):
+                arrays[f"t_{i}"] = t_w
+                arrays[f"v_{i}"] = v_w
+            np.savez_compressed(raw_fn, freqs=np.array([w[0] for w in waveforms]), **arrays)
+            self._auto_log_async(f"Saved: {raw_fn}")
+        if res.get("knees"):
+            try:
+                f_lo, f_hi, ref_amp, ref_db = res["knees"]
+                summ = (
+                    f"Knees @ -{knee_drop_db:.2f} dB (ref {knee_ref_mode}): "
+                    f"low≈{f_lo:.2f} Hz, high≈{f_hi:.2f} Hz "
+                    f"(ref_amp={ref_amp:.4f} V, ref_dB={ref_db:.2f} dB)"
+                )
+                self._auto_log_async(summ)
+                with open(os.path.join(_ensure_results_dir(), "audio_knees.txt"), "w") as fh:
+                    fh.write(summ + "\n")
+            except Exception as e:
+                self._auto_log_async(f"Knee calc error: {e}")
+
+    def _finish_audio_kpis(self, err):
+        self._flush_auto_log()
+        if err is not None:
+            self._log(self.auto_log, f"KPI sweep error: {err}")
+        else:
+            self.auto_prog.setValue(100)
+        self._flush_auto_log()
 
     # ---- Diagnostics
     def tab_diag(self):
@@ -1729,18 +1925,34 @@ class UnifiedGUI(BaseGUI):
         self._log(self.diag, snapshot)
         self._last_diag_snapshot = snapshot
 
-    @staticmethod
-    def _log(w, t):
-        w.append(t)
+    def _log(self, w, t):
+        """Queue ``t`` for ``w``; lines are appended in one batch within 50 ms."""
+        timer = getattr(self, "_log_timer", None)
+        if timer is None:
+            w.appendPlainText(t)
+            return
+        self._log_buf.setdefault(w, []).append(t)
+        if not timer.isActive():
+            timer.start()
+
+    def _flush_logs(self, w=None):
+        """Append buffered lines (all widgets, or just ``w``) with one layout pass each."""
+        targets = list(self._log_buf) if w is None else [w]
+        for tgt in targets:
+            lines = self._log_buf.pop(tgt, None)
+            if lines:
+                tgt.appendPlainText("\n".join(lines))
 
     def clear_diag_log(self):
         if hasattr(self, "diag") and self.diag is not None:
+            self._log_buf.pop(self.diag, None)
             self.diag.clear()
 
     def copy_diag_to_clipboard(self):
         if not HAVE_QT or QApplication is None or not hasattr(self, "diag"):
             return
         try:
+            self._flush_logs(self.diag)
             text = self.diag.toPlainText()
             if text.strip():
                 QApplication.clipboard().setText(text)
@@ -1752,13 +1964,14 @@ class UnifiedGUI(BaseGUI):
         text = getattr(self, "_last_diag_snapshot", None)
         if not text and hasattr(self, "diag"):
             try:
+                self._flush_logs(self.diag)
                 text = self.diag.toPlainText()
             except Exception:
                 text = None
         if not text or not text.strip():
             return
         ts = time.strftime("%Y%m%d-%H%M%S")
-        dest_dir = os.path.join("results", "diagnostics")
+        dest_dir = os.path.join(_ensure_results_dir(), "diagnostics")
         with suppress(Exception):
             os.makedirs(dest_dir, exist_ok=True)
         path = os.path.join(dest_dir, f"diagnostics_{ts}.txt")
@@ -1777,18 +1990,145 @@ class UnifiedGUI(BaseGUI):
         tag = "ERROR" if str(level).lower().startswith("err") else "INFO"
         entry = f"[{ts}] {tag}: {text}"
         with suppress(Exception):
-            if not hasattr(self, "_test_hist") or self._test_hist is None:
-                self._test_hist = []
+            if getattr(self, "_test_hist", None) is None:
+                self._test_hist = deque(maxlen=50)
+            # deque keeps the last 50 entries
             self._test_hist.append(entry)
-            # keep last 50 entries
-            if len(self._test_hist) > 50:
-                self._test_hist = self._test_hist[-50:]
             if hasattr(self, "test_last") and self.test_last is not None:
                 self.test_last.setText(text)
             if hasattr(self, "test_hist") and self.test_hist is not None:
                 self.test_hist.setPlainText("\n".join(self._test_hist))
 
 
+_TEST_SIG: tuple[np.ndarray, np.ndarray] | None = None
+
+
+def _test_sig() -> tuple[np.ndarray, np.ndarray]:
+    """Shared selftest capture: 1 kHz sine + 10% 2nd harmonic, 4096 samples @ 50 kHz."""
+    global _TEST_SIG
+    if _TEST_SIG is None:
+        fs = 50000.0
+        f0 = 1000.0
+        N = 4096
+        t = np.arange(N) / fs
+        _TEST_SIG = (t, np.sin(2 * np.pi * f0 * t) + 0.1 * np.sin(2 * np.pi * 2 * f0 * t))
+    return _TEST_SIG
+
+
+@lru_cache(maxsize=2)
+def _st_fy_cmds(ch: int) -> tuple[str, ...]:
+    """Shared selftest input: 1 kHz, 2 Vpp sine at 12.3% duty on ``ch``."""
+    return tuple(build_fy_cmds(1000, 2.0, 0.0, "Sine", duty=12.3, ch=ch))
+
+
+def _st_classify(cmds) -> dict[str, str]:
+    """Index FY commands by their 2-char prefix (e.g. ``bd``) in one pass."""
+    by: dict[str, str] = {}
+    for c in cmds:
+        by.setdefault(c[:2], c)
+    return by
+
+
+def _st_baud_eols() -> str:
+    assert FY_BAUD_EOLS == [(9600, "\n"), (115200, "\r\n")]
+    return "baud/EOL tuples valid"
+
+
+def _st_cmd_format() -> str:
+    for ch, p in ((1, "b"), (2, "d")):
+        cmds = _st_fy_cmds(ch)
+        assert p + "d" in _st_classify(cmds)
+        assert cmds[-1].startswith(p + "a")
+        assert max(map(len, cmds)) + 1 <= 15
+    return "command formatting (duty 3-digit, amplitude last, length ≤15)"
+
+
+def _st_centi_hz() -> str:
+    assert build_fy_cmds(1000, 2.0, 0.0, "Sine", None, 1)[1].endswith(f"{1000 * 100:09d}")
+    return "centi-Hz scaling (1000 Hz → 100000)"
+
+
+def _st_sweep_padding() -> str:
+    st = 123.45
+    en = 678.9
+    start_cmd = f"b{int(st * 100):09d}"
+    end_cmd = f"e{int(en * 100):09d}"
+    assert start_cmd == "b000012345" and end_cmd == "e000067890"
+    return "sweep start/end centi-Hz and 9-digit padding"
+
+
+def _st_duty() -> str:
+    assert _st_classify(_st_fy_cmds(1))["bd"].endswith("123")
+    return "duty 12.3% → d123"
+
+
+def _st_clamps() -> str:
+    by = _st_classify(build_fy_cmds(1000, 120.0, 0.0, "Sine", duty=123.4, ch=1))
+    assert by["bd"].endswith("999")
+    assert by["ba"].endswith("99.99")
+    by2 = _st_classify(build_fy_cmds(1000, -5.0, 0.005, "Sine", duty=0.04, ch=2))
+    assert by2["da"].endswith("0.00")
+    assert by2["dd"].endswith("000")
+    assert not by2.get("do", "").endswith("0.01")
+    return "clamps for duty/amp/offset"
+
+
+def _st_ieee_decode() -> str:
+    raw = b"#3100" + bytes(range(100)) + b"extra"
+    dec = _decode_ieee_block(raw)
+    assert len(dec) == 100 and dec[0] == 0 and dec[-1] == 99
+    hdr = "t,volts\n"
+    assert hdr.endswith("\n") and hdr.startswith("t,volts")
+    return "block decode and CSV header"
+
+
+def _st_ieee_passthrough() -> str:
+    dec2 = _decode_ieee_block(b"hello")
+    assert dec2 == b"hello"
+    return "raw (non-#) IEEE block passthrough"
+
+
+def _st_duty_zero() -> str:
+    cm3 = build_fy_cmds(1000, 2.0, 0.0, "Sine", duty=-5.0, ch=1)
+    assert _st_classify(cm3)["bd"].endswith("000")
+    return "duty clamp at 0% → d000"
+
+
+def _st_thd() -> str:
+    t, sig = _test_sig()
+    thd, f_est, _ = _dsp.thd_fft(t, sig, f0=1000.0, nharm=5, window="hann")
+    assert abs(thd - 0.1) < 0.03  # within a few % points due to window/leakage
+    return "THD ~10% on 2nd harmonic"
+
+
+# Ordered selftest registry: (name, check) where check returns its OK message.
+_TESTS: list[tuple[str, Callable[[], str]]] = [
+    ("Test1", _st_baud_eols),
+    ("Test2", _st_cmd_format),
+    ("Test3", _st_centi_hz),
+    ("Test4", _st_sweep_padding),
+    ("Test5", _st_duty),
+    ("Test6", _st_clamps),
+    ("Test7", _st_ieee_decode),
+    ("Test8", _st_ieee_passthrough),
+    ("Test9", _st_duty_zero),
+    ("Test10", _st_thd),
+]
+
+
+def _run_selftest() -> bool:
+    """Run the headless selftest registry in order; stop at the first failure."""
+    for name, check in _TESTS:
+        t0 = time.perf_counter()
+        try:
+            msg = check()
+        except Exception as e:
+            print(f"Selftest FAIL: {name}: {e!r}")
+            return False
+        print(f"{name} OK: {msg} [{(time.perf_counter() - t0) * 1e3:.2f} ms]")
+    return True
+
+
 def main():
     ap = argparse.ArgumentParser(description="Unified GUI (Lite+U3)")
     ap.add_argument("--gui", action="store_true", help="Launch Qt GUI")
@@ -2559,78 +2899,7 @@ def main():
         return
 
     if args.cmd == "selftest":
-        ok = True
-        try:
-            # Test1: baud/EOL tuples
-            assert FY_BAUD_EOLS == [(9600, "\n"), (115200, "\r\n")]
-            print("Test1 OK: baud/EOL tuples valid")
-
-            # Test2: command formatting
-            for ch in (1, 2):
-                cmds = build_fy_cmds(1000, 2.0, 0.0, "Sine", duty=12.3, ch=ch)
-                assert any(c.startswith(("bd", "dd")) for c in cmds)
-                assert cmds[-1].startswith(("ba", "da"))
-                assert all(len(c) + 1 <= 15 for c in cmds)
-            print("Test2 OK: command formatting (duty 3-digit, amplitude last, length ≤15)")
-
-            # Test3: centi-Hz scaling
-            assert build_fy_cmds(1000, 2.0, 0.0, "Sine", None, 1)[1].endswith(f"{1000 * 100:09d}")
-            print("Test3 OK: centi-Hz scaling (1000 Hz → 100000)")
-
-            # Test4: sweep start/end centi-Hz and 9-digit padding
-            st = 123.45
-            en = 678.9
-            start_cmd = f"b{int(st * 100):09d}"
-            end_cmd = f"e{int(en * 100):09d}"
-            assert start_cmd == "b000012345" and end_cmd == "e000067890"
-            print("Test4 OK: sweep start/end centi-Hz and 9-digit padding")
-
-            # Test5: duty 12.3% → d123
-            cmds = build_fy_cmds(1000, 2.0, 0.0, "Sine", duty=12.3, ch=1)
-            duty_cmd = [c for c in cmds if c.startswith("bd")][0]
-            assert duty_cmd.endswith("123")
-            print("Test5 OK: duty 12.3% → d123")
-
-            # Test6: clamp extremes
-            cm = build_fy_cmds(1000, 120.0, 0.0, "Sine", duty=123.4, ch=1)
-            assert any(x.endswith("999") for x in cm if x.startswith("bd"))
-            assert cm[-1].endswith("99.99")
-            cm2 = build_fy_cmds(1000, -5.0, 0.005, "Sine", duty=0.04, ch=2)
-            assert cm2[-1].endswith("0.00")
-            assert any(x.endswith("000") for x in cm2 if x.startswith("dd"))
-            assert not any(x.endswith("0.01") for x in cm2 if x.startswith("do"))
-            print("Test6 OK: clamps for duty/amp/offset")
-
-            # Test7: IEEE block decode
-            raw = b"#3100" + bytes(range(100)) + b"extra"
-            dec = _decode_ieee_block(raw)
-            assert len(dec) == 100 and dec[0] == 0 and dec[-1] == 99
-            hdr = "t,volts\n"
-            assert hdr.endswith("\n") and hdr.startswith("t,volts")
-            print("Test7 OK: block decode and CSV header")
-
-            # Test8: passthrough when not IEEE block
-            dec2 = _decode_ieee_block(b"hello")
-            assert dec2 == b"hello"
-            print("Test8 OK: raw (non-#) IEEE block passthrough")
-
-            # Test9: duty clamp at 0%
-            cm3 = build_fy_cmds(1000, 2.0, 0.0, "Sine", duty=-5.0, ch=1)
-            assert any(x.endswith("000") for x in cm3 if x.startswith("bd"))
-            print("Test9 OK: duty clamp at 0% → d000")
-            # Test10: THD estimator sanity (sine + 10% 2nd harmonic)
-            fs = 50000.0
-            f0 = 1000.0
-            N = 4096
-            t = np.arange(N) / fs
-            sig = np.sin(2 * np.pi * f0 * t) + 0.1 * np.sin(2 * np.pi * 2 * f0 * t)
-            thd, f_est, _ = _dsp.thd_fft(t, sig, f0=f0, nharm=5, window="hann")
-            assert abs(thd - 0.1) < 0.03  # within a few % points due to window/leakage
-            print("Test10 OK: THD ~10% on 2nd harmonic")
-        except Exception as e:
-            ok = False
-            print("Selftest FAIL:", e)
-        sys.exit(0 if ok else 1)
+        sys.exit(0 if _run_selftest() else 1)
     if args.cmd == "sweep":
         rc = 0
         try: